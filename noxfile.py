@@ -1,7 +1,11 @@
 """Automation sessions for local development."""
 
+import os
+from pathlib import Path
+
 import nox
 
+BENCH_BASELINE = Path("benchmarks") / "baseline.json"
 PY = ["3.11", "3.12", "3.13"]
 
 
@@ -26,6 +30,37 @@ def tests(session: nox.Session) -> None:
     session.run("pytest", "-q")
 
 
+@nox.session(default=False)
+def bench(session: nox.Session) -> None:
+    """Time hot paths on synthetic repositories and compare with the stored baseline.
+
+    Opt-in (``nox -s bench``); extra arguments are passed to ``dev bench``, e.g.
+    ``nox -s bench -- --sizes 100,1000``. Without a baseline the run records
+    one at ``benchmarks/baseline.json`` and passes; set
+    ``DECREE_BENCH_REQUIRE_BASELINE=1`` (as CI should) to fail instead.
+    """
+    if not BENCH_BASELINE.exists():
+        if os.environ.get("DECREE_BENCH_REQUIRE_BASELINE") == "1":
+            session.error(
+                f"{BENCH_BASELINE} is missing; record it with "
+                f"`dev bench --output {BENCH_BASELINE}` on the reference machine"
+            )
+        session.install(".")
+        session.run("dev", "bench", "--output", str(BENCH_BASELINE), *session.posargs)
+        session.log(f"recorded {BENCH_BASELINE}; commit it to compare later runs against it")
+        return
+    session.install(".")
+    session.run(
+        "dev",
+        "bench",
+        "--output",
+        ".bench/results.json",
+        "--baseline",
+        str(BENCH_BASELINE),
+        *session.posargs,
+    )
+
+
 @nox.session
 def build(session: nox.Session) -> None:
     """Create source and wheel distributions."""
@@ -1,7 +1,31 @@
 """Public package exports for the :mod:`decree` library."""
 
-__all__ = ["AdrLog", "AdrRecord", "AdrRef", "AdrStatus", "ExitCode", "LinkSpec"]
+from typing import TYPE_CHECKING
+
+__all__ = [
+    "AdrLog",
+    "AdrRecord",
+    "AdrRef",
+    "AdrStatus",
+    "AdrTable",
+    "ExitCode",
+    "LinkSpec",
+    "NewSpec",
+]
 
 from .core import AdrLog
 from .exitcodes import ExitCode
-from .models import AdrRecord, AdrRef, AdrStatus, LinkSpec
+from .models import AdrRecord, AdrRef, AdrStatus, LinkSpec, NewSpec
+
+if TYPE_CHECKING:
+    from .table import AdrTable
+
+
+def __getattr__(name: str) -> object:
+    # ``decree.table`` is only needed by table queries; keep it off ``decree list``.
+    if name == "AdrTable":
+        from .table import AdrTable  # noqa: PLC0415 - deferred for startup time
+
+        return AdrTable
+    message = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(message)
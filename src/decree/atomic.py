@@ -0,0 +1,172 @@
+"""Crash-safe file writes shared by every mutating operation.
+
+:func:`write_atomic` writes to a temporary file next to the target and renames
+it into place, so readers and crashes only ever see the old or the new content,
+never a truncated file. How hard Decree works to make those renames survive a
+power loss is set by :class:`Durability`:
+
+* ``none``: rename only; the operating system flushes data when it chooses.
+* ``file``: fsync each file before its rename and its directory after it.
+* ``batch``: no per-file fsync; every directory touched inside a
+  :func:`batch` is fsynced once when the outermost batch ends. Bulk
+  operations such as ``new_many``, ``link_many`` and ``title sync`` are
+  batches, so they pay for one directory fsync instead of two per file.
+
+The mode comes from :func:`durability` when set, otherwise from the
+``DECREE_DURABILITY`` environment variable, and defaults to ``none``.
+"""
+
+import contextlib
+import os
+import stat
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+from pathlib import Path
+
+from .iostats import note_rename, note_write
+from .profiling import phase
+
+DURABILITY_ENV = "DECREE_DURABILITY"
+
+
+class Durability(StrEnum):
+    """How much fsync work backs each atomic write."""
+
+    none = "none"
+    file = "file"
+    batch = "batch"
+
+
+_mode: ContextVar[Durability | None] = ContextVar("decree_durability", default=None)
+_pending: ContextVar[set[Path] | None] = ContextVar("decree_pending_dirs", default=None)
+
+
+def current_durability() -> Durability:
+    """Return the mode in effect for writes made now."""
+    mode = _mode.get()
+    if mode is not None:
+        return mode
+    value = os.environ.get(DURABILITY_ENV, "").strip().lower()
+    if not value:
+        return Durability.none
+    try:
+        return Durability(value)
+    except ValueError:
+        choices = ", ".join(Durability)
+        message = f"{DURABILITY_ENV} must be one of {choices}, got {value!r}"
+        raise ValueError(message) from None
+
+
+@contextmanager
+def durability(mode: Durability | str) -> Iterator[Durability]:
+    """Use ``mode`` for the writes made inside the block."""
+    token = _mode.set(Durability(mode))
+    try:
+        yield Durability(mode)
+    finally:
+        _mode.reset(token)
+
+
+@contextmanager
+def batch() -> Iterator[None]:
+    """Group writes so ``batch`` durability fsyncs each directory once at the end.
+
+    Nested batches join the outermost one. Directories are synced even when
+    the block fails, so renames that already happened are made durable too.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    directories: set[Path] = set()
+    token = _pending.set(directories)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+        for directory in sorted(directories):
+            _fsync_directory(directory)
+
+
+def write_atomic(path: Path, data: str | bytes, *, exclusive: bool = False) -> None:
+    """Replace ``path`` with ``data`` (UTF-8 encoded, newlines untranslated).
+
+    With ``exclusive`` the write fails with :class:`FileExistsError` instead of
+    replacing an existing file, like opening with mode ``"x"``. An existing
+    file's permission bits are kept.
+    """
+    content = data.encode("utf-8") if isinstance(data, str) else data
+    mode = current_durability()
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with phase("write"):
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+                if mode is Durability.file:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            if exclusive:
+                _link_exclusive(tmp, path, content)
+            else:
+                with contextlib.suppress(FileNotFoundError):
+                    tmp.chmod(stat.S_IMODE(path.stat().st_mode))
+                tmp.replace(path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                tmp.unlink()
+        _synced(path.parent, mode)
+    note_write(content)
+
+
+def rename_atomic(source: Path, target: Path) -> None:
+    """Rename ``source`` to ``target`` with the current durability."""
+    with phase("write"):
+        source.rename(target)
+        _synced(target.parent, current_durability())
+    note_rename()
+
+
+def remove_atomic(path: Path) -> None:
+    """Delete ``path`` if present, with the current durability."""
+    with phase("write"):
+        path.unlink(missing_ok=True)
+        _synced(path.parent, current_durability())
+
+
+def _link_exclusive(tmp: Path, path: Path, content: bytes) -> None:
+    """Publish ``tmp`` as ``path`` without replacing an existing file."""
+    try:
+        os.link(tmp, path)
+    except FileExistsError:
+        raise
+    except OSError:
+        # No hard links on this filesystem: fall back to an exclusive create.
+        with path.open("xb") as handle:
+            handle.write(content)
+
+
+def _synced(directory: Path, mode: Durability) -> None:
+    if mode is Durability.file:
+        _fsync_directory(directory)
+    elif mode is Durability.batch:
+        pending = _pending.get()
+        if pending is None:
+            _fsync_directory(directory)
+        else:
+            pending.add(directory)
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Directories cannot be opened for fsync on every platform (e.g. Windows).
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        with contextlib.suppress(OSError):
+            os.fsync(fd)
+    finally:
+        os.close(fd)
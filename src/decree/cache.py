@@ -0,0 +1,147 @@
+"""On-disk caches stored under an ADR directory's ``.decree`` folder.
+
+Caches are strictly best-effort: they are only used when the repository has a
+``.decree`` directory (created by ``upgrade-repository`` or by adding a
+``config.toml``), any unreadable or malformed cache is discarded and rebuilt,
+and failures to persist a cache never surface to the caller.
+"""
+
+import contextlib
+import json
+import os
+from collections.abc import Collection
+from pathlib import Path
+from typing import Any
+
+from .iostats import note_read, note_write
+from .models import AdrRecord, AdrStatus
+
+STATE_DIR = ".decree"
+CACHE_SUBDIR = "cache"
+# Written by :mod:`decree.transaction` while a commit is in flight.
+JOURNAL = "journal.json"
+RECORDS_CACHE = "records.json"
+_RECORDS_VERSION = 1
+
+
+def cache_dir(adr_dir: Path) -> Path:
+    """Return the cache directory for ``adr_dir``."""
+    return adr_dir / STATE_DIR / CACHE_SUBDIR
+
+
+def caching_enabled(adr_dir: Path) -> bool:
+    """Report whether ``adr_dir`` opted into on-disk caches via ``.decree``."""
+    return (adr_dir / STATE_DIR).is_dir()
+
+
+def load_json(adr_dir: Path, name: str, version: int) -> dict[str, Any] | None:
+    """Load cache ``name`` when present and written with ``version``."""
+    path = cache_dir(adr_dir) / name
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    note_read(text)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def store_json(adr_dir: Path, name: str, version: int, payload: dict[str, Any]) -> None:
+    """Atomically persist cache ``name``, ignoring filesystem failures."""
+    directory = cache_dir(adr_dir)
+    path = directory / name
+    tmp = path.with_name(f".{name}.{os.getpid()}.tmp")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        text = json.dumps({"version": version, **payload}, separators=(",", ":"))
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)
+        note_write(text)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+class RecordCache:
+    """Record metadata keyed by file name and validated by ``mtime_ns``/size."""
+
+    def __init__(self, adr_dir: Path, entries: dict[str, list[Any]], *, enabled: bool) -> None:
+        """Wrap ``entries`` previously loaded for ``adr_dir``."""
+        self.adr_dir = adr_dir
+        self.enabled = enabled
+        self._entries = entries
+        self._seen: set[str] = set()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, adr_dir: Path) -> "RecordCache":
+        """Load the record cache for ``adr_dir``, starting empty when unusable."""
+        if not caching_enabled(adr_dir):
+            return cls(adr_dir, {}, enabled=False)
+        data = load_json(adr_dir, RECORDS_CACHE, _RECORDS_VERSION)
+        entries = data.get("records") if data else None
+        if not isinstance(entries, dict):
+            entries = {}
+        return cls(adr_dir, entries, enabled=True)
+
+    def get(self, path: Path, stat: os.stat_result) -> AdrRecord | None:
+        """Return the cached record for ``path`` when its stat fingerprint matches."""
+        row = self.get_row(path.name, stat)
+        if row is None:
+            return None
+        number, slug, title, status, date = row
+        return AdrRecord(number=number, slug=slug, title=title, status=status, date=date, path=path)
+
+    def get_row(
+        self, name: str, stat: os.stat_result
+    ) -> tuple[int, str, str, AdrStatus, str] | None:
+        """Return ``(number, slug, title, status, date)`` for file ``name`` if still valid.
+
+        Unlike :meth:`get` no record or ``Path`` is built, which matters when
+        loading very large logs into columns.
+        """
+        self._seen.add(name)
+        entry = self._entries.get(name)
+        if not isinstance(entry, list) or entry[:2] != [stat.st_mtime_ns, stat.st_size]:
+            return None
+        try:
+            _, _, number, slug, title, status, date = entry
+            return int(number), str(slug), str(title), AdrStatus(status), str(date)
+        except (TypeError, ValueError):
+            return None
+
+    def put(self, record: AdrRecord, stat: os.stat_result) -> None:
+        """Remember ``record`` under the stat fingerprint it was parsed from."""
+        self._seen.add(record.path.name)
+        self._entries[record.path.name] = [
+            stat.st_mtime_ns,
+            stat.st_size,
+            record.number,
+            record.slug,
+            record.title,
+            record.status.value,
+            record.date,
+        ]
+        self._dirty = True
+
+    def save(self, *, listed: Collection[str] | None = None) -> None:
+        """Persist changes, dropping entries for files that no longer exist.
+
+        By default every file not looked up since loading counts as gone. A
+        caller that only looked up part of the directory passes the names it
+        ``listed`` instead, and only entries missing from that listing are
+        dropped.
+        """
+        if not self.enabled:
+            return
+        stale = self._entries.keys() - (self._seen if listed is None else listed)
+        for name in stale:
+            del self._entries[name]
+        if self._dirty or stale:
+            store_json(self.adr_dir, RECORDS_CACHE, _RECORDS_VERSION, {"records": self._entries})
+            self._dirty = False
@@ -0,0 +1,259 @@
+"""Repository lint for ADR hygiene, run by ``decree check``.
+
+Each ADR is read once and reduced to the facts the checks need: its heading
+prefix, ``Status:`` value, relation lines and relative markdown link targets.
+Those facts are cached in ``.decree/cache/check.json`` under the file's stat
+fingerprint and SHA-256, so a re-run only reads files whose stat changed and
+only re-parses those whose content changed. The checks that span files, such as
+missing targets, reverse links and broken links, are then evaluated in memory
+against every file's facts. An edit therefore updates the findings of the
+files that point at it without those files being read again.
+"""
+
+import hashlib
+import os
+import posixpath
+from collections.abc import Container, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .cache import caching_enabled, load_json, store_json
+from .core import (
+    _NON_RELATION_LABELS,
+    _RECORD_NAME_RE,
+    _RELATION_LINE_RE,
+    REVERSE_MAP,
+    _map_jobs,
+)
+from .iostats import note_glob, note_read
+from .models import AdrStatus
+from .profiling import phase
+from .title import _INLINE_LINK_RE, _REFERENCE_LINK_RE, _parse_heading_line, _split_suffix
+
+CHECK_CACHE = "check.json"
+_CHECK_VERSION = 1
+# Each cache entry is [mtime_ns, size, sha256, facts].
+_ENTRY_FIELDS = 4
+
+_STATUSES = frozenset(status.value for status in AdrStatus)
+
+# Problem codes.
+DUPLICATE_NUMBER = "duplicate-number"
+HEADING_MISMATCH = "heading-mismatch"
+INVALID_STATUS = "invalid-status"
+MISSING_TARGET = "missing-target"
+MISSING_REVERSE = "missing-reverse"
+BROKEN_LINK = "broken-link"
+
+
+@dataclass(frozen=True, slots=True)
+class Problem:
+    """One finding, reported as ``path:line: code message``."""
+
+    path: Path
+    line: int
+    code: str
+    message: str
+
+    def __str__(self) -> str:
+        """Format the problem like a compiler diagnostic."""
+        return f"{self.path}:{self.line}: {self.code} {self.message}"
+
+
+@dataclass(frozen=True, slots=True)
+class _Facts:
+    """What the checks need from one ADR; line numbers are 1-based, 0 when absent."""
+
+    heading_line: int
+    heading_prefix: str | None
+    status_line: int
+    status: str | None
+    relations: list[tuple[int, str, int]]
+    links: list[tuple[int, str]]
+
+    def dump(self) -> list[Any]:
+        return [
+            self.heading_line,
+            self.heading_prefix,
+            self.status_line,
+            self.status,
+            [list(relation) for relation in self.relations],
+            [list(link) for link in self.links],
+        ]
+
+    @classmethod
+    def restore(cls, data: object) -> "_Facts | None":
+        """Rebuild facts from :meth:`dump` output, or ``None`` when malformed."""
+        if not isinstance(data, list) or len(data) != len(cls.__slots__):
+            return None
+        heading_line, prefix, status_line, status, relations, links = data
+        try:
+            return cls(
+                int(heading_line),
+                None if prefix is None else str(prefix),
+                int(status_line),
+                None if status is None else str(status),
+                [(int(line), str(rel), int(number)) for line, rel, number in relations],
+                [(int(line), str(target)) for line, target in links],
+            )
+        except (TypeError, ValueError):
+            return None
+
+
+def check_repository(adr_dir: Path, *, jobs: int = 1) -> list[Problem]:
+    """Lint every ADR in ``adr_dir`` and return the problems sorted by file and line."""
+    if jobs < 1:
+        message = f"jobs must be at least 1, got {jobs}"
+        raise ValueError(message)
+    enabled = caching_enabled(adr_dir)
+    data = load_json(adr_dir, CHECK_CACHE, _CHECK_VERSION) if enabled else None
+    cached = data.get("files") if data else None
+    entries: dict[str, list[Any]] = cached if isinstance(cached, dict) else {}
+
+    with phase("scan"), os.scandir(adr_dir) as scan:
+        found = sorted((entry.name, entry) for entry in scan if _RECORD_NAME_RE.match(entry.name))
+    note_glob()
+
+    facts: dict[str, _Facts] = {}
+    fresh: dict[str, list[Any]] = {}
+    changed: list[tuple[os.DirEntry[str], os.stat_result]] = []
+    for name, dir_entry in found:
+        with phase("scan"):
+            stat = dir_entry.stat()
+        entry = _usable_entry(entries.get(name))
+        if entry is not None and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+            restored = _Facts.restore(entry[3])
+            if restored is not None:
+                facts[name], fresh[name] = restored, entry
+                continue
+        changed.append((dir_entry, stat))
+
+    def load(item: tuple[os.DirEntry[str], os.stat_result]) -> tuple[list[Any], _Facts]:
+        dir_entry, stat = item
+        return _read_facts(dir_entry, stat, _usable_entry(entries.get(dir_entry.name)))
+
+    for (dir_entry, _), (entry, file_facts) in zip(
+        changed, _map_jobs(load, changed, jobs), strict=True
+    ):
+        facts[dir_entry.name], fresh[dir_entry.name] = file_facts, entry
+
+    if enabled and fresh != entries:
+        with phase("write"):
+            store_json(adr_dir, CHECK_CACHE, _CHECK_VERSION, {"files": fresh})
+    with phase("render"):
+        return sorted(_problems(adr_dir, facts), key=lambda p: (p.path.name, p.line, p.code))
+
+
+def _usable_entry(cached: object) -> list[Any] | None:
+    return cached if isinstance(cached, list) and len(cached) == _ENTRY_FIELDS else None
+
+
+def _read_facts(
+    dir_entry: os.DirEntry[str], stat: os.stat_result, entry: list[Any] | None
+) -> tuple[list[Any], _Facts]:
+    """Return ``(cache entry, facts)`` for a file whose stat changed, parsing it if its hash did."""
+    with phase("read"), open(dir_entry.path, "rb") as handle:  # noqa: PTH123 - DirEntry paths are str
+        raw = handle.read()
+    note_read(raw)
+    fingerprint: list[Any] = [stat.st_mtime_ns, stat.st_size]
+    digest = hashlib.sha256(raw).hexdigest()
+    if entry is not None and entry[2] == digest:
+        facts = _Facts.restore(entry[3])
+        if facts is not None:
+            return [*fingerprint, digest, entry[3]], facts
+    with phase("parse"):
+        facts = _parse_facts(dir_entry.name, raw.decode("utf-8", errors="replace"))
+    return [*fingerprint, digest, facts.dump()], facts
+
+
+def _parse_facts(name: str, text: str) -> _Facts:
+    lines = text.splitlines()
+    heading_line, heading_prefix = 0, None
+    for number, line in enumerate(lines, start=1):
+        if line.lstrip().startswith("#"):
+            heading_line = number
+            heading_prefix = _parse_heading_line(line).prefix
+            break
+    status_line, status = 0, None
+    for number, line in enumerate(lines, start=1):
+        if line.startswith("Status:"):
+            status_line, status = number, line.partition(":")[2].strip()
+            break
+    relations = [
+        (_line_of(text, match.start()), match.group("rel"), int(match.group("number")))
+        for match in _RELATION_LINE_RE.finditer(text)
+        if match.group("rel") not in _NON_RELATION_LABELS
+    ]
+    links: list[tuple[int, str]] = []
+    for pattern in (_INLINE_LINK_RE, _REFERENCE_LINK_RE):
+        for match in pattern.finditer(text):
+            target, _ = _split_suffix(match.group("target"))
+            if not target or target.startswith("/") or ":" in target:
+                continue
+            key = posixpath.normpath(posixpath.join(posixpath.dirname(name), target))
+            links.append((_line_of(text, match.start("target")), key))
+    links.sort()
+    return _Facts(heading_line, heading_prefix, status_line, status, relations, links)
+
+
+def _line_of(text: str, offset: int) -> int:
+    return text.count("\n", 0, offset) + 1
+
+
+def _problems(adr_dir: Path, facts: dict[str, _Facts]) -> Iterator[Problem]:
+    by_number: dict[int, list[str]] = {}
+    for name in facts:
+        by_number.setdefault(int(name[:4]), []).append(name)
+    relations_of = {
+        number: {(rel, target) for name in names for _, rel, target in facts[name].relations}
+        for number, names in by_number.items()
+    }
+    exists: dict[str, bool] = {}
+    for name, file_facts in facts.items():
+        path = adr_dir / name
+        number = int(name[:4])
+        if len(by_number[number]) > 1:
+            others = ", ".join(other for other in by_number[number] if other != name)
+            yield Problem(path, 1, DUPLICATE_NUMBER, f"{number:04d} is also used by {others}")
+        yield from _header_problems(path, number, file_facts)
+        for line, rel, target in file_facts.relations:
+            if target not in by_number:
+                yield Problem(path, line, MISSING_TARGET, f"{rel}: {target:04d} does not exist")
+                continue
+            reverse = REVERSE_MAP.get(rel)
+            if reverse is not None and (reverse, number) not in relations_of[target]:
+                message = f"{by_number[target][0]} lacks '{reverse}: {number:04d}'"
+                yield Problem(path, line, MISSING_REVERSE, message)
+        yield from _broken_links(adr_dir, path, file_facts, facts, exists)
+
+
+def _broken_links(
+    adr_dir: Path,
+    path: Path,
+    facts: _Facts,
+    records: Container[str],
+    exists: dict[str, bool],
+) -> Iterator[Problem]:
+    """Report links to files that are neither ADRs nor present on disk (memoized in ``exists``)."""
+    for line, key in facts.links:
+        if key in records:
+            continue
+        if key not in exists:
+            with phase("scan"):
+                exists[key] = (adr_dir / key).exists()
+        if not exists[key]:
+            yield Problem(path, line, BROKEN_LINK, f"{key} does not exist")
+
+
+def _header_problems(path: Path, number: int, facts: _Facts) -> Iterator[Problem]:
+    prefix = facts.heading_prefix
+    if not prefix or not prefix.isdigit() or int(prefix) != number:
+        found = f"heading prefix {prefix!r}" if prefix else "no numbered heading"
+        yield Problem(
+            path, facts.heading_line or 1, HEADING_MISMATCH, f"{found}, expected {number}"
+        )
+    if facts.status is not None and facts.status not in _STATUSES:
+        choices = ", ".join(sorted(_STATUSES))
+        message = f"{facts.status!r} is not one of {choices}"
+        yield Problem(path, facts.status_line, INVALID_STATUS, message)
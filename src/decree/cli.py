@@ -1,25 +1,102 @@
 """Typer-powered command line interface for Decree."""
 
+import csv
+import datetime as dt
+import io
+import itertools
+import json
 import sys
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import click
 import typer
 
 from .core import AdrLog
 from .exitcodes import ExitCode, exit_with
-from .models import AdrRef, AdrStatus
-from .title import ExecutionContext, sync_titles, update_title
-from .utils import resolve_date
-
-app = typer.Typer(add_completion=False, help="Decree: typed Python reimplementation of adr-tools")
-title_app = typer.Typer(add_completion=False, help="Manage ADR titles.")
+from .models import AdrRecord, AdrRef, AdrStatus, GraphFormat, LinkSpec, NewSpec
+from .profiling import phase
+from .utils import resolve_date, unchecked_calls
+
+if TYPE_CHECKING:
+    from .title import ExecutionContext
+
+app = typer.Typer(
+    add_completion=False,
+    help="Decree: typed Python reimplementation of adr-tools",
+    rich_markup_mode=None,
+)
+title_app = typer.Typer(add_completion=False, help="Manage ADR titles.", rich_markup_mode=None)
 app.add_typer(title_app, name="title")
 
 DEFAULT_ADR_DIR = Path("doc/adr")
 
+_TRUTHY = {"1", "true", "yes", "on"}
+
+JobsOption = Annotated[
+    int,
+    typer.Option(
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parse records on this many threads (helps on network filesystems)",
+    ),
+]
+
+
+@app.callback()
+def _global_options(
+    ctx: typer.Context,
+    profile: Annotated[  # noqa: FBT002 - Typer option uses boolean defaults
+        bool,
+        typer.Option(
+            "--profile",
+            envvar="DECREE_PROFILE",
+            show_envvar=False,
+            help=(
+                "Run under cProfile, save a .pstats file and print phase timings to stderr "
+                "(or set DECREE_PROFILE=1)"
+            ),
+        ),
+    ] = False,
+    profile_output: Annotated[
+        Path,
+        typer.Option(
+            "--profile-output",
+            envvar="DECREE_PROFILE_OUTPUT",
+            show_envvar=False,
+            show_default=False,
+            help="Where --profile saves its .pstats file (default: decree.pstats)",
+        ),
+    ] = Path("decree.pstats"),
+) -> None:
+    # Typer has validated every argument, so AdrLog calls skip beartype's checks.
+    ctx.with_resource(unchecked_calls())
+    if profile:
+        _start_profiling(ctx, profile_output)
+
+
+def _start_profiling(ctx: typer.Context, output: Path) -> None:
+    """Profile the rest of the invocation and report when the context closes."""
+    import cProfile  # noqa: PLC0415 - only loaded when profiling
+
+    from . import profiling  # noqa: PLC0415 - only loaded when profiling
+
+    timer = profiling.start()
+    profiler = cProfile.Profile()
+
+    def _finish() -> None:
+        profiler.disable()
+        profiling.stop()
+        profiler.dump_stats(output)
+        typer.echo(f"Profile written to {output}", err=True)
+        for line in timer.summary():
+            typer.echo(f"  {line}", err=True)
+
+    ctx.call_on_close(_finish)
+    profiler.enable()
+
 
 def _validate_date_option(
     ctx: typer.Context,
@@ -29,9 +106,15 @@ def _validate_date_option(
     if value is None:
         return None
     try:
-        resolve_date(cli_date=value, env={})
+        return _checked_date(value)
     except ValueError as exc:
         raise typer.BadParameter(str(exc), ctx=ctx, param=param) from exc
+
+
+def _checked_date(value: str) -> str:
+    """Return ``value`` if it is a ``YYYY-MM-DD`` date that exists on the calendar."""
+    resolve_date(cli_date=value, env={})
+    dt.date.fromisoformat(value)
     return value
 
 
@@ -48,8 +131,8 @@ def init(
 
 
 @app.command()
-def new(
-    title: Annotated[list[str], typer.Argument(help="Title words of the ADR")],
+def new(  # noqa: PLR0913, PLR0917 - Typer maps each CLI option to a parameter
+    title: Annotated[list[str] | None, typer.Argument(help="Title words of the ADR")] = None,
     status: Annotated[
         AdrStatus,
         typer.Option("--status", case_sensitive=False),
@@ -71,20 +154,91 @@ def new(
             callback=_validate_date_option,
         ),
     ] = None,
+    from_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--from-file",
+            help=(
+                "Create one ADR per JSONL object or CSV row with title, status and date "
+                "fields ('-' reads stdin). --status and --date fill in missing fields."
+            ),
+        ),
+    ] = None,
 ) -> None:
     """Create a new ADR."""
+    if from_file is not None and title:
+        message = "pass either TITLE words or --from-file, not both"
+        raise click.UsageError(message)
+    if from_file is None and not title:
+        message = "Missing argument 'TITLE...'."
+        raise click.UsageError(message)
+
     template_path = _resolve_template_path(template)
+    log = AdrLog(directory or DEFAULT_ADR_DIR)
 
     try:
-        rec = AdrLog(directory or DEFAULT_ADR_DIR).new(
-            " ".join(title),
-            status=status,
-            template=template_path,
-            date=date,
-        )
+        if from_file is not None:
+            specs = [_new_spec(row, status, date) for row in _read_rows(from_file)]
+            records = log.new_many(specs, template=template_path)
+        else:
+            records = [
+                log.new(
+                    " ".join(title or []),
+                    status=status,
+                    template=template_path,
+                    date=date,
+                )
+            ]
     except ValueError as exc:
         raise _click_exception(str(exc), ExitCode.CONFIG_ERROR) from exc
-    typer.echo(str(rec.path))
+    for rec in records:
+        typer.echo(str(rec.path))
+
+
+def _read_rows(source: Path) -> list[dict[str, Any]]:
+    """Read JSONL objects or CSV rows (with a header) from ``source`` or stdin."""
+    if str(source) == "-":
+        text = click.get_text_stream("stdin").read()
+    else:
+        text = source.read_text(encoding="utf-8")
+    if not text.lstrip().startswith("{"):
+        return list(csv.DictReader(io.StringIO(text)))
+    rows: list[dict[str, Any]] = []
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            message = f"{source}:{lineno}: invalid JSON: {exc}"
+            raise ValueError(message) from exc
+        if not isinstance(row, dict):
+            message = f"{source}:{lineno}: expected a JSON object"
+            raise ValueError(message)  # noqa: TRY004 - reported as a data error
+        rows.append(row)
+    return rows
+
+
+def _new_spec(row: dict[str, Any], status: AdrStatus, date: str | None) -> NewSpec:
+    title = str(row.get("title") or "").strip()
+    if not title:
+        message = f"missing title in row {row!r}"
+        raise ValueError(message)
+    row_date = row.get("date") or date
+    return NewSpec(
+        title=title,
+        status=_parse_status(row.get("status") or status),
+        date=_checked_date(str(row_date)) if row_date else None,
+    )
+
+
+def _parse_status(value: object) -> AdrStatus:
+    text = str(value).strip().lower()
+    for member in AdrStatus:
+        if member.value.lower() == text:
+            return member
+    message = f"Invalid status: {value}"
+    raise ValueError(message)
 
 
 def _resolve_template_path(template: Path | None) -> Path | None:
@@ -122,47 +276,288 @@ def _resolve_template_path(template: Path | None) -> Path | None:
 
 
 @app.command()
-def link(
-    src: Annotated[int, typer.Argument(help="Source ADR number")],
-    rel: Annotated[str, typer.Argument(help="Relationship label, e.g., Supersedes")],
-    tgt: Annotated[int, typer.Argument(help="Target ADR number")],
+def link(  # noqa: PLR0913, PLR0917 - Typer maps each CLI option to a parameter
+    src: Annotated[int | None, typer.Argument(help="Source ADR number")] = None,
+    rel: Annotated[str | None, typer.Argument(help="Relationship label, e.g., Supersedes")] = None,
+    tgt: Annotated[int | None, typer.Argument(help="Target ADR number")] = None,
     reverse: Annotated[  # noqa: FBT002 - Typer option uses boolean defaults
         bool,
         typer.Option("--reverse/--no-reverse", help="Also add reverse link"),
     ] = False,
     directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
+    from_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--from-file",
+            help=(
+                "Apply one link per JSONL object or CSV row with src, rel, tgt and optional "
+                "reverse fields ('-' reads stdin). --reverse fills in missing values."
+            ),
+        ),
+    ] = None,
 ) -> None:
     """Add a relationship between ADRs."""
-    AdrLog(directory or DEFAULT_ADR_DIR).link(AdrRef(src), rel, AdrRef(tgt), reverse=reverse)
+    log = AdrLog(directory or DEFAULT_ADR_DIR)
+    if from_file is not None:
+        if src is not None or rel is not None or tgt is not None:
+            message = "pass either SRC REL TGT or --from-file, not both"
+            raise click.UsageError(message)
+        try:
+            specs = [_link_spec(row, reverse=reverse) for row in _read_rows(from_file)]
+        except ValueError as exc:
+            raise _click_exception(str(exc), ExitCode.CONFIG_ERROR) from exc
+        log.link_many(specs)
+        typer.echo(f"Linked {len(specs)}")
+        return
+    if src is None or rel is None or tgt is None:
+        message = "Missing argument 'SRC REL TGT'."
+        raise click.UsageError(message)
+    log.link(AdrRef(src), rel, AdrRef(tgt), reverse=reverse)
     typer.echo("Linked")
 
 
+def _link_spec(row: dict[str, Any], *, reverse: bool) -> LinkSpec:
+    try:
+        src, tgt = int(row["src"]), int(row["tgt"])
+        rel = str(row["rel"]).strip()
+    except (KeyError, TypeError, ValueError) as exc:
+        message = f"expected integer src/tgt and a rel label in row {row!r}"
+        raise ValueError(message) from exc
+    if not rel:
+        message = f"missing rel in row {row!r}"
+        raise ValueError(message)
+    raw = row.get("reverse")
+    if raw is None or raw == "":
+        flag = reverse
+    elif isinstance(raw, bool):
+        flag = raw
+    else:
+        flag = str(raw).strip().lower() in _TRUTHY
+    return LinkSpec(AdrRef(src), rel, AdrRef(tgt), reverse=flag)
+
+
 @app.command("list")
-def list_cmd(
+def list_cmd(  # noqa: PLR0913, PLR0917 - Typer maps each CLI option to a parameter
+    directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
+    jobs: JobsOption = 1,
+    stats: Annotated[  # noqa: FBT002 - Typer option uses boolean defaults
+        bool,
+        typer.Option(
+            "--stats", help="Print I/O counters (files opened, bytes read, ...) to stderr"
+        ),
+    ] = False,
+    status: Annotated[
+        list[AdrStatus] | None,
+        typer.Option("--status", case_sensitive=False, help="Only ADRs with this status"),
+    ] = None,
+    since: Annotated[
+        str | None,
+        typer.Option(
+            "--since", callback=_validate_date_option, help="Only ADRs dated on/after YYYY-MM-DD"
+        ),
+    ] = None,
+    until: Annotated[
+        str | None,
+        typer.Option(
+            "--until", callback=_validate_date_option, help="Only ADRs dated on/before YYYY-MM-DD"
+        ),
+    ] = None,
+    effective: Annotated[  # noqa: FBT002 - Typer option uses boolean defaults
+        bool,
+        typer.Option("--effective", help="Hide superseded ADRs"),
+    ] = False,
+) -> None:
+    """List ADRs, optionally filtered by status and date."""
+    log = AdrLog(directory or DEFAULT_ADR_DIR)
+    records: Iterable[AdrRecord]
+    if status or since is not None or until is not None:
+        records = log.query(status=status or None, date_from=since, date_to=until, jobs=jobs)
+    else:
+        records = log.list(jobs=jobs)
+    if effective:
+        superseded = log.link_graph().superseded()
+        records = (
+            r
+            for r in records
+            if r.number not in superseded and r.status is not AdrStatus.Superseded
+        )
+    _write_lines(f"{r.number:04d} {r.date} {r.status.value} {r.title}" for r in records)
+    if stats:
+        for line in log.stats().summary():
+            typer.echo(line, err=True)
+
+
+@app.command("check")
+def check(
+    directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", "-j", min=1, help="Check files on this many threads"),
+    ] = 4,
+) -> None:
+    """Lint ADRs for broken relations, links, headings and statuses."""
+    log = AdrLog(directory or DEFAULT_ADR_DIR)
+    problems = log.check(jobs=jobs)
+    _write_lines(str(problem) for problem in problems)
+    if problems:
+        noun = "problem" if len(problems) == 1 else "problems"
+        message = f"{len(problems)} {noun} found"
+        raise _click_exception(message, ExitCode.GENERAL_ERROR)
+
+
+@app.command("resolve")
+def resolve(
+    number: Annotated[int, typer.Argument(help="ADR number, e.g. 0042")],
     directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
 ) -> None:
-    """List ADRs."""
-    for r in AdrLog(directory or DEFAULT_ADR_DIR).list():
-        typer.echo(f"{r.number:04d} {r.date} {r.status.value} {r.title}")
+    """Show the ADRs currently in effect in place of NUMBER."""
+    log = AdrLog(directory or DEFAULT_ADR_DIR)
+    try:
+        records = log.effective(number)
+    except ValueError as exc:
+        raise _click_exception(str(exc), ExitCode.GENERAL_ERROR) from exc
+    _write_lines(f"{r.number:04d} {r.date} {r.status.value} {r.title}" for r in records)
+
+
+@app.command("search")
+def search(
+    query: Annotated[list[str], typer.Argument(help="Words to search for")],
+    directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
+    limit: Annotated[int, typer.Option("--limit", "-n", min=1, help="Maximum results")] = 10,
+) -> None:
+    """Search ADR text, best matches first."""
+    log = AdrLog(directory or DEFAULT_ADR_DIR)
+    hits = log.search(" ".join(query), limit=limit)
+    _write_lines(
+        f"{h.record.number:04d} {h.score:.2f} {h.record.status.value} {h.record.title}"
+        for h in hits
+    )
 
 
 @app.command("generate")
-def generate(
+def generate(  # noqa: PLR0913, PLR0917 - Typer maps each CLI option to a parameter
     what: Annotated[str, typer.Argument(help="What to generate: toc|graph")],
     directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
+    jobs: JobsOption = 1,
+    fmt: Annotated[
+        GraphFormat,
+        typer.Option("--format", case_sensitive=False, help="Graph output format"),
+    ] = GraphFormat.dot,
+    root: Annotated[
+        int | None,
+        typer.Option("--root", help="Only graph ADRs reachable from this ADR number"),
+    ] = None,
+    depth: Annotated[
+        int | None,
+        typer.Option("--depth", min=0, help="Maximum number of hops from --root"),
+    ] = None,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Write the toc to this file only if it changed"),
+    ] = None,
+    check: Annotated[  # noqa: FBT002 - Typer option uses boolean defaults
+        bool,
+        typer.Option("--check", help="Fail if --output is missing or out of date"),
+    ] = False,
 ) -> None:
-    """Generate artifacts (toc; graph not implemented)."""
+    """Generate artifacts (toc or graph)."""
     log = AdrLog(directory or DEFAULT_ADR_DIR)
-    if what == "toc":
-        typer.echo(log.generate_toc())
+    if (output is not None or check) and what != "toc":
+        message = "--output and --check are only supported for toc"
+        raise click.UsageError(message)
+    if check and output is None:
+        message = "--check requires --output"
+        raise click.UsageError(message)
+    if output is not None:
+        if check:
+            if not log.check_toc(output, jobs=jobs):
+                message = f"{output} is out of date; run 'decree generate toc --output {output}'"
+                raise _click_exception(message, ExitCode.GENERAL_ERROR)
+        elif log.write_toc(output, jobs=jobs):
+            typer.echo(f"Wrote {output}")
+        else:
+            typer.echo(f"{output} is up to date")
+    elif what == "toc":
+        # The trailing empty line keeps output identical to echoing generate_toc().
+        _write_lines(itertools.chain(log.iter_toc_lines(jobs=jobs), ("",)))
     elif what == "graph":
-        message = "generate graph is not implemented"
-        raise _click_exception(message, ExitCode.UNAVAILABLE)
+        if depth is not None and root is None:
+            message = "--depth requires --root"
+            raise click.UsageError(message)
+        _write_lines(log.iter_graph(fmt, root=root, depth=depth))
     else:
         message = "unknown artifact, expected 'toc' or 'graph'"
         raise click.UsageError(message)
 
 
+def _write_lines(lines: Iterable[str]) -> None:
+    """Stream ``lines`` to stdout through its buffer instead of flushing per line."""
+    out = click.get_text_stream("stdout")
+    for line in lines:
+        with phase("write"):
+            out.write(line)
+            out.write("\n")
+    with phase("write"):
+        out.flush()
+
+
+@app.command("watch")
+def watch(
+    output: Annotated[Path, typer.Option("--output", "-o", help="Table of contents to maintain")],
+    directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
+    debounce: Annotated[
+        float,
+        typer.Option("--debounce", min=0.0, help="Seconds of quiet before regenerating"),
+    ] = 0.2,
+    poll: Annotated[  # noqa: FBT002 - Typer option uses boolean defaults
+        bool,
+        typer.Option("--poll", help="Compare mtimes instead of using inotify"),
+    ] = False,
+) -> None:
+    """Regenerate the toc whenever ADR files change, until interrupted."""
+    from .watch import TocWatcher, open_source  # noqa: PLC0415 - keep CLI startup lean
+
+    log = AdrLog(directory or DEFAULT_ADR_DIR)
+    if not log.dir.is_dir():
+        message = f"ADR directory not found: {log.dir}"
+        raise FileNotFoundError(message)
+    watcher = TocWatcher(
+        log,
+        output,
+        open_source(log.dir, polling=poll),
+        debounce=debounce,
+        on_error=lambda message: typer.echo(f"Skipped {message}", err=True),
+    )
+    if watcher.written:
+        typer.echo(f"Wrote {output}")
+    typer.echo(f"Watching {log.dir} (Ctrl-C to stop)")
+    try:
+        watcher.run(lambda path: typer.echo(f"Wrote {path}"))
+    except KeyboardInterrupt:
+        typer.echo("Stopped")
+
+
+@app.command("serve")
+def serve(
+    directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
+    stdio: Annotated[  # noqa: FBT002 - Typer option uses boolean defaults
+        bool,
+        typer.Option("--stdio", help="Speak line-delimited JSON-RPC 2.0 on stdin/stdout"),
+    ] = False,
+) -> None:
+    """Serve list/new/link/unlink/title requests from a long-running process."""
+    from .server import JsonRpcServer  # noqa: PLC0415 - keep CLI startup lean
+
+    if not stdio:
+        message = "only the --stdio transport is supported"
+        raise click.UsageError(message)
+    log = AdrLog(directory or DEFAULT_ADR_DIR)
+    if not log.dir.is_dir():
+        message = f"ADR directory not found: {log.dir}"
+        raise FileNotFoundError(message)
+    JsonRpcServer(log).serve(click.get_text_stream("stdin"), click.get_text_stream("stdout"))
+
+
 @app.command("upgrade-repository")
 def upgrade_repository(
     directory: Annotated[Path | None, typer.Option("--dir", help="ADR directory")] = None,
@@ -185,6 +580,12 @@ def _title_echo(*, dry_run: bool) -> Callable[[str], None]:
     return _emit
 
 
+def _title_context(*, dry_run: bool) -> "ExecutionContext":
+    from .title import ExecutionContext  # noqa: PLC0415 - loaded only by title commands
+
+    return ExecutionContext(dry_run=dry_run, emit=_title_echo(dry_run=dry_run))
+
+
 @title_app.command("set")
 def title_set(
     target: Annotated[str, typer.Argument(help="ADR number, slug, or path to update")],
@@ -199,7 +600,9 @@ def title_set(
     ] = False,
 ) -> None:
     """Update an ADR title."""
-    ctx = ExecutionContext(dry_run=dry_run, emit=_title_echo(dry_run=dry_run))
+    from .title import update_title  # noqa: PLC0415 - loaded only by title commands
+
+    ctx = _title_context(dry_run=dry_run)
     update_title(
         _title_dir(directory),
         target,
@@ -221,7 +624,9 @@ def title_sync(
     ] = False,
 ) -> None:
     """Sync ADR filenames and headings with their titles."""
-    ctx = ExecutionContext(dry_run=dry_run, emit=_title_echo(dry_run=dry_run))
+    from .title import sync_titles  # noqa: PLC0415 - loaded only by title commands
+
+    ctx = _title_context(dry_run=dry_run)
     sync_titles(
         _title_dir(directory),
         rename=rename,
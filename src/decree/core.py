@@ -1,17 +1,75 @@
 """Core domain logic for manipulating ADR repositories."""
 
-from collections.abc import Iterator
+import builtins
+import hashlib
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import NoReturn
+from typing import TYPE_CHECKING, NoReturn, TypeVar
+
+from .atomic import batch, write_atomic
+from .cache import (
+    CACHE_SUBDIR,
+    JOURNAL,
+    STATE_DIR,
+    RecordCache,
+    caching_enabled,
+    load_json,
+    store_json,
+)
+from .iostats import IoStats, collecting, counted, note_glob, note_read
+from .iostats import current as current_stats
+from .models import AdrRecord, AdrRef, AdrStatus, GraphFormat, LinkSpec, NewSpec
+from .profiling import phase
+from .templates import DEFAULT_TEMPLATE, SEED_0001_TITLE
+from .utils import beartype_checked, resolve_date, slugify
 
-from beartype import beartype
+if TYPE_CHECKING:
+    # Absolute so beartype can resolve the annotations naming lazily imported modules.
+    import decree.check
+    import decree.graph
+    import decree.search
+    import decree.table
+    import decree.transaction
 
-from .models import AdrRecord, AdrRef, AdrStatus
-from .templates import DEFAULT_TEMPLATE, SEED_0001_TITLE
-from .utils import resolve_date, slugify
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 ADR_DIR_DEFAULT = Path("doc") / "adr"
 
+# Stamps letting ``check_toc`` skip regeneration when no record changed.
+TOC_CACHE = "toc.json"
+_TOC_VERSION = 1
+
+# Lock file serializing ``new`` across processes, with its wait and staleness limits.
+_LOCK_NAME = ".decree-new.lock"
+_LOCK_TIMEOUT = 10.0
+_LOCK_STALE_AFTER = 30.0
+
+
+@dataclass(slots=True)
+class _HeldLock:
+    """The allocation lock as held by one thread of this process."""
+
+    owner: int
+    depth: int = 1
+    # Highest number handed out under this hold, including numbers a
+    # transaction has staged but not yet written.
+    allocated: int = 0
+
+
+_held: dict[Path, _HeldLock] = {}
+_held_guard = threading.Lock()
+
+# Upper bound on bytes read when parsing a record's heading and metadata block.
+_HEADER_READ_LIMIT = 8192
+
 # Base relationships adapted from npryce/adr-tools for parity with its linking
 # behavior.  We expand the mapping so either side of the relationship can be
 # used as a key.  See https://github.com/npryce/adr-tools for reference.
@@ -27,26 +85,52 @@ REVERSE_MAP: dict[str, str] = {
 }
 
 
+# Relation lines as written by ``link_adr``, e.g. ``Supersedes: 0003``.
+_RELATION_LINE_RE = re.compile(r"^(?P<rel>[^:\n]+): (?P<number>\d{4})[ \t]*\r?$", re.MULTILINE)
+_NON_RELATION_LABELS = frozenset({"Date", "Status"})
+
+# File names matched by the ``[0-9][0-9][0-9][0-9]-*.md`` record glob.
+_RECORD_NAME_RE = re.compile(r"^[0-9]{4}-.*\.md$", re.DOTALL)
+
+
 def _resolve_reverse_relation(rel: str) -> str:
     return REVERSE_MAP.get(rel, f"Is {rel.lower()} by")
 
 
+def read_relations(path: Path) -> list[tuple[str, int]]:
+    """Return the ``(relation, number)`` pairs recorded in an ADR file."""
+    with phase("read"):
+        text = path.read_text(encoding="utf-8")
+    note_read(text)
+    with phase("parse"):
+        return _relations_in(text)
+
+
+def _relations_in(text: str) -> list[tuple[str, int]]:
+    return [
+        (match.group("rel"), int(match.group("number")))
+        for match in _RELATION_LINE_RE.finditer(text)
+        if match.group("rel") not in _NON_RELATION_LABELS
+    ]
+
+
 def link_adr(src: Path, rel: str, tgt: Path, *, reverse: bool = True) -> None:
     """Link two ADR markdown files mirroring npryce/adr-tools semantics."""
 
     def _link_single(file: Path, relation: str, target: Path) -> None:
         target_num = target.name.split("-", 1)[0]
         line = f"{relation}: {target_num}"
-        existing = file.read_text(encoding="utf-8").splitlines()
-        if line in existing:
+        with phase("read"), file.open(encoding="utf-8", newline="") as handle:
+            text = handle.read()
+        note_read(text)
+        if line in text.splitlines():
             return
-        with file.open("a", encoding="utf-8", newline="\n") as handle:
-            handle.write(f"\n{line}\n")
-
-    _link_single(src, rel, tgt)
+        write_atomic(file, _with_link_lines(text, [line]))
 
-    if reverse:
-        _link_single(tgt, _resolve_reverse_relation(rel), src)
+    with batch():
+        _link_single(src, rel, tgt)
+        if reverse:
+            _link_single(tgt, _resolve_reverse_relation(rel), src)
 
 
 def unlink_adr(src: Path, rel: str, tgt: Path, *, reverse: bool = True) -> None:
@@ -55,26 +139,54 @@ def unlink_adr(src: Path, rel: str, tgt: Path, *, reverse: bool = True) -> None:
     def _unlink_single(file: Path, relation: str, target: Path) -> None:
         target_num = target.name.split("-", 1)[0]
         line = f"{relation}: {target_num}"
-        text = file.read_text(encoding="utf-8")
-        lines = text.splitlines()
-        for idx, value in enumerate(lines):
-            if value == line:
-                del lines[idx]
-                if idx > 0 and lines[idx - 1] == "":
-                    del lines[idx - 1]
-                break
-        else:
-            return
+        with phase("read"), file.open(encoding="utf-8", newline="") as handle:
+            text = handle.read()
+        note_read(text)
+        new_text = _without_link_line(text, line)
+        if new_text is not None:
+            write_atomic(file, new_text)
+
+    with batch():
+        _unlink_single(src, rel, tgt)
+        if reverse:
+            _unlink_single(tgt, _resolve_reverse_relation(rel), src)
+
+
+def _without_link_line(text: str, line: str) -> str | None:
+    """Return ``text`` minus the first ``line`` and its leading blank line, if present.
+
+    Other lines keep their own line endings.
+    """
+    lines = text.splitlines(keepends=True)
+    for idx, value in enumerate(lines):
+        if value.rstrip("\r\n") == line:
+            del lines[idx]
+            if idx > 0 and lines[idx - 1].rstrip("\r\n") == "":
+                del lines[idx - 1]
+            break
+    else:
+        return None
 
-        new_text = "\n".join(lines)
-        if text.endswith("\n"):
-            new_text += "\n"
-        file.write_text(new_text, encoding="utf-8")
+    new_text = "".join(lines)
+    if not text.endswith("\n"):
+        # The removed line was the unterminated last one: drop the ending it followed.
+        new_text = new_text.removesuffix("\n").removesuffix("\r")
+    return new_text
 
-    _unlink_single(src, rel, tgt)
 
-    if reverse:
-        _unlink_single(tgt, _resolve_reverse_relation(rel), src)
+def _with_link_lines(text: str, lines: Iterable[str]) -> str:
+    """Append each relation line missing from ``text``, after a blank line.
+
+    The appended lines use ``text``'s line ending (CRLF when it has any).
+    """
+    existing = set(text.splitlines())
+    newline = "\r\n" if "\r\n" in text else "\n"
+    parts = [text]
+    for line in lines:
+        if line not in existing:
+            existing.add(line)
+            parts.append(f"{newline}{line}{newline}")
+    return "".join(parts)
 
 
 class AdrLog:
@@ -83,9 +195,18 @@ class AdrLog:
     def __init__(self, directory: Path) -> None:
         """Create an ADR log bound to ``directory``."""
         self.dir = directory
+        self._stats = IoStats()
+
+    def stats(self) -> IoStats:
+        """Return a snapshot of the I/O this log has done so far.
+
+        Counts cover every method call on this instance, including iterators
+        it returned, e.g. ``files_opened`` grows by one per record parsed.
+        """
+        return replace(self._stats)
 
     @classmethod
-    @beartype
+    @beartype_checked
     def init(cls, directory: Path | None = None) -> "AdrLog":
         """Initialise an ADR repository, seeding record 0001 when absent."""
         base = Path.cwd()
@@ -97,7 +218,8 @@ class AdrLog:
             log._write(number=1, title=SEED_0001_TITLE, status=AdrStatus.Accepted)
         return log
 
-    @beartype
+    @counted
+    @beartype_checked
     def new(
         self,
         title: str,
@@ -106,67 +228,433 @@ class AdrLog:
         template: Path | None = None,
         date: str | None = None,
     ) -> AdrRecord:
-        """Write a new ADR entry to disk and return the resulting record."""
-        next_num = self._next_number()
-        return self._write(next_num, title, status, template, date)
-
-    @beartype
-    def list(self) -> Iterator[AdrRecord]:
-        """Yield all ADR records sorted by numeric identifier."""
-        for path in sorted(self.dir.glob("[0-9][0-9][0-9][0-9]-*.md")):
-            number = int(path.name[:4])
-            title = _read_title(path)
-            meta = _read_meta(path)
-            yield AdrRecord(
-                number=number,
-                slug=path.stem.split("-", 1)[1],
-                title=title,
-                status=AdrStatus(meta.get("Status", "Accepted")),
-                date=meta.get("Date", ""),
-                path=path,
-            )
+        """Write a new ADR entry to disk and return the resulting record.
 
-    @beartype
+        Number allocation is serialized across processes with an exclusive
+        lock file, so concurrent writers always receive distinct numbers.
+        """
+        tpl = _read_template(template)
+        record_date = resolve_date(cli_date=date)
+        with _allocation_lock(self.dir):
+            _replay_interrupted_commit(self.dir, locked=True)
+            return self._write_record(self._next_number(), title, status, tpl, record_date)
+
+    @counted
+    @beartype_checked
+    def new_many(
+        self,
+        specs: Iterable[NewSpec],
+        *,
+        template: Path | None = None,
+    ) -> list[AdrRecord]:
+        """Write several ADRs with contiguous numbers in one allocation.
+
+        The template is read once, every date is validated before anything is
+        written, and the allocation lock is taken once for the whole batch.
+        """
+        tpl = _read_template(template)
+        planned = [(spec, resolve_date(cli_date=spec.date)) for spec in specs]
+        with _allocation_lock(self.dir), batch():
+            _replay_interrupted_commit(self.dir, locked=True)
+            start = self._next_number(len(planned))
+            return [
+                self._write_record(start + offset, spec.title, spec.status, tpl, record_date)
+                for offset, (spec, record_date) in enumerate(planned)
+            ]
+
+    @counted
+    @beartype_checked
+    def list(self, *, jobs: int = 1) -> Iterator[AdrRecord]:
+        """Yield all ADR records sorted by numeric identifier.
+
+        Records whose file is unchanged since the last run are served from the
+        metadata cache under ``.decree/`` when the repository has one. With
+        ``jobs`` above one, files are stat'ed and parsed on a thread pool of
+        that size, which pays off on high-latency storage such as NFS; records
+        are still yielded in numeric order.
+        """
+        if jobs < 1:
+            message = f"jobs must be at least 1, got {jobs}"
+            raise ValueError(message)
+        cache = RecordCache.load(self.dir)
+        with phase("scan"):
+            paths = sorted(self.dir.glob("[0-9][0-9][0-9][0-9]-*.md"))
+        note_glob()
+
+        def load(path: Path) -> tuple[AdrRecord, os.stat_result, bool]:
+            with phase("scan"):
+                stat = path.stat()
+            record = cache.get(path, stat)
+            if record is None:
+                return _parse_record(path), stat, True
+            return record, stat, False
+
+        for record, stat, parsed in _map_jobs(load, paths, jobs):
+            if parsed:
+                cache.put(record, stat)
+            yield record
+        with phase("write"):
+            cache.save()
+
+    @counted
+    @beartype_checked
+    def table(self) -> "decree.table.AdrTable":
+        """Load every record's metadata into a columnar :class:`AdrTable`.
+
+        Unlike :meth:`list`, records served from the metadata cache are copied
+        straight into the columns without building an ``AdrRecord`` or ``Path``
+        for each, which keeps loading and holding 100k-record logs cheap.
+        """
+        return self._load_table()
+
+    @counted
+    @beartype_checked
+    def query(
+        self,
+        *,
+        status: AdrStatus | Iterable[AdrStatus] | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        number_range: tuple[int, int] | None = None,
+        jobs: int = 1,
+    ) -> "decree.table.AdrTable":
+        """Return the records matching every given filter, in numeric order.
+
+        ``date_from``/``date_to`` are inclusive ISO dates and ``number_range``
+        is an inclusive ``(first, last)`` pair. Files whose number falls outside
+        ``number_range`` are skipped by name without being opened or stat'ed.
+        Every other file is stat'ed and, unless the metadata cache under
+        ``.decree/`` holds an entry for it, parsed; status and date filters
+        are then applied to the loaded rows by :meth:`AdrTable.where`. With
+        ``jobs`` above one the files are parsed on a thread pool, as in
+        :meth:`list`.
+        """
+        first, last = number_range if number_range is not None else (None, None)
+        table = self._load_table(first, last, jobs=jobs)
+        return table.where(status=status, since=date_from, until=date_to)
+
+    @counted
+    @beartype_checked
+    def search(
+        self, query: str, *, limit: int | None = 10
+    ) -> builtins.list["decree.search.SearchHit"]:
+        """Return up to ``limit`` records matching ``query``, ranked by BM25.
+
+        The inverted index is kept in ``.decree/cache/search.json`` when the
+        repository has a ``.decree`` folder and only files whose mtime or size
+        changed are re-read; without it the index is built in memory.
+        """
+        from .search import SearchHit, SearchIndex  # noqa: PLC0415 - deferred for startup time
+
+        index = SearchIndex.load(self.dir)
+        with phase("scan"), os.scandir(self.dir) as entries:
+            found = {entry.name: entry for entry in entries if _RECORD_NAME_RE.match(entry.name)}
+        note_glob()
+        index.refresh(found.values())
+        with phase("write"):
+            index.save()
+        ranked = index.search(query, limit=limit)
+        cache = RecordCache.load(self.dir) if ranked else None
+        hits: builtins.list[decree.search.SearchHit] = []
+        for name, score in ranked:
+            path = self.dir / name
+            record = cache.get(path, found[name].stat()) if cache is not None else None
+            hits.append(SearchHit(record or _parse_record(path), score))
+        return hits
+
+    def _load_table(
+        self, first: int | None = None, last: int | None = None, *, jobs: int = 1
+    ) -> "decree.table.AdrTable":
+        from .table import TableBuilder  # noqa: PLC0415 - deferred for startup time
+
+        if jobs < 1:
+            message = f"jobs must be at least 1, got {jobs}"
+            raise ValueError(message)
+        cache = RecordCache.load(self.dir)
+        with phase("scan"), os.scandir(self.dir) as entries:
+            listed = sorted(
+                (entry.name, entry) for entry in entries if _RECORD_NAME_RE.match(entry.name)
+            )
+        note_glob()
+        found = [
+            (name, entry)
+            for name, entry in listed
+            if (first is None or int(name[:4]) >= first) and (last is None or int(name[:4]) <= last)
+        ]
+        rows: builtins.list[tuple[int, str, str, AdrStatus, str] | None] = []
+        missing: builtins.list[tuple[int, Path, os.stat_result]] = []
+        for name, entry in found:
+            with phase("scan"):
+                stat = entry.stat()
+            row = cache.get_row(name, stat)
+            if row is None:
+                missing.append((len(rows), self.dir / name, stat))
+            rows.append(row)
+        paths = [path for _, path, _ in missing]
+        for (position, _, stat), record in zip(
+            missing, _map_jobs(_parse_record, paths, jobs), strict=True
+        ):
+            cache.put(record, stat)
+            rows[position] = (record.number, record.slug, record.title, record.status, record.date)
+        builder = TableBuilder()
+        for row in rows:
+            if row is not None:
+                builder.append(*row)
+        with phase("write"):
+            # A ranged load only saw part of the directory; keep the other entries.
+            cache.save(listed={name for name, _ in listed})
+        return builder.build(self.dir)
+
+    @counted
+    @beartype_checked
     def link(self, src: AdrRef, rel: str, tgt: AdrRef, *, reverse: bool = False) -> None:
         """Link two ADRs optionally inserting the reverse relationship."""
+        _replay_interrupted_commit(self.dir)
         s = self._path_for(src.number)
         t = self._path_for(tgt.number)
         link_adr(s, rel, t, reverse=reverse)
 
-    @beartype
+    @counted
+    @beartype_checked
     def unlink(self, src: AdrRef, rel: str, tgt: AdrRef, *, reverse: bool = False) -> None:
         """Remove a relationship between two ADRs."""
+        _replay_interrupted_commit(self.dir)
         s = self._path_for(src.number)
         t = self._path_for(tgt.number)
         unlink_adr(s, rel, t, reverse=reverse)
 
-    @beartype
-    def generate_toc(self) -> str:
+    @counted
+    @beartype_checked
+    def link_many(self, specs: Iterable[LinkSpec]) -> builtins.list[Path]:
+        """Apply many link requests, reading and writing each touched ADR once.
+
+        Relation lines are grouped by file and de-duplicated in memory, so the
+        result matches calling :meth:`link` for every spec. Returns the files
+        that changed.
+        """
+        _replay_interrupted_commit(self.dir)
+        planned = self._plan_relations(specs)
+        with batch():
+            return _rewrite_relations(planned, _with_link_lines)
+
+    @counted
+    @beartype_checked
+    def unlink_many(self, specs: Iterable[LinkSpec]) -> builtins.list[Path]:
+        """Remove many relationships, reading and writing each touched ADR once."""
+
+        def remove(text: str, lines: builtins.list[str]) -> str:
+            for line in lines:
+                text = _without_link_line(text, line) or text
+            return text
+
+        _replay_interrupted_commit(self.dir)
+        planned = self._plan_relations(specs)
+        with batch():
+            return _rewrite_relations(planned, remove)
+
+    @counted
+    @beartype_checked
+    def transaction(self) -> "decree.transaction.Transaction":
+        """Return a transaction that stages mutations and commits them together.
+
+        Use it as a context manager::
+
+            with log.transaction() as txn:
+                record = txn.new("Use Postgres")
+                txn.link(AdrRef(record.number), "Supersedes", AdrRef(3), reverse=True)
+                txn.set_title(AdrRef(3), "Use MySQL for reporting only")
+
+        Each touched file is read once and written once, through a journal in
+        ``.decree/`` that is replayed if a commit is interrupted; see
+        :mod:`decree.transaction`.
+        """
+        from .transaction import Transaction  # noqa: PLC0415 - transaction imports this module
+
+        return Transaction.begin(self.dir, stats=self._stats)
+
+    @counted
+    @beartype_checked
+    def generate_toc(self, *, jobs: int = 1) -> str:
         """Produce a Markdown table of contents for the ADR log."""
-        lines = ["# Architecture decision records", ""]
-        for rec in self.list():
-            rel = rec.path.relative_to(self.dir)
-            lines.append(
-                f"- {rec.number:04d}. [{rec.title}]({rel.as_posix()}) — {rec.status} ({rec.date})",
-            )
-        return "\n".join(lines) + "\n"
+        return "".join(f"{line}\n" for line in self.iter_toc_lines(jobs=jobs))
+
+    @counted
+    @beartype_checked
+    def iter_toc_lines(self, *, jobs: int = 1) -> Iterator[str]:
+        """Yield the table of contents line by line as records are parsed."""
+        yield from _toc_lines(self.dir, self.list(jobs=jobs))
+
+    @counted
+    @beartype_checked
+    def write_toc(self, output: Path, *, jobs: int = 1) -> bool:
+        """Write the table of contents to ``output`` only when its content changed.
+
+        Returns ``True`` when the file was (re)written. The file's modification
+        time is left untouched when the generated content is identical.
+        """
+        return self._write_toc_content(output, self.generate_toc(jobs=jobs))
+
+    @counted
+    @beartype_checked
+    def check_toc(self, output: Path, *, jobs: int = 1) -> bool:
+        """Report whether ``output`` holds the current table of contents.
+
+        When no record file changed (by name, ``mtime_ns`` and size) since the
+        last successful write or check, and ``output`` still has the content
+        recorded then, the answer comes from ``.decree/cache/`` without parsing
+        any record.
+        """
+        fingerprint = self._records_fingerprint()
+        existing = _file_digest(output)
+        if existing is None:
+            return False
+        stamp = load_json(self.dir, TOC_CACHE, _TOC_VERSION) if caching_enabled(self.dir) else None
+        entry = stamp.get("outputs", {}).get(str(output.resolve())) if stamp else None
+        if entry == {"records": fingerprint, "content": existing}:
+            return True
+        digest = hashlib.sha256(self.generate_toc(jobs=jobs).encode("utf-8")).hexdigest()
+        if digest != existing:
+            return False
+        self._store_toc_stamp(output, fingerprint, digest)
+        return True
+
+    @counted
+    @beartype_checked
+    def link_graph(self) -> "decree.graph.LinkGraph":
+        """Return the relation graph, re-reading only ADRs changed since it was cached.
+
+        The parsed edges are kept in ``.decree/cache/graph.json`` when the
+        repository has a ``.decree`` folder.
+        """
+        from .graph import LinkGraph  # noqa: PLC0415 - graph imports this module
+
+        return LinkGraph.load(self.dir)
+
+    @counted
+    @beartype_checked
+    def check(self, *, jobs: int = 1) -> builtins.list["decree.check.Problem"]:
+        """Lint the log and return its problems sorted by file and line.
+
+        Reports relations to missing ADRs, relations without their reverse
+        line, broken relative markdown links, headings whose number does not
+        match the file name, duplicate numbers and invalid ``Status:`` values.
+        Files are read on ``jobs`` threads and their parsed facts are cached
+        by content hash; see :mod:`decree.check`.
+        """
+        from .check import check_repository  # noqa: PLC0415 - check imports this module
+
+        return check_repository(self.dir, jobs=jobs)
+
+    @counted
+    @beartype_checked
+    def effective(self, number: int) -> builtins.list[AdrRecord]:
+        """Return the records currently in effect in place of ADR ``number``.
+
+        Follows ``Supersedes`` links over :meth:`link_graph` to the ADRs that
+        nothing supersedes; see :meth:`decree.graph.LinkGraph.effective`.
+        """
+        graph = self.link_graph()
+        if number not in graph:
+            message = f"ADR {number:04d} not found"
+            raise FileNotFoundError(message)
+        return [_parse_record(self._path_for(head)) for head in graph.effective(number)]
+
+    @counted
+    @beartype_checked
+    def iter_graph(
+        self,
+        fmt: GraphFormat = GraphFormat.dot,
+        *,
+        root: int | None = None,
+        depth: int | None = None,
+    ) -> Iterator[str]:
+        """Yield a Graphviz DOT or Mermaid rendering of ADR relations line by line.
+
+        Each file is read once. With ``root`` only records reachable from that
+        ADR (within ``depth`` hops when given) are looked up, read and emitted.
+        """
+        from .graph import iter_graph_lines  # noqa: PLC0415 - graph imports this module
 
-    @beartype
+        return iter_graph_lines(self, fmt, root=root, depth=depth)
+
+    @counted
+    @beartype_checked
     def upgrade(self) -> None:
         """Perform idempotent repository upgrade tasks."""
         if not self.dir.exists():
             message = f"{self.dir} does not exist"
             _raise(FileNotFoundError(message))
-        (self.dir / ".decree").mkdir(exist_ok=True)
-        (self.dir / ".decree" / "upgrade.marker").write_text("v1", encoding="utf-8")
-
-    def _next_number(self) -> int:
-        nums = [int(p.name[:4]) for p in self.dir.glob("[0-9][0-9][0-9][0-9]-*.md")]
-        return (max(nums) + 1) if nums else 1
+        state = self.dir / STATE_DIR
+        state.mkdir(exist_ok=True)
+        with batch():
+            write_atomic(state / "upgrade.marker", "v1")
+            ignore = state / ".gitignore"
+            if not ignore.exists():
+                write_atomic(ignore, f"{CACHE_SUBDIR}/\n")
+
+    def _records_fingerprint(self) -> str:
+        """Hash the name, ``mtime_ns`` and size of every record without reading it."""
+        digest = hashlib.sha256()
+        with phase("scan"):
+            paths = sorted(self.dir.glob("[0-9][0-9][0-9][0-9]-*.md"))
+            stats = [(path.name, path.stat()) for path in paths]
+        note_glob()
+        for name, stat in stats:
+            digest.update(f"{name}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+        return digest.hexdigest()
+
+    def _write_toc_content(self, output: Path, toc: str) -> bool:
+        content = toc.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        changed = _file_digest(output) != digest
+        if changed:
+            write_atomic(output, content)
+        self._store_toc_stamp(output, self._records_fingerprint(), digest)
+        return changed
+
+    def _store_toc_stamp(self, output: Path, fingerprint: str, digest: str) -> None:
+        if not caching_enabled(self.dir):
+            return
+        stamp = load_json(self.dir, TOC_CACHE, _TOC_VERSION) or {}
+        outputs = stamp.get("outputs")
+        if not isinstance(outputs, dict):
+            outputs = {}
+        outputs[str(output.resolve())] = {"records": fingerprint, "content": digest}
+        store_json(self.dir, TOC_CACHE, _TOC_VERSION, {"outputs": outputs})
+
+    def _next_number(self, count: int = 1) -> int:
+        with phase("scan"):
+            nums = [int(p.name[:4]) for p in self.dir.glob("[0-9][0-9][0-9][0-9]-*.md")]
+        note_glob()
+        return _claim_numbers(self.dir, max(nums, default=0), count)
+
+    def _plan_relations(self, specs: Iterable[LinkSpec]) -> dict[Path, builtins.list[str]]:
+        """Group the relation lines requested by ``specs`` by the file they belong in."""
+        with phase("scan"):
+            paths = {int(p.name[:4]): p for p in self.dir.glob("[0-9][0-9][0-9][0-9]-*.md")}
+        note_glob()
+
+        def lookup(ref: AdrRef) -> Path:
+            if ref.number not in paths:
+                message = f"ADR {ref.number:04d} not found"
+                raise FileNotFoundError(message)
+            return paths[ref.number]
+
+        planned: dict[Path, builtins.list[str]] = {}
+        for spec in specs:
+            src, tgt = lookup(spec.src), lookup(spec.tgt)
+            planned.setdefault(src, []).append(f"{spec.rel}: {tgt.name.split('-', 1)[0]}")
+            if spec.reverse:
+                reverse = _resolve_reverse_relation(spec.rel)
+                planned.setdefault(tgt, []).append(f"{reverse}: {src.name.split('-', 1)[0]}")
+        return planned
 
     def _path_for(self, number: int) -> Path:
-        for p in self.dir.glob(f"{number:04d}-*.md"):
-            return p
+        with phase("scan"):
+            path = next(self.dir.glob(f"{number:04d}-*.md"), None)
+        note_glob()
+        if path is not None:
+            return path
         message = f"ADR {number:04d} not found"
         raise FileNotFoundError(message)
 
@@ -177,18 +665,28 @@ class AdrLog:
         status: AdrStatus,
         template: Path | None = None,
         date: str | None = None,
+    ) -> AdrRecord:
+        tpl = _read_template(template)
+        return self._write_record(number, title, status, tpl, resolve_date(cli_date=date))
+
+    def _write_record(
+        self,
+        number: int,
+        title: str,
+        status: AdrStatus,
+        tpl: str,
+        record_date: str,
     ) -> AdrRecord:
         slug = slugify(title)
         path = self.dir / f"{number:04d}-{slug}.md"
-        tpl = template.read_text(encoding="utf-8") if template else DEFAULT_TEMPLATE
-        record_date = resolve_date(cli_date=date)
         content = tpl.format(
             number=number,
             title=title,
             status=status.value,
             date=record_date,
         )
-        path.write_text(content, encoding="utf-8", newline="\n")
+        # Exclusive creation: never clobber a record written by someone else.
+        write_atomic(path, content, exclusive=True)
         return AdrRecord(
             number=number,
             slug=slug,
@@ -199,25 +697,313 @@ class AdrLog:
         )
 
 
-def _read_title(path: Path) -> str:
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if line.startswith("# "):
-            parts = line[2:].split(":", 1)
-            parts_with_label = 2
-            return parts[1].strip() if len(parts) == parts_with_label else parts[0].strip()
-    return path.stem
+def _rewrite_relations(
+    planned: dict[Path, list[str]],
+    apply: Callable[[str, list[str]], str],
+) -> list[Path]:
+    written: list[Path] = []
+    for path, lines in planned.items():
+        with phase("read"), path.open(encoding="utf-8", newline="") as handle:
+            text = handle.read()
+        note_read(text)
+        updated = apply(text, lines)
+        if updated != text:
+            write_atomic(path, updated)
+            written.append(path)
+    return written
+
+
+@contextmanager
+def _allocation_lock(directory: Path) -> Iterator[None]:
+    """Hold an ``O_EXCL`` lock file in ``directory`` while numbers are allocated.
+
+    Waiting writers back off exponentially up to ``_LOCK_TIMEOUT`` seconds. A
+    lock older than ``_LOCK_STALE_AFTER`` seconds is assumed to belong to a
+    crashed process and is removed by :func:`_break_stale_lock`, after which
+    the exclusive create is retried; a waiter never assumes it owns the lock
+    without creating it. While held, a background thread refreshes the lock's
+    mtime, so a long transaction is never mistaken for a crashed one. The lock
+    records a token unique to its holder, and releasing it only removes the
+    file while it still holds that token.
+
+    The lock is re-entrant within a thread: ``AdrLog.new`` called inside an
+    open transaction nests in the transaction's hold, and
+    :func:`_claim_numbers` keeps both from handing out the same number.
+    """
+    key = directory.resolve()
+    with _held_guard:
+        held = _held.get(key)
+        if held is not None and held.owner == threading.get_ident():
+            held.depth += 1
+        else:
+            held = None
+    if held is not None:
+        try:
+            yield
+        finally:
+            with _held_guard:
+                held.depth -= 1
+        return
+
+    lock = directory / _LOCK_NAME
+    token = f"{os.getpid()}:{threading.get_ident()}:{time.time_ns()}".encode("ascii")
+    _acquire_lock_file(lock, token)
+    try:
+        with _held_guard:
+            _held[key] = _HeldLock(threading.get_ident())
+        released = threading.Event()
+        keeper = threading.Thread(
+            target=_keep_lock_fresh, args=(lock, token, released), daemon=True
+        )
+        keeper.start()
+        try:
+            yield
+        finally:
+            released.set()
+            keeper.join()
+            with _held_guard:
+                del _held[key]
+    finally:
+        held_token: bytes | None
+        try:
+            held_token = lock.read_bytes()
+        except FileNotFoundError:
+            held_token = None
+        if held_token == token:
+            lock.unlink(missing_ok=True)
+
+
+def _acquire_lock_file(lock: Path, token: bytes) -> None:
+    """Create ``lock`` holding ``token``, waiting for or breaking another holder's."""
+    deadline = time.monotonic() + _LOCK_TIMEOUT
+    delay = 0.001
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                stat = lock.stat()
+            except FileNotFoundError:
+                continue
+            if time.time() - stat.st_mtime > _LOCK_STALE_AFTER:
+                _break_stale_lock(lock, stat)
+                continue
+            if time.monotonic() > deadline:
+                message = f"Timed out waiting for {lock}"
+                _raise(TimeoutError(message))
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+            continue
+        try:
+            os.write(fd, token)
+        finally:
+            os.close(fd)
+        return
+
+
+def _keep_lock_fresh(lock: Path, token: bytes, released: threading.Event) -> None:
+    """Touch ``lock`` well within ``_LOCK_STALE_AFTER`` until ``released`` is set."""
+    while not released.wait(_LOCK_STALE_AFTER / 3):
+        try:
+            if lock.read_bytes() == token:
+                os.utime(lock)
+        except FileNotFoundError:
+            return
 
 
-def _read_meta(path: Path) -> dict[str, str]:
+def _claim_numbers(directory: Path, highest_known: int, count: int = 1) -> int:
+    """Hand out ``count`` numbers and return the first; the caller holds the allocation lock.
+
+    Numbers continue after both ``highest_known`` (the caller's view of the
+    directory) and every number already handed out under the current hold.
+    """
+    with _held_guard:
+        held = _held[directory.resolve()]
+        first = max(highest_known, held.allocated) + 1
+        held.allocated = first + count - 1
+    return first
+
+
+def _break_stale_lock(lock: Path, judged: os.stat_result) -> None:
+    """Remove ``lock`` if it is still the file whose stat ``judged`` found stale.
+
+    Breaking is serialized by a second ``O_EXCL`` file, so of several waiters
+    that judged the same lock stale only one removes it, and none removes a
+    fresh lock created after its judgment (same inode and mtime would be
+    needed). A breaker file left by a crash is cleared once it is stale too.
+    """
+    breaker = lock.with_name(f"{lock.name}.break")
+    try:
+        fd = os.open(breaker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            if time.time() - breaker.stat().st_mtime > _LOCK_STALE_AFTER:
+                breaker.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
+        return
+    os.close(fd)
+    try:
+        try:
+            current = lock.stat()
+        except FileNotFoundError:
+            return
+        if (current.st_ino, current.st_mtime_ns) == (judged.st_ino, judged.st_mtime_ns):
+            lock.unlink(missing_ok=True)
+    finally:
+        breaker.unlink(missing_ok=True)
+
+
+def _replay_interrupted_commit(directory: Path, *, locked: bool = False) -> None:
+    """Finish a transaction commit that a crash left journaled in ``directory``.
+
+    Mutations that bypass :mod:`decree.transaction` call this first, so they
+    never edit files the interrupted commit has yet to write. Pass ``locked``
+    when the caller already holds the allocation lock.
+    """
+    if not (directory / STATE_DIR / JOURNAL).exists():
+        return
+    from .transaction import replay_journal  # noqa: PLC0415 - transaction imports this module
+
+    if locked:
+        replay_journal(directory)
+        return
+    with _allocation_lock(directory):
+        replay_journal(directory)
+
+
+def _parse_record(path: Path) -> AdrRecord:
+    title, meta = _read_header(path)
+    with phase("parse"):
+        return _record_from_header(path, title, meta)
+
+
+def _parse_record_and_relations(path: Path) -> tuple[AdrRecord, list[tuple[str, int]]]:
+    """Return the record and relation lines of ``path`` from a single read of the file."""
+    with phase("read"), path.open("rb") as handle:
+        data = handle.read()
+    note_read(data)
+    with phase("parse"):
+        head = data[:_HEADER_READ_LIMIT]
+        title, meta = _parse_header(head, truncated=len(head) == _HEADER_READ_LIMIT)
+        text = data.decode("utf-8")
+        return _record_from_header(path, title, meta), _relations_in(text)
+
+
+def _record_from_header(path: Path, title: str | None, meta: dict[str, str]) -> AdrRecord:
+    return AdrRecord(
+        number=int(path.name[:4]),
+        slug=path.stem.split("-", 1)[1],
+        title=title if title is not None else path.stem,
+        status=AdrStatus(meta.get("Status", "Accepted")),
+        date=meta.get("Date", ""),
+        path=path,
+    )
+
+
+def _read_header(path: Path) -> tuple[str | None, dict[str, str]]:
+    """Parse the heading title and ``Date``/``Status`` lines in one bounded pass.
+
+    Reading stops at the first blank line once the title and both metadata
+    fields are known, or after ``_HEADER_READ_LIMIT`` bytes, so long ADR bodies
+    are never read or decoded.
+    """
+    consumed: list[bytes] = []
+    with phase("read"), path.open("rb") as handle:
+
+        def lines() -> Iterator[str]:
+            remaining = _HEADER_READ_LIMIT
+            while remaining > 0:
+                raw = handle.readline(remaining)
+                if not raw:
+                    return
+                consumed.append(raw)
+                remaining -= len(raw)
+                # Only a line cut short by the byte budget may end mid-character.
+                errors = "strict" if raw.endswith(b"\n") or remaining else "ignore"
+                yield raw.decode("utf-8", errors)
+
+        header = _header_fields(lines())
+    note_read(b"".join(consumed))
+    return header
+
+
+def _parse_header(head: bytes, *, truncated: bool) -> tuple[str | None, dict[str, str]]:
+    """Parse the header of ``head``, the first bytes of a record already in memory."""
+    raw_lines = head.split(b"\n")
+    last = len(raw_lines) - 1
+    return _header_fields(
+        # Only a line cut short by the byte budget may end mid-character.
+        raw.decode("utf-8", "ignore" if truncated and idx == last else "strict")
+        for idx, raw in enumerate(raw_lines)
+    )
+
+
+def _header_fields(lines: Iterable[str]) -> tuple[str | None, dict[str, str]]:
+    """Consume ``lines`` up to the blank line ending a complete header."""
+    title: str | None = None
     meta: dict[str, str] = {}
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if line.startswith("Date: "):
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if title is None and line.startswith("# "):
+            parts = line[2:].split(":", 1)
+            parts_with_label = 2
+            title = parts[1].strip() if len(parts) == parts_with_label else parts[0].strip()
+        elif line.startswith("Date: "):
             meta["Date"] = line.split(":", 1)[1].strip()
         elif line.startswith("Status: "):
             meta["Status"] = line.split(":", 1)[1].strip()
-        if line.strip() == "" and "Date" in meta and "Status" in meta:
+        elif line.strip() == "" and title is not None and "Date" in meta and "Status" in meta:
             break
-    return meta
+    return title, meta
+
+
+def _read_template(template: Path | None) -> str:
+    if template is None:
+        return DEFAULT_TEMPLATE
+    text = template.read_text(encoding="utf-8")
+    note_read(text)
+    return text
+
+
+def _toc_lines(base: Path, records: Iterable[AdrRecord]) -> Iterator[str]:
+    yield "# Architecture decision records"
+    yield ""
+    for rec in records:
+        with phase("render"):
+            rel = rec.path.relative_to(base).as_posix()
+            line = f"- {rec.number:04d}. [{rec.title}]({rel}) — {rec.status} ({rec.date})"
+        yield line
+
+
+def _file_digest(path: Path) -> str | None:
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    note_read(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _map_jobs(function: Callable[[_T], _R], items: Sequence[_T], jobs: int) -> Iterator[_R]:
+    """Yield ``function(item)`` for each item in order.
+
+    With ``jobs`` above one and more than one item the calls run on a thread
+    pool of that size. Each call is counted in the caller's :class:`IoStats`,
+    which worker threads do not inherit.
+    """
+    stats = current_stats()
+
+    def call(item: _T) -> _R:
+        with collecting(stats):
+            return function(item)
+
+    pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 and len(items) > 1 else None
+    try:
+        yield from pool.map(call, items) if pool else map(call, items)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
 
 
 def _raise(exc: Exception) -> NoReturn:
@@ -0,0 +1,411 @@
+"""The relations between ADRs, as an in-memory graph or a Graphviz/Mermaid rendering.
+
+Relations are read from the ``Relation: NNNN`` lines written by
+:func:`decree.core.link_adr`. Renderings are produced line by line while
+records are parsed, reading each file once; the edges already drawn are kept
+to fold reverse links, so memory grows with the number of edges rendered.
+:class:`LinkGraph` keeps the parsed edges of every file in
+``.decree/cache/graph.json`` and answers neighbour and reachability queries
+without reading ADRs again.
+"""
+
+import os
+import re
+from collections import deque
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from .cache import caching_enabled, load_json, store_json
+from .core import (
+    _BASE_RELATIONS,
+    _RECORD_NAME_RE,
+    REVERSE_MAP,
+    AdrLog,
+    _parse_record_and_relations,
+    read_relations,
+)
+from .iostats import note_glob
+from .models import AdrRecord, GraphFormat
+from .profiling import phase
+
+GRAPH_CACHE = "graph.json"
+_GRAPH_VERSION = 1
+
+_GENERATED_REVERSE_RE = re.compile(r"^Is (?P<rel>.+) by$")
+_SYMMETRIC = frozenset(rel for rel, reverse in REVERSE_MAP.items() if rel == reverse)
+
+Edge = tuple[str, int, int]
+Neighbour = tuple[str, int]
+
+SUPERSEDES = "Supersedes"
+
+
+class SupersessionCycleError(ValueError):
+    """Raised when ``Supersedes`` links loop back to an ADR already on the chain."""
+
+    def __init__(self, cycle: list[int]) -> None:
+        """Describe ``cycle``, which starts and ends with the same ADR."""
+        self.cycle = cycle
+        chain = " -> ".join(f"{number:04d}" for number in cycle)
+        super().__init__(f"supersession cycle: {chain}")
+
+
+class LinkGraph:
+    """Forward and reverse relation adjacency keyed by ADR number.
+
+    Every relation line is normalized to a forward edge with
+    :func:`normalize_edge`, so ``Supersedes: 0001`` in 0002 and ``Is
+    superseded by: 0002`` in 0001 are one ``("Supersedes", 2, 1)`` edge.
+    ``Relates to`` is symmetric and is listed in both directions.
+    """
+
+    def __init__(self, adr_dir: Path, files: dict[str, list[Any]], *, enabled: bool) -> None:
+        """Wrap per-file ``[mtime_ns, size, [[relation, number], ...]]`` entries."""
+        self.adr_dir = adr_dir
+        self.enabled = enabled
+        self._files = files
+        self._forward: dict[int, list[Neighbour]] = {}
+        self._reverse: dict[int, list[Neighbour]] = {}
+        self._present: set[int] = set()
+        self._successors: dict[int, list[int]] = {}
+        self._effective: dict[int, tuple[int, ...]] = {}
+        self._index()
+
+    @classmethod
+    def load(cls, adr_dir: Path) -> "LinkGraph":
+        """Build the graph for ``adr_dir``, re-reading only files changed since it was cached."""
+        files: Any = None
+        enabled = caching_enabled(adr_dir)
+        if enabled:
+            data = load_json(adr_dir, GRAPH_CACHE, _GRAPH_VERSION)
+            files = data.get("files") if data else None
+        if not isinstance(files, dict) or not all(_valid_entry(entry) for entry in files.values()):
+            files = {}
+        graph = cls(adr_dir, files, enabled=enabled)
+        graph.refresh()
+        return graph
+
+    def refresh(self) -> bool:
+        """Re-read changed ADR files and drop deleted ones; return whether anything changed."""
+        with phase("scan"), os.scandir(self.adr_dir) as entries:
+            found = [entry for entry in entries if _RECORD_NAME_RE.match(entry.name)]
+        note_glob()
+        changed = False
+        for entry in found:
+            with phase("scan"):
+                stat = entry.stat()
+            cached = self._files.get(entry.name)
+            if isinstance(cached, list) and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+                continue
+            relations = read_relations(Path(entry.path))
+            self._files[entry.name] = [stat.st_mtime_ns, stat.st_size, relations]
+            changed = True
+        stale = self._files.keys() - {entry.name for entry in found}
+        for name in stale:
+            del self._files[name]
+        if changed or stale:
+            self._index()
+            if self.enabled:
+                with phase("write"):
+                    store_json(self.adr_dir, GRAPH_CACHE, _GRAPH_VERSION, {"files": self._files})
+        return changed or bool(stale)
+
+    def replace(self, files: Mapping[str, list[Any] | None]) -> None:
+        """Set the ``[mtime_ns, size, relations]`` entries of the named files and re-index.
+
+        ``None`` drops a file. This serves callers that track file changes
+        themselves, such as the JSON-RPC server's model, without a rescan.
+        """
+        for name, entry in files.items():
+            if entry is None:
+                self._files.pop(name, None)
+            else:
+                self._files[name] = entry
+        self._index()
+
+    def __contains__(self, number: object) -> bool:
+        """Report whether an ADR file with ``number`` exists."""
+        return number in self._present
+
+    def numbers(self) -> list[int]:
+        """Return the numbers of all ADR files, sorted."""
+        return sorted(self._present)
+
+    def edges(self) -> list[Edge]:
+        """Return every distinct forward ``(relation, from, to)`` edge, sorted by source."""
+        return sorted(
+            (rel, src, tgt)
+            for src, neighbours in self._forward.items()
+            for rel, tgt in neighbours
+            if rel not in _SYMMETRIC or src < tgt
+        )
+
+    def outgoing(self, number: int, rel: str | None = None) -> list[Neighbour]:
+        """Return ``(relation, target)`` for the edges leaving ``number``.
+
+        ``graph.outgoing(5, "Supersedes")`` lists what 0005 supersedes.
+        """
+        return [item for item in self._forward.get(number, ()) if rel is None or item[0] == rel]
+
+    def incoming(self, number: int, rel: str | None = None) -> list[Neighbour]:
+        """Return ``(relation, source)`` for the edges pointing at ``number``.
+
+        ``graph.incoming(42, "Supersedes")`` lists what supersedes 0042.
+        """
+        return [item for item in self._reverse.get(number, ()) if rel is None or item[0] == rel]
+
+    def reachable(self, number: int, rel: str | None = None, *, reverse: bool = False) -> list[int]:
+        """Return the ADRs transitively reachable from ``number``, nearest first.
+
+        Only ``rel`` edges are followed when given; ``reverse`` walks edges
+        backwards, e.g. everything that transitively references ``number``.
+        """
+        adjacency = self._reverse if reverse else self._forward
+        seen = {number}
+        order: list[int] = []
+        queue = deque([number])
+        while queue:
+            for edge_rel, neighbour in adjacency.get(queue.popleft(), ()):
+                if neighbour not in seen and (rel is None or edge_rel == rel):
+                    seen.add(neighbour)
+                    order.append(neighbour)
+                    queue.append(neighbour)
+        return order
+
+    def superseded(self) -> set[int]:
+        """Return every ADR that an existing ADR supersedes, in one pass over the edges."""
+        return {number for number, successors in self._successors.items() if successors}
+
+    def effective(self, number: int) -> list[int]:
+        """Return the ADRs currently in effect in place of ``number``.
+
+        ``Supersedes`` links are followed forward in time until an ADR that
+        nothing supersedes; ``number`` itself is returned when it is not
+        superseded, and a decision split by several successors yields all of
+        their heads. Results are memoized per graph, so resolving many ADRs
+        visits each link once. Raises :class:`SupersessionCycleError` when the
+        chain loops.
+        """
+        memo = self._effective
+        if number not in memo:
+            self._resolve(number)
+        return list(memo[number])
+
+    def _resolve(self, start: int) -> None:
+        """Fill the memo for ``start`` with an iterative depth-first walk."""
+        memo = self._effective
+        successors = self._successors
+        path = [start]
+        on_path = {start: 0}
+        stack = [iter(successors.get(start, ()))]
+        while stack:
+            node = path[-1]
+            for following in stack[-1]:
+                if following in memo:
+                    continue
+                if following in on_path:
+                    raise SupersessionCycleError([*path[on_path[following] :], following])
+                on_path[following] = len(path)
+                path.append(following)
+                stack.append(iter(successors.get(following, ())))
+                break
+            else:
+                stack.pop()
+                path.pop()
+                del on_path[node]
+                heads = {head for following in successors.get(node, ()) for head in memo[following]}
+                memo[node] = tuple(sorted(heads)) if heads else (node,)
+
+    def _index(self) -> None:
+        edges: set[Edge] = set()
+        for name, entry in self._files.items():
+            number = int(name[:4])
+            for rel, target in entry[2]:
+                edges.add(normalize_edge(rel, number, target))
+        forward: dict[int, list[Neighbour]] = {}
+        reverse: dict[int, list[Neighbour]] = {}
+        for rel, src, tgt in sorted(edges):
+            forward.setdefault(src, []).append((rel, tgt))
+            reverse.setdefault(tgt, []).append((rel, src))
+            if rel in _SYMMETRIC:
+                forward.setdefault(tgt, []).append((rel, src))
+                reverse.setdefault(src, []).append((rel, tgt))
+        self._forward = forward
+        self._reverse = reverse
+        present = self._present = {int(name[:4]) for name in self._files}
+        self._successors = {
+            number: [src for rel, src in neighbours if rel == SUPERSEDES and src in present]
+            for number, neighbours in reverse.items()
+            if number in present
+        }
+        self._effective = {}
+
+
+def _valid_entry(entry: object) -> bool:
+    return (
+        isinstance(entry, list)
+        and len(entry) == 3  # noqa: PLR2004 - [mtime_ns, size, relations]
+        and isinstance(entry[2], list)
+        and all(
+            isinstance(pair, list)
+            and len(pair) == 2  # noqa: PLR2004 - [relation, number]
+            and isinstance(pair[0], str)
+            and isinstance(pair[1], int)
+            for pair in entry[2]
+        )
+    )
+
+
+def iter_graph_lines(
+    log: AdrLog,
+    fmt: GraphFormat = GraphFormat.dot,
+    *,
+    root: int | None = None,
+    depth: int | None = None,
+) -> Iterator[str]:
+    """Yield the lines of a DOT or Mermaid graph of ``log``'s relations.
+
+    Reverse relation lines (``Is superseded by: 0002``) are folded into their
+    forward edge, so a link recorded on both ADRs is drawn once. Arguments are
+    validated before the first line is produced.
+    """
+    if depth is not None and depth < 0:
+        message = f"depth must not be negative, got {depth}"
+        raise ValueError(message)
+    walk: Iterator[tuple[AdrRecord, list[tuple[str, int]]]]
+    if root is None:
+        walk = _walk_all(log.dir)
+    else:
+        start = _find_record(log.dir, root)
+        if start is None:
+            message = f"ADR {root:04d} not found"
+            raise FileNotFoundError(message)
+        walk = _walk_reachable(log.dir, start, root, depth)
+    renderer = _DotRenderer() if fmt is GraphFormat.dot else _MermaidRenderer()
+    return _render(renderer, walk)
+
+
+def normalize_edge(rel: str, src: int, tgt: int) -> Edge:
+    """Express a relation line found in ``src`` as a forward ``(rel, from, to)`` edge."""
+    if rel in _SYMMETRIC:
+        return rel, min(src, tgt), max(src, tgt)
+    if rel in _BASE_RELATIONS:
+        return rel, src, tgt
+    if rel in REVERSE_MAP:
+        return REVERSE_MAP[rel], tgt, src
+    if match := _GENERATED_REVERSE_RE.match(rel):
+        forward = match.group("rel")
+        return forward[:1].upper() + forward[1:], tgt, src
+    return rel, src, tgt
+
+
+def _render(
+    renderer: "_DotRenderer | _MermaidRenderer",
+    walk: Iterator[tuple[AdrRecord, list[tuple[str, int]]]],
+) -> Iterator[str]:
+    yield from renderer.header()
+    seen: set[Edge] = set()
+    for record, relations in walk:
+        with phase("render"):
+            lines = [renderer.node(record)]
+            for rel, target in relations:
+                edge = normalize_edge(rel, record.number, target)
+                if edge not in seen:
+                    seen.add(edge)
+                    lines.append(renderer.edge(edge))
+        yield from lines
+    yield from renderer.footer()
+
+
+def _walk_all(adr_dir: Path) -> Iterator[tuple[AdrRecord, list[tuple[str, int]]]]:
+    """Yield every ADR in numeric order with its relation lines, reading each file once."""
+    with phase("scan"), os.scandir(adr_dir) as entries:
+        names = sorted(entry.name for entry in entries if _RECORD_NAME_RE.match(entry.name))
+    note_glob()
+    for name in names:
+        yield _parse_record_and_relations(adr_dir / name)
+
+
+def _walk_reachable(
+    adr_dir: Path,
+    start: Path,
+    root: int,
+    depth: int | None,
+) -> Iterator[tuple[AdrRecord, list[tuple[str, int]]]]:
+    """Breadth-first walk reading only the ADRs reachable from ``root``.
+
+    Each reached number is looked up by its own glob, so the directory is
+    never listed as a whole.
+    """
+    distance = {root: 0}
+    queue = deque([(root, start)])
+    while queue:
+        number, path = queue.popleft()
+        hops = distance[number]
+        expand = depth is None or hops < depth
+        record, relations = _parse_record_and_relations(path)
+        kept: list[tuple[str, int]] = []
+        for rel, target in relations:
+            if target not in distance:
+                found = _find_record(adr_dir, target) if expand else None
+                if found is None:
+                    continue
+                distance[target] = hops + 1
+                queue.append((target, found))
+            kept.append((rel, target))
+        yield record, kept
+
+
+def _find_record(adr_dir: Path, number: int) -> Path | None:
+    with phase("scan"):
+        path = next(adr_dir.glob(f"{number:04d}-*.md"), None)
+    note_glob()
+    return path
+
+
+def _node_id(number: int) -> str:
+    return f"adr{number}"
+
+
+def _node_label(record: AdrRecord) -> str:
+    return f"{record.number:04d}. {record.title}"
+
+
+class _DotRenderer:
+    def header(self) -> Iterator[str]:
+        yield "digraph adr {"
+        yield "  node [shape=box];"
+
+    def node(self, record: AdrRecord) -> str:
+        return f'  {_node_id(record.number)} [label="{_dot_escape(_node_label(record))}"];'
+
+    def edge(self, edge: Edge) -> str:
+        rel, src, tgt = edge
+        return f'  {_node_id(src)} -> {_node_id(tgt)} [label="{_dot_escape(rel)}"];'
+
+    def footer(self) -> Iterator[str]:
+        yield "}"
+
+
+class _MermaidRenderer:
+    def header(self) -> Iterator[str]:
+        yield "graph LR"
+
+    def node(self, record: AdrRecord) -> str:
+        return f'  {_node_id(record.number)}["{_mermaid_escape(_node_label(record))}"]'
+
+    def edge(self, edge: Edge) -> str:
+        rel, src, tgt = edge
+        return f'  {_node_id(src)} -->|"{_mermaid_escape(rel)}"| {_node_id(tgt)}'
+
+    def footer(self) -> Iterator[str]:
+        return iter(())
+
+
+def _dot_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _mermaid_escape(text: str) -> str:
+    return text.replace('"', "#quot;")
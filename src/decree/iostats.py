@@ -0,0 +1,139 @@
+"""Counters for the filesystem work done by Decree operations.
+
+Every :class:`~decree.core.AdrLog` owns an :class:`IoStats` that its methods
+make current while they run (including while their iterators are consumed), and
+the title commands do the same with ``ExecutionContext.stats``. The I/O sites
+in ``core``, ``title`` and ``cache`` report to whichever counters are current,
+so nothing is counted outside those calls and counting costs one context
+variable lookup per site. Worker threads started with ``jobs`` above one
+report to the same counters, so updates are serialized by a lock.
+"""
+
+import functools
+import threading
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Concatenate, ParamSpec, Protocol, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass(slots=True)
+class IoStats:
+    """Running totals of globs, file opens, bytes, renames and link substitutions."""
+
+    globs: int = 0
+    files_opened: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    renames: int = 0
+    link_substitutions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the counters keyed by field name."""
+        return asdict(self)
+
+    def summary(self) -> list[str]:
+        """Return one ``name: value`` line per counter."""
+        return [f"{name.replace('_', ' ')}: {value}" for name, value in self.as_dict().items()]
+
+
+_current: ContextVar[IoStats | None] = ContextVar("decree_io_stats", default=None)
+# ``+=`` on a shared counter is not atomic across threads.
+_lock = threading.Lock()
+
+
+def current() -> IoStats | None:
+    """Return the counters operations are currently reporting to, if any."""
+    return _current.get()
+
+
+@contextmanager
+def collecting(stats: IoStats | None) -> Iterator[IoStats | None]:
+    """Make ``stats`` current for the block (``None`` leaves counting off)."""
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class _HasStats(Protocol):
+    _stats: IoStats
+
+
+S = TypeVar("S", bound=_HasStats)
+
+
+def counted(method: Callable[Concatenate[S, P], R]) -> Callable[Concatenate[S, P], R]:
+    """Count the work done by ``method`` into ``self._stats``.
+
+    Generators returned by the method are wrapped so that work done while the
+    caller iterates them is counted too.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: S, /, *args: P.args, **kwargs: P.kwargs) -> R:
+        stats = self._stats
+        with collecting(stats):
+            result = method(self, *args, **kwargs)
+        if isinstance(result, Generator):
+            return _counting_iterator(stats, result)  # type: ignore[return-value]
+        return result
+
+    return wrapper
+
+
+def _counting_iterator(stats: IoStats, inner: Generator[Any, None, None]) -> Iterator[Any]:
+    try:
+        while True:
+            with collecting(stats):
+                try:
+                    item = next(inner)
+                except StopIteration:
+                    return
+            yield item
+    finally:
+        inner.close()
+
+
+def note_glob() -> None:
+    """Count one directory glob or scan."""
+    if (stats := _current.get()) is not None:
+        with _lock:
+            stats.globs += 1
+
+
+def note_read(data: str | bytes) -> None:
+    """Count one file opened for reading and the bytes it returned."""
+    if (stats := _current.get()) is not None:
+        size = len(data) if isinstance(data, bytes) else len(data.encode("utf-8"))
+        with _lock:
+            stats.files_opened += 1
+            stats.bytes_read += size
+
+
+def note_write(data: str | bytes) -> None:
+    """Count one file opened for writing and the bytes written to it."""
+    if (stats := _current.get()) is not None:
+        size = len(data) if isinstance(data, bytes) else len(data.encode("utf-8"))
+        with _lock:
+            stats.files_opened += 1
+            stats.bytes_written += size
+
+
+def note_rename() -> None:
+    """Count one file rename."""
+    if (stats := _current.get()) is not None:
+        with _lock:
+            stats.renames += 1
+
+
+def note_substitutions(count: int) -> None:
+    """Count ``count`` regex link substitutions."""
+    if count and (stats := _current.get()) is not None:
+        with _lock:
+            stats.link_substitutions += count
@@ -16,6 +16,13 @@ class AdrStatus(StrEnum):
     Rejected = "Rejected"
 
 
+class GraphFormat(StrEnum):
+    """Output formats supported by ``generate graph``."""
+
+    dot = "dot"
+    mermaid = "mermaid"
+
+
 @dataclass(frozen=True, slots=True)
 class AdrRef:
     """Reference to an ADR by its numeric identifier."""
@@ -33,6 +40,15 @@ class LinkSpec:
     reverse: bool = False
 
 
+@dataclass(frozen=True, slots=True)
+class NewSpec:
+    """Creation request for a single ADR."""
+
+    title: str
+    status: AdrStatus = AdrStatus.Accepted
+    date: str | None = None
+
+
 @dataclass(frozen=True, slots=True)
 class AdrRecord:
     """Materialized ADR entry as persisted on disk."""
@@ -0,0 +1,117 @@
+"""Opt-in wall-clock timing of the phases of Decree operations.
+
+``core`` and ``title`` wrap their directory scans, file reads, parsing,
+rendering and writes in :func:`phase`. Nothing is recorded unless a
+:class:`PhaseTimer` is active, in which case each phase is charged its
+*exclusive* time: a ``parse`` nested inside a ``render`` is not counted twice.
+With ``jobs`` above one, time spent on worker threads is summed across threads.
+
+>>> import tempfile
+>>> from pathlib import Path
+>>> from decree import AdrLog
+>>> from decree.profiling import record_phases
+>>> with tempfile.TemporaryDirectory() as tmp, record_phases() as timer:
+...     toc = AdrLog.init(Path(tmp) / "adr").generate_toc()
+>>> timer.counts["parse"]
+1
+>>> timer.summary()[-1].startswith("total")
+True
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+
+PHASES = ("scan", "read", "parse", "render", "write")
+
+
+class PhaseTimer:
+    """Accumulate exclusive wall-clock time and call counts per phase."""
+
+    def __init__(self) -> None:
+        """Start with every phase at zero."""
+        self.totals: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.counts: dict[str, int] = dict.fromkeys(PHASES, 0)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Charge the time spent in the block to ``name``, pausing any outer phase."""
+        stack: list[_Frame] = self._local.__dict__.setdefault("stack", [])
+        now = time.perf_counter()
+        if stack:
+            self._charge(stack[-1], now)
+        frame = _Frame(name, now)
+        stack.append(frame)
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._charge(frame, now)
+            if stack and stack[-1] is frame:
+                stack.pop()
+                if stack:
+                    stack[-1].started = now
+            else:
+                # A generator closed out of order; drop its frame where it is.
+                stack.remove(frame)
+
+    def summary(self) -> list[str]:
+        """Return one aligned line per phase that ran, plus the total."""
+        lines = [
+            f"{name:<7}{self.totals[name]:>9.4f}s  {self.counts[name]:>7} calls"
+            for name in self.totals
+            if self.counts[name]
+        ]
+        lines.append(f"{'total':<7}{sum(self.totals.values()):>9.4f}s")
+        return lines
+
+    def _charge(self, frame: "_Frame", now: float) -> None:
+        with self._lock:
+            self.totals[frame.name] = self.totals.get(frame.name, 0.0) + now - frame.started
+        frame.started = now
+
+
+@dataclass(slots=True)
+class _Frame:
+    name: str
+    started: float
+
+
+_active: PhaseTimer | None = None
+_NOOP: AbstractContextManager[None] = nullcontext()
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    """Time a block as ``name`` when a timer is active; otherwise do nothing."""
+    timer = _active
+    return _NOOP if timer is None else timer.phase(name)
+
+
+def start() -> PhaseTimer:
+    """Install and return a fresh process-wide timer."""
+    global _active  # noqa: PLW0603 - one timer per process, like cProfile
+    _active = PhaseTimer()
+    return _active
+
+
+def stop() -> PhaseTimer | None:
+    """Uninstall the active timer and return it."""
+    global _active
+    timer, _active = _active, None
+    return timer
+
+
+@contextmanager
+def record_phases() -> Iterator[PhaseTimer]:
+    """Record phase timings for the duration of the ``with`` block."""
+    timer = start()
+    try:
+        yield timer
+    finally:
+        stop()
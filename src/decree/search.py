@@ -0,0 +1,181 @@
+"""Full-text search over ADR files with a persistent inverted index.
+
+The index maps each token to postings of ``{document id: term frequency}`` and
+keeps one ``[mtime_ns, size, token count, document id]`` entry per file name. It is stored in
+``.decree/cache/search.json`` when the repository opted into caches. Each
+search stats the ADR files and re-tokenizes only those whose fingerprint
+changed, so steady-state searches read one file. Results are ranked with
+Okapi BM25.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .cache import caching_enabled, load_json, store_json
+from .iostats import note_read
+from .models import AdrRecord
+from .profiling import phase
+
+SEARCH_CACHE = "search.json"
+_SEARCH_VERSION = 1
+# Each document entry is [mtime_ns, size, token count, document id].
+_DOCUMENT_FIELDS = 4
+
+# Standard Okapi BM25 parameters.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split ``text`` into lowercase alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    """One ranked match and its BM25 score."""
+
+    record: AdrRecord
+    score: float
+
+
+class SearchIndex:
+    """Inverted index over the ADR files of one directory."""
+
+    def __init__(
+        self,
+        adr_dir: Path,
+        documents: dict[str, list[int]],
+        postings: dict[str, dict[str, int]],
+        *,
+        enabled: bool,
+    ) -> None:
+        """Wrap ``documents`` and ``postings`` previously loaded for ``adr_dir``."""
+        self.adr_dir = adr_dir
+        self.enabled = enabled
+        self._documents = documents
+        self._postings = postings
+        self._next_id = max((document[3] for document in documents.values()), default=-1) + 1
+        self._dirty = False
+
+    @classmethod
+    def load(cls, adr_dir: Path) -> "SearchIndex":
+        """Load the index for ``adr_dir``, starting empty when unusable."""
+        if not caching_enabled(adr_dir):
+            return cls(adr_dir, {}, {}, enabled=False)
+        data = load_json(adr_dir, SEARCH_CACHE, _SEARCH_VERSION)
+        documents: Any = data.get("documents") if data else None
+        postings: Any = data.get("postings") if data else None
+        if not _valid_index(documents, postings):
+            documents, postings = {}, {}
+        return cls(adr_dir, documents, postings, enabled=True)
+
+    def refresh(self, entries: Iterable[os.DirEntry[str]]) -> None:
+        """Re-index the files in ``entries`` that changed and forget missing ones."""
+        seen: set[str] = set()
+        stale: set[str] = set()
+        changed: list[tuple[str, os.stat_result, list[str]]] = []
+        for entry in entries:
+            seen.add(entry.name)
+            with phase("scan"):
+                stat = entry.stat()
+            document = self._documents.get(entry.name)
+            if document is not None:
+                if document[:2] == [stat.st_mtime_ns, stat.st_size]:
+                    continue
+                stale.add(str(document[3]))
+            with phase("read"):
+                text = Path(entry.path).read_text(encoding="utf-8", errors="replace")
+            note_read(text)
+            with phase("parse"):
+                changed.append((entry.name, stat, tokenize(text)))
+        for name in self._documents.keys() - seen:
+            stale.add(str(self._documents.pop(name)[3]))
+        if stale:
+            self._drop_postings(stale)
+        for name, stat, tokens in changed:
+            self._add(name, stat, tokens)
+
+    def search(self, query: str, *, limit: int | None = None) -> list[tuple[str, float]]:
+        """Return ``(file name, score)`` for files matching any token of ``query``, best first."""
+        count = len(self._documents)
+        if not count:
+            return []
+        names = {str(document[3]): name for name, document in self._documents.items()}
+        lengths = {str(document[3]): document[2] for document in self._documents.values()}
+        average = sum(lengths.values()) / count or 1.0
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            frequency = len(postings)
+            idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for doc_id, tf in postings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        ranked = sorted(
+            ((names[doc_id], score) for doc_id, score in scores.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return ranked[:limit]
+
+    def save(self) -> None:
+        """Persist the index when it changed."""
+        if self.enabled and self._dirty:
+            store_json(
+                self.adr_dir,
+                SEARCH_CACHE,
+                _SEARCH_VERSION,
+                {"documents": self._documents, "postings": self._postings},
+            )
+            self._dirty = False
+
+    def _add(self, name: str, stat: os.stat_result, tokens: list[str]) -> None:
+        doc_id = self._next_id
+        self._next_id += 1
+        key = str(doc_id)
+        for term, tf in Counter(tokens).items():
+            self._postings.setdefault(term, {})[key] = tf
+        self._documents[name] = [stat.st_mtime_ns, stat.st_size, len(tokens), doc_id]
+        self._dirty = True
+
+    def _drop_postings(self, doc_ids: set[str]) -> None:
+        """Remove ``doc_ids`` from every posting list in one sweep."""
+        for term in list(self._postings):
+            postings = self._postings[term]
+            for doc_id in doc_ids & postings.keys():
+                del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._dirty = True
+
+
+def _valid_index(documents: object, postings: object) -> bool:
+    """Report whether cached ``documents`` and ``postings`` are consistent with each other."""
+    if not isinstance(documents, dict) or not isinstance(postings, dict):
+        return False
+    ids: set[str] = set()
+    for document in documents.values():
+        if (
+            not isinstance(document, list)
+            or len(document) != _DOCUMENT_FIELDS
+            or not all(isinstance(value, int) for value in document)
+        ):
+            return False
+        ids.add(str(document[3]))
+    # Every posting must name a known document with an integer term frequency.
+    return all(
+        isinstance(entries, dict)
+        and entries.keys() <= ids
+        and all(isinstance(tf, int) for tf in entries.values())
+        for entries in postings.values()
+    )
@@ -0,0 +1,329 @@
+"""Line-delimited JSON-RPC 2.0 server keeping an ADR log in memory.
+
+Each request is one JSON object per line on stdin and each response one line on
+stdout. The server parses every record once and keeps records, relation lines
+and a :class:`~decree.graph.LinkGraph` in memory. Before each request it asks a
+:mod:`decree.watch` change source which files changed outside the server
+(inotify on Linux, so nothing is re-stat'ed at steady state; a directory scan
+elsewhere) and re-parses only those. Mutations performed by the server update
+just the entries they touched. A file that does not parse is reported on
+stderr and skipped, keeping its last good entry, until a later save parses.
+"""
+
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+import click
+
+from .core import _RECORD_NAME_RE, AdrLog, _parse_record_and_relations
+from .graph import LinkGraph
+from .models import AdrRecord, AdrRef, AdrStatus
+from .watch import ChangeSource, _print_error, open_source
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+APPLICATION_ERROR = -32000
+
+
+class RpcError(Exception):
+    """A JSON-RPC error object to return to the client."""
+
+    def __init__(self, code: int, message: str) -> None:
+        """Store the JSON-RPC ``code`` alongside ``message``."""
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    mtime_ns: int
+    size: int
+    record: AdrRecord
+    relations: list[tuple[str, int]]
+
+
+class LogModel:
+    """Records, headings, relation lines and link graph of an ADR directory, in memory."""
+
+    def __init__(
+        self,
+        log: AdrLog,
+        source: ChangeSource | None = None,
+        *,
+        on_error: Callable[[str], None] | None = None,
+    ) -> None:
+        """Load every record of ``log`` and follow outside edits through ``source``.
+
+        ``source`` defaults to :func:`decree.watch.open_source` for the log's
+        directory. ``on_error`` receives a message for each file that cannot
+        be parsed; it defaults to writing to stderr.
+        """
+        self.log = log
+        self.source = source if source is not None else open_source(log.dir)
+        self.on_error = on_error if on_error is not None else _print_error
+        self.graph = LinkGraph(log.dir, {}, enabled=False)
+        self._entries: dict[str, _Entry] = {}
+        with os.scandir(log.dir) as entries:
+            self._apply([entry.name for entry in entries if _RECORD_NAME_RE.match(entry.name)])
+
+    def refresh(self) -> None:
+        """Re-parse the files the change source reports as edited outside the server."""
+        self._apply(self.source.wait(0))
+
+    def update(self, *paths: Path) -> None:
+        """Re-parse ``paths``, or drop them when gone, after the server changed them."""
+        self._apply(path.name for path in paths)
+
+    def records(self) -> Iterator[tuple[AdrRecord, list[tuple[str, int]]]]:
+        """Yield records with their relation lines in numeric order."""
+        for name in sorted(self._entries):
+            entry = self._entries[name]
+            yield entry.record, entry.relations
+
+    def close(self) -> None:
+        """Stop following outside edits."""
+        self.source.close()
+
+    def _apply(self, names: Iterable[str]) -> None:
+        changes: dict[str, list[Any] | None] = {}
+        for name in names:
+            path = self.log.dir / name
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                if self._entries.pop(name, None) is not None:
+                    changes[name] = None
+                continue
+            cached = self._entries.get(name)
+            if cached is not None and (cached.mtime_ns, cached.size) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                continue
+            try:
+                record, relations = _parse_record_and_relations(path)
+            except (OSError, ValueError) as exc:
+                # Typically a save in the middle of an edit: keep the last good entry.
+                self.on_error(f"{name}: {exc}")
+                continue
+            self._entries[name] = _Entry(stat.st_mtime_ns, stat.st_size, record, relations)
+            changes[name] = [stat.st_mtime_ns, stat.st_size, relations]
+        if changes:
+            self.graph.replace(changes)
+
+
+class JsonRpcServer:
+    """Dispatch JSON-RPC requests to an :class:`AdrLog` and its in-memory model."""
+
+    def __init__(
+        self,
+        log: AdrLog,
+        source: ChangeSource | None = None,
+        *,
+        on_error: Callable[[str], None] | None = None,
+    ) -> None:
+        """Serve ``log``, loading its records up front; see :class:`LogModel` for the rest."""
+        self.log = log
+        self.model = LogModel(log, source, on_error=on_error)
+        self._methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "list": self._list,
+            "links": self._links,
+            "new": self._new,
+            "link": self._link,
+            "unlink": self._unlink,
+            "title.set": self._title_set,
+            "title.sync": self._title_sync,
+        }
+
+    def serve(self, stdin: IO[str], stdout: IO[str]) -> None:
+        """Answer requests from ``stdin`` until it is closed, then :meth:`close`."""
+        try:
+            for line in stdin:
+                if not line.strip():
+                    continue
+                response = self.handle(line)
+                if response is not None:
+                    stdout.write(response)
+                    stdout.write("\n")
+                    stdout.flush()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Release the model's change source."""
+        self.model.close()
+
+    def handle(self, line: str) -> str | None:
+        """Return the serialized response to one request line, or ``None`` for notifications."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as exc:
+            return _error_response(None, PARSE_ERROR, f"Parse error: {exc.msg}")
+        if not isinstance(request, dict):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        notification = "id" not in request
+        try:
+            result = self._dispatch(request)
+        except RpcError as exc:
+            return None if notification else _error_response(request_id, exc.code, exc.message)
+        if notification:
+            return None
+        return json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def _dispatch(self, request: dict[str, Any]) -> Any:  # noqa: ANN401 - JSON result
+        method = request.get("method")
+        params = request.get("params", {})
+        if request.get("jsonrpc") != "2.0" or not isinstance(method, str):
+            raise RpcError(INVALID_REQUEST, "Invalid request")
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params must be an object")
+        handler = self._methods.get(method)
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        try:
+            self.model.refresh()
+            return handler(params)
+        except RpcError:
+            raise
+        except click.ClickException as exc:
+            raise RpcError(APPLICATION_ERROR, exc.format_message()) from exc
+        except (OSError, ValueError, TimeoutError) as exc:
+            raise RpcError(APPLICATION_ERROR, str(exc)) from exc
+        except Exception as exc:  # report instead of killing the server
+            raise RpcError(INTERNAL_ERROR, f"{type(exc).__name__}: {exc}") from exc
+
+    def _list(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        _no_extra(params, {"effective"})
+        effective = _param(params, "effective", bool, False)  # noqa: FBT003 - JSON default
+        superseded = self.model.graph.superseded() if effective else set()
+        return [
+            _record_json(record, relations)
+            for record, relations in self.model.records()
+            if not effective
+            or (record.number not in superseded and record.status is not AdrStatus.Superseded)
+        ]
+
+    def _links(self, params: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+        _no_extra(params, {"number"})
+        number = _param(params, "number", int)
+        if number not in self.model.graph:
+            raise RpcError(APPLICATION_ERROR, f"ADR {number:04d} not found")
+        graph = self.model.graph
+        return {
+            "outgoing": [{"rel": rel, "number": tgt} for rel, tgt in graph.outgoing(number)],
+            "incoming": [{"rel": rel, "number": src} for rel, src in graph.incoming(number)],
+        }
+
+    def _new(self, params: dict[str, Any]) -> dict[str, Any]:
+        _no_extra(params, {"title", "status", "date", "template"})
+        title = _param(params, "title", str)
+        status = _param(params, "status", str, "Accepted")
+        date = _param(params, "date", str, None)
+        template = _param(params, "template", str, None)
+        try:
+            adr_status = AdrStatus(status.title())
+        except ValueError as exc:
+            raise RpcError(INVALID_PARAMS, f"Invalid status: {status}") from exc
+        record = self.log.new(
+            title,
+            status=adr_status,
+            template=Path(template) if template else None,
+            date=date,
+        )
+        self.model.update(record.path)
+        return _record_json(record, [])
+
+    def _link(self, params: dict[str, Any]) -> None:
+        self._relation(params, self.log.link)
+
+    def _unlink(self, params: dict[str, Any]) -> None:
+        self._relation(params, self.log.unlink)
+
+    def _relation(self, params: dict[str, Any], apply: Callable[..., None]) -> None:
+        _no_extra(params, {"src", "rel", "tgt", "reverse"})
+        src = _param(params, "src", int)
+        rel = _param(params, "rel", str).strip()
+        tgt = _param(params, "tgt", int)
+        reverse = _param(params, "reverse", bool, False)  # noqa: FBT003 - JSON default
+        apply(AdrRef(src), rel, AdrRef(tgt), reverse=reverse)
+        self.model.update(self.log._path_for(src), self.log._path_for(tgt))  # noqa: SLF001 - same package
+
+    def _title_set(self, params: dict[str, Any]) -> dict[str, list[str]]:
+        from .title import ExecutionContext, update_title  # noqa: PLC0415 - title is loaded lazily
+
+        _no_extra(params, {"target", "title", "rename", "dry_run"})
+        target = _param(params, "target", (str, int))
+        title = _param(params, "title", str)
+        rename = _param(params, "rename", bool, None)
+        dry_run = _param(params, "dry_run", bool, False)  # noqa: FBT003 - JSON default
+        messages: list[str] = []
+        ctx = ExecutionContext(dry_run=dry_run, emit=messages.append)
+        update_title(self.log.dir, str(target), title, rename=rename, ctx=ctx)
+        self.model.update(*ctx.changed)
+        return {"messages": messages}
+
+    def _title_sync(self, params: dict[str, Any]) -> dict[str, list[str]]:
+        from .title import ExecutionContext, sync_titles  # noqa: PLC0415 - title is loaded lazily
+
+        _no_extra(params, {"rename", "dry_run"})
+        rename = _param(params, "rename", bool, None)
+        dry_run = _param(params, "dry_run", bool, False)  # noqa: FBT003 - JSON default
+        messages: list[str] = []
+        ctx = ExecutionContext(dry_run, messages.append)
+        sync_titles(self.log.dir, rename=rename, ctx=ctx)
+        self.model.update(*ctx.changed)
+        return {"messages": messages}
+
+
+_MISSING = object()
+
+
+def _param(
+    params: dict[str, Any],
+    name: str,
+    kind: type | tuple[type, ...],
+    default: Any = _MISSING,  # noqa: ANN401 - any JSON value
+) -> Any:  # noqa: ANN401 - any JSON value
+    value = params.get(name, default)
+    if value is _MISSING:
+        raise RpcError(INVALID_PARAMS, f"Missing parameter: {name}")
+    if value is default:
+        return value
+    # JSON has no separate boolean and integer types in Python's eyes.
+    if isinstance(value, bool) and bool not in (kind if isinstance(kind, tuple) else (kind,)):
+        raise RpcError(INVALID_PARAMS, f"Invalid parameter: {name}")
+    if not isinstance(value, kind):
+        raise RpcError(INVALID_PARAMS, f"Invalid parameter: {name}")
+    return value
+
+
+def _no_extra(params: dict[str, Any], allowed: set[str]) -> None:
+    if unknown := params.keys() - allowed:
+        raise RpcError(INVALID_PARAMS, f"Unknown parameter: {', '.join(sorted(unknown))}")
+
+
+def _record_json(record: AdrRecord, relations: list[tuple[str, int]]) -> dict[str, Any]:
+    return {
+        "number": record.number,
+        "slug": record.slug,
+        "title": record.title,
+        "status": record.status.value,
+        "date": record.date,
+        "path": str(record.path),
+        "relations": [{"rel": rel, "number": number} for rel, number in relations],
+    }
+
+
+def _error_response(request_id: object, code: int, message: str) -> str:
+    return json.dumps(
+        {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+    )
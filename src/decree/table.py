@@ -0,0 +1,296 @@
+"""Columnar, in-memory representation of an ADR log.
+
+:class:`AdrTable` keeps one compact column per field instead of one
+:class:`~decree.models.AdrRecord` (and ``Path``) per record: numbers and date
+ordinals in :mod:`array` buffers, statuses as one-byte codes, and slugs and
+titles concatenated into a single string per column with an offset array.
+Filtering and sorting produce new tables that share those columns and differ
+only in their row selection; records are materialized on demand.
+
+The first :meth:`AdrTable.where` call on a table sorts its rows by number and
+by date and buckets them by status, which costs one pass and sort over every
+row. The result lives only in memory, shared by the tables derived from the
+same columns, so it pays off when one table is filtered more than once; a
+table used for a single query does the same work as a scan.
+"""
+
+import bisect
+import datetime as dt
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .models import AdrRecord, AdrStatus
+
+STATUSES: tuple[AdrStatus, ...] = tuple(AdrStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+# Ordinal stored for dates that are missing or not ISO formatted.
+NO_DATE = -1
+_MAX_NUMBER = 2**32 - 1
+
+SORT_KEYS = ("number", "date", "status", "title")
+
+
+@dataclass(frozen=True, slots=True)
+class _StringColumn:
+    """Strings stored back to back in ``data``; row ``i`` spans ``offsets[i:i + 2]``."""
+
+    data: str
+    offsets: "array[int]"
+
+    @classmethod
+    def build(cls, values: Sequence[str]) -> "_StringColumn":
+        offsets = array("Q", [0])
+        total = 0
+        for value in values:
+            total += len(value)
+            offsets.append(total)
+        return cls("".join(values), offsets)
+
+    def __getitem__(self, row: int) -> str:
+        return self.data[self.offsets[row] : self.offsets[row + 1]]
+
+
+@dataclass(frozen=True, slots=True)
+class _SortedIndex:
+    """``rows`` ordered by ``keys``, the column value of each row."""
+
+    keys: "array[int]"
+    rows: "array[int]"
+
+    @classmethod
+    def build(cls, column: Sequence[int]) -> "_SortedIndex":
+        rows = sorted(range(len(column)), key=column.__getitem__)
+        return cls(array("q", [column[row] for row in rows]), array("I", rows))
+
+    def between(self, low: int, high: int) -> "array[int]":
+        """Return the rows whose key is in ``[low, high]``."""
+        start = bisect.bisect_left(self.keys, low)
+        stop = bisect.bisect_right(self.keys, high, lo=start)
+        return self.rows[start:stop]
+
+
+@dataclass(frozen=True, slots=True)
+class _Index:
+    numbers: _SortedIndex
+    dates: _SortedIndex
+    statuses: dict[int, "array[int]"]
+
+
+@dataclass(slots=True)
+class _Columns:
+    numbers: "array[int]"
+    statuses: "array[int]"
+    dates: "array[int]"
+    raw_dates: dict[int, str]
+    slugs: _StringColumn
+    titles: _StringColumn
+    _index: _Index | None = field(default=None, repr=False, compare=False)
+
+    def index(self) -> _Index:
+        if self._index is None:
+            buckets: dict[int, array[int]] = {code: array("I") for code in _STATUS_CODES.values()}
+            for row, code in enumerate(self.statuses):
+                buckets[code].append(row)
+            self._index = _Index(
+                _SortedIndex.build(self.numbers), _SortedIndex.build(self.dates), buckets
+            )
+        return self._index
+
+
+class TableBuilder:
+    """Accumulate rows in column order and freeze them into an :class:`AdrTable`."""
+
+    def __init__(self) -> None:
+        """Start with no rows."""
+        self._numbers = array("I")
+        self._statuses = array("B")
+        self._dates = array("l")
+        self._raw_dates: dict[int, str] = {}
+        self._slugs: list[str] = []
+        self._titles: list[str] = []
+
+    def append(self, number: int, slug: str, title: str, status: AdrStatus, date: str) -> None:
+        """Add one record's fields."""
+        ordinal = _date_ordinal(date)
+        if ordinal == NO_DATE and date:
+            self._raw_dates[len(self._numbers)] = date
+        self._numbers.append(number)
+        self._statuses.append(_STATUS_CODES[status])
+        self._dates.append(ordinal)
+        self._slugs.append(slug)
+        self._titles.append(title)
+
+    def build(self, base: Path) -> "AdrTable":
+        """Return a table for records stored under ``base``."""
+        columns = _Columns(
+            self._numbers,
+            self._statuses,
+            self._dates,
+            self._raw_dates,
+            _StringColumn.build(self._slugs),
+            _StringColumn.build(self._titles),
+        )
+        return AdrTable(base, columns, range(len(self._numbers)))
+
+
+class AdrTable:
+    """A read-only, column-oriented snapshot of ADR metadata.
+
+    Obtain one with :meth:`decree.core.AdrLog.table` or
+    :meth:`AdrTable.from_records`. Iterating yields :class:`AdrRecord` objects
+    built one at a time from the columns.
+    """
+
+    __slots__ = ("_columns", "_rows", "base")
+
+    def __init__(self, base: Path, columns: _Columns, rows: Sequence[int]) -> None:
+        """Wrap ``columns`` for ``base``, exposing the selected ``rows`` in order."""
+        self.base = base
+        self._columns = columns
+        self._rows = rows
+
+    @classmethod
+    def from_records(cls, base: Path, records: Iterable[AdrRecord]) -> "AdrTable":
+        """Build a table from already materialized records."""
+        builder = TableBuilder()
+        for record in records:
+            builder.append(record.number, record.slug, record.title, record.status, record.date)
+        return builder.build(base)
+
+    def __len__(self) -> int:
+        """Return the number of selected rows."""
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[AdrRecord]:
+        """Yield a record for each selected row."""
+        for row in self._rows:
+            yield self._record(row)
+
+    def __getitem__(self, index: int) -> AdrRecord:
+        """Return the record at position ``index`` of the selection."""
+        return self._record(self._rows[index])
+
+    def numbers(self) -> "array[int]":
+        """Return the ADR numbers of the selected rows."""
+        numbers = self._columns.numbers
+        return array("I", (numbers[row] for row in self._rows))
+
+    def where(
+        self,
+        *,
+        status: AdrStatus | Iterable[AdrStatus] | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        first: int | None = None,
+        last: int | None = None,
+    ) -> "AdrTable":
+        """Return the rows matching every given condition.
+
+        ``since``/``until`` are inclusive ISO dates and exclude records without
+        a valid date; ``first``/``last`` bound the ADR number inclusively.
+
+        The smallest candidate set found in the sorted rows is checked against
+        the remaining conditions. The first call on a table sorts every row;
+        later calls on it, or on tables derived from it, cost the number of
+        matches rather than the size of the log. Rows keep the order of this
+        table.
+        """
+        columns = self._columns
+        conditions: list[tuple[Sequence[int], Callable[[int], bool]]] = []
+        index = columns.index()
+        if status is not None:
+            wanted = {status} if isinstance(status, AdrStatus) else set(status)
+            codes = {_STATUS_CODES[value] for value in wanted}
+            matches = sorted(row for code in codes for row in index.statuses[code])
+            statuses = columns.statuses
+            conditions.append((matches, lambda row: statuses[row] in codes))
+        if since is not None or until is not None:
+            since_ordinal = _parse_bound(since, "since") if since is not None else 0
+            until_ordinal = (
+                _parse_bound(until, "until") if until is not None else dt.date.max.toordinal()
+            )
+            dates = columns.dates
+            conditions.append(
+                (
+                    index.dates.between(since_ordinal, until_ordinal),
+                    lambda row: since_ordinal <= dates[row] <= until_ordinal,
+                )
+            )
+        if first is not None or last is not None:
+            low = first if first is not None else 0
+            high = last if last is not None else _MAX_NUMBER
+            numbers = columns.numbers
+            conditions.append(
+                (index.numbers.between(low, high), lambda row: low <= numbers[row] <= high)
+            )
+        if not conditions:
+            return self
+        candidates, _ = min(conditions, key=lambda condition: len(condition[0]))
+        checks = [check for matches, check in conditions if matches is not candidates]
+        if isinstance(self._rows, range) and self._rows == range(len(columns.numbers)):
+            rows: Iterable[int] = sorted(candidates)
+        else:
+            selected = set(candidates)
+            rows = (row for row in self._rows if row in selected)
+        return AdrTable(
+            self.base, columns, _as_rows(row for row in rows if all(c(row) for c in checks))
+        )
+
+    def sort_by(self, key: str = "number", *, reverse: bool = False) -> "AdrTable":
+        """Return the rows ordered by ``key`` (number, date, status or title); ties keep order."""
+        columns = self._columns
+        if key == "number":
+            column: Sequence[int] | _StringColumn = columns.numbers
+        elif key == "date":
+            column = columns.dates
+        elif key == "status":
+            column = columns.statuses
+        elif key == "title":
+            column = columns.titles
+        else:
+            message = f"unknown sort key {key!r}, expected one of {', '.join(SORT_KEYS)}"
+            raise ValueError(message)
+        rows = sorted(self._rows, key=column.__getitem__, reverse=reverse)
+        return AdrTable(self.base, columns, _as_rows(rows))
+
+    def _record(self, row: int) -> AdrRecord:
+        columns = self._columns
+        number = columns.numbers[row]
+        slug = columns.slugs[row]
+        ordinal = columns.dates[row]
+        date = (
+            dt.date.fromordinal(ordinal).isoformat()
+            if ordinal != NO_DATE
+            else columns.raw_dates.get(row, "")
+        )
+        return AdrRecord(
+            number=number,
+            slug=slug,
+            title=columns.titles[row],
+            status=STATUSES[columns.statuses[row]],
+            date=date,
+            path=self.base / f"{number:04d}-{slug}.md",
+        )
+
+
+def _date_ordinal(value: str) -> int:
+    try:
+        parsed = dt.date.fromisoformat(value)
+    except ValueError:
+        return NO_DATE
+    # Only canonical YYYY-MM-DD strings survive the round trip through an ordinal.
+    return parsed.toordinal() if parsed.isoformat() == value else NO_DATE
+
+
+def _parse_bound(value: str, name: str) -> int:
+    ordinal = _date_ordinal(value)
+    if ordinal == NO_DATE:
+        message = f"{name} must be an ISO date (YYYY-MM-DD), got {value!r}"
+        raise ValueError(message)
+    return ordinal
+
+
+def _as_rows(rows: Iterable[int]) -> Sequence[int]:
+    return rows if isinstance(rows, range) else array("I", rows)
@@ -5,16 +5,32 @@ including renaming files and updating cross-references throughout the ADR direct
 """
 
 import os
+import posixpath
 import re
-import tomllib
-from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 import click
 
+from .atomic import batch, rename_atomic, write_atomic
+from .cache import caching_enabled, load_json, store_json
+from .core import _replay_interrupted_commit
+from .iostats import (
+    IoStats,
+    collecting,
+    note_glob,
+    note_read,
+    note_substitutions,
+)
+from .profiling import phase
 from .utils import slugify
 
+LINKS_CACHE = "links.json"
+_LINKS_VERSION = 1
+_LINKS_ENTRY_FIELDS = 3
+
 
 @dataclass
 class TitleConfig:
@@ -35,11 +51,20 @@ class ExecutionContext:
     Attributes:
         dry_run: If True, preview changes without writing.
         emit: Callback function to output messages.
+        stats: I/O counters updated by the operations run with this context.
+        changed: Files written by the operations; a rename lists both names.
 
     """
 
     dry_run: bool
     emit: Callable[[str], None]
+    stats: IoStats = field(default_factory=IoStats)
+    changed: list[Path] = field(default_factory=list)
+
+    def wrote(self, *paths: Path) -> None:
+        """Record ``paths`` in :attr:`changed` unless this is a dry run."""
+        if not self.dry_run:
+            self.changed.extend(paths)
 
 
 @dataclass
@@ -85,6 +110,87 @@ class TitleError(click.ClickException):
         super().__init__(message)
 
 
+class LinkIndex:
+    """Reverse index from link targets to the markdown files that reference them.
+
+    Targets are stored as POSIX paths relative to the indexed directory. Each
+    file's outgoing links are cached with its ``mtime_ns`` and size under
+    ``.decree/cache/`` (when the repository has a ``.decree`` directory), so a
+    refresh only re-reads files edited since the previous run.
+    """
+
+    def __init__(self, base: Path, files: dict[str, list[Any]]) -> None:
+        """Create an index for ``base`` from previously cached ``files`` entries."""
+        self.base = base
+        self._files = files
+        self._reverse: dict[str, set[str]] | None = None
+        self._dirty = False
+
+    @classmethod
+    def load(cls, base: Path) -> "LinkIndex":
+        """Load the persisted index for ``base``, starting empty when unusable."""
+        data = load_json(base, LINKS_CACHE, _LINKS_VERSION) if caching_enabled(base) else None
+        files = data.get("files") if data else None
+        return cls(base, files if isinstance(files, dict) else {})
+
+    def refresh(self) -> None:
+        """Re-parse markdown files whose stat fingerprint changed since the last refresh."""
+        seen: set[str] = set()
+        with phase("scan"):
+            entries = [(entry, entry.stat()) for entry in self.base.rglob("*.md")]
+        note_glob()
+        for entry, stat in entries:
+            key = entry.relative_to(self.base).as_posix()
+            seen.add(key)
+            cached = self._files.get(key)
+            if (
+                isinstance(cached, list)
+                and len(cached) == _LINKS_ENTRY_FIELDS
+                and cached[:2] == [stat.st_mtime_ns, stat.st_size]
+                and isinstance(cached[2], list)
+            ):
+                continue
+            with phase("read"):
+                text = entry.read_text(encoding="utf-8")
+            note_read(text)
+            self._store(key, stat, text)
+        for key in self._files.keys() - seen:
+            del self._files[key]
+            self._reverse = None
+            self._dirty = True
+
+    def update(self, entry: Path, text: str) -> None:
+        """Record ``text`` as the current content of ``entry``."""
+        self._store(self._key(entry), entry.stat(), text)
+
+    def referrers(self, target: Path) -> list[Path]:
+        """Return files linking to ``target``, sorted by path."""
+        if self._reverse is None:
+            self._reverse = {}
+            for key, entry in self._files.items():
+                for link in entry[2]:
+                    self._reverse.setdefault(link, set()).add(key)
+        keys = self._reverse.get(self._key(target), set())
+        return sorted(self.base / key for key in keys)
+
+    def save(self) -> None:
+        """Persist the index when it changed and caching is enabled."""
+        if self._dirty and caching_enabled(self.base):
+            with phase("write"):
+                store_json(self.base, LINKS_CACHE, _LINKS_VERSION, {"files": self._files})
+            self._dirty = False
+
+    def _key(self, path: Path) -> str:
+        return Path(os.path.relpath(path, self.base)).as_posix()
+
+    def _store(self, key: str, stat: os.stat_result, text: str) -> None:
+        with phase("parse"):
+            targets = _link_targets(key, text)
+        self._files[key] = [stat.st_mtime_ns, stat.st_size, targets]
+        self._reverse = None
+        self._dirty = True
+
+
 def update_title(
     adr_dir: Path,
     target: str,
@@ -94,24 +200,30 @@ def update_title(
     ctx: ExecutionContext,
 ) -> None:
     """Update a single ADR title and optionally rename the file."""
-    base = _resolve_adr_dir(adr_dir)
-    config = _load_config(base)
-    rename_flag = config.rename if rename is None else rename
+    with collecting(ctx.stats), batch():
+        base = _resolve_adr_dir(adr_dir)
+        if not ctx.dry_run:
+            _replay_interrupted_commit(base)
+        config = _load_config(base)
+        rename_flag = config.rename if rename is None else rename
 
-    path = _resolve_target(base, target)
+        path = _resolve_target(base, target)
 
-    if _mutate_heading(path, new_title, dry_run=ctx.dry_run):
-        ctx.emit(f"Updated title in {path.relative_to(base)}")
+        if _mutate_heading(path, new_title, dry_run=ctx.dry_run):
+            ctx.emit(f"Updated title in {path.relative_to(base)}")
+            ctx.wrote(path)
 
-    if rename_flag:
-        new_path, renamed = _rename_to_slug(path, new_title, dry_run=ctx.dry_run)
-        if renamed:
-            ctx.emit(f"Renamed {path.name} -> {new_path.name}")
-            if not ctx.dry_run:
-                updated = _rewrite_links(base, path, new_path)
-                for entry in updated:
-                    ctx.emit(f"Updated links in {entry.relative_to(base)}")
-            path = new_path
+        if rename_flag:
+            new_path, renamed = _rename_to_slug(path, new_title, dry_run=ctx.dry_run)
+            if renamed:
+                ctx.emit(f"Renamed {path.name} -> {new_path.name}")
+                ctx.wrote(path, new_path)
+                if not ctx.dry_run:
+                    updated = _rewrite_links(base, {path: new_path})
+                    for entry in updated:
+                        ctx.emit(f"Updated links in {entry.relative_to(base)}")
+                    ctx.wrote(*updated)
+                path = new_path
 
 
 def sync_titles(
@@ -121,40 +233,53 @@ def sync_titles(
     ctx: ExecutionContext,
 ) -> None:
     """Ensure ADR headings and filenames align with their titles."""
-    base = _resolve_adr_dir(adr_dir)
-    config = _load_config(base)
-    rename_flag = config.rename if rename is None else rename
-
-    for path in sorted(base.glob("*.md")):
-        heading = _get_heading(path)
-        file_prefix, file_slug = _split_name(path)
-
-        title_text = heading.title if heading and heading.title else _title_from_slug(file_slug)
-
-        if file_prefix and (heading is None or heading.prefix != file_prefix):
-            if _mutate_heading(
-                path,
-                title_text,
-                prefix=file_prefix,
-                default_sep=heading.separator if heading else ": ",
-                dry_run=ctx.dry_run,
-            ):
-                ctx.emit(f"Updated title in {path.relative_to(base)}")
+    with collecting(ctx.stats), batch():
+        base = _resolve_adr_dir(adr_dir)
+        if not ctx.dry_run:
+            _replay_interrupted_commit(base)
+        config = _load_config(base)
+        rename_flag = config.rename if rename is None else rename
+        renames: dict[Path, Path] = {}
+
+        with phase("scan"):
+            paths = sorted(base.glob("*.md"))
+        note_glob()
+        for path in paths:
             heading = _get_heading(path)
-
-        if rename_flag:
-            new_path, renamed = _rename_to_slug(
-                path,
-                title_text,
-                prefix=file_prefix,
-                dry_run=ctx.dry_run,
-            )
-            if renamed:
-                ctx.emit(f"Renamed {path.name} -> {new_path.name}")
-                if not ctx.dry_run:
-                    updated = _rewrite_links(base, path, new_path)
-                    for entry in updated:
-                        ctx.emit(f"Updated links in {entry.relative_to(base)}")
+            file_prefix, file_slug = _split_name(path)
+
+            title_text = heading.title if heading and heading.title else _title_from_slug(file_slug)
+
+            if file_prefix and (heading is None or heading.prefix != file_prefix):
+                if _mutate_heading(
+                    path,
+                    title_text,
+                    prefix=file_prefix,
+                    default_sep=heading.separator if heading else ": ",
+                    dry_run=ctx.dry_run,
+                ):
+                    ctx.emit(f"Updated title in {path.relative_to(base)}")
+                    ctx.wrote(path)
+                heading = _get_heading(path)
+
+            if rename_flag:
+                new_path, renamed = _rename_to_slug(
+                    path,
+                    title_text,
+                    prefix=file_prefix,
+                    dry_run=ctx.dry_run,
+                )
+                if renamed:
+                    ctx.emit(f"Renamed {path.name} -> {new_path.name}")
+                    renames[path] = new_path
+                    ctx.wrote(path, new_path)
+
+        # Rewrite links for every rename in one pass so each file is read and
+        # written at most once, however many records were renamed.
+        if renames and not ctx.dry_run:
+            for entry in _rewrite_links(base, renames):
+                ctx.emit(f"Updated links in {entry.relative_to(base)}")
+                ctx.wrote(entry)
 
 
 def _resolve_adr_dir(adr_dir: Path) -> Path:
@@ -184,16 +309,19 @@ def _resolve_target(adr_dir: Path, target: str) -> Path:
             raise TitleError(msg)
         return path
 
+    note_glob()
     search_paths = list(adr_dir.glob(f"{target}.md"))
     if search_paths:
         return search_paths[0]
 
     if target.isdigit():
         formatted = f"{int(target):04d}"
+        note_glob()
         matches = list(adr_dir.glob(f"{formatted}-*.md"))
         if matches:
             return matches[0]
 
+    note_glob()
     matches = list(adr_dir.glob(f"*-{target}.md"))
     if matches:
         return matches[0]
@@ -210,47 +338,48 @@ def _mutate_heading(
     default_sep: str | None = None,
     dry_run: bool,
 ) -> bool:
-    original = path.read_text(encoding="utf-8")
-    lines = original.splitlines()
-    trailing_newline = original.endswith("\n")
-
-    index = None
-    info: HeadingInfo | None = None
-    for idx, line in enumerate(lines):
-        if line.lstrip().startswith("#"):
-            index = idx
-            info = _parse_heading_line(line)
-            break
-
-    if info is None:
-        info = HeadingInfo("#", " ", prefix=None, separator=None, title="")
-        new_line = _build_heading_line(info, new_title, prefix=prefix, default_sep=default_sep)
-        if dry_run:
-            return True
-        lines = [new_line, *lines]
-        text = "\n".join(lines)
-        if trailing_newline or text:
-            text += "\n"
-        path.write_text(text, encoding="utf-8")
-        return True
-
-    if index is None:
-        msg = f"Could not find heading in {path}"
-        raise TitleError(msg)
-    actual_prefix = prefix if prefix is not None else info.prefix
-    new_line = _build_heading_line(info, new_title, prefix=actual_prefix, default_sep=default_sep)
-    if lines[index] == new_line:
+    with phase("read"), path.open(encoding="utf-8", newline="") as handle:
+        original = handle.read()
+    note_read(original)
+    text = _retitle(original, new_title, prefix=prefix, default_sep=default_sep)
+    if text == original:
         return False
-    if dry_run:
-        return True
-    lines[index] = new_line
-    text = "\n".join(lines)
-    if trailing_newline:
-        text += "\n"
-    path.write_text(text, encoding="utf-8")
+    if not dry_run:
+        write_atomic(path, text)
     return True
 
 
+def _retitle(
+    original: str,
+    new_title: str,
+    *,
+    prefix: str | None = None,
+    default_sep: str | None = None,
+) -> str:
+    """Return ``original`` with its first heading set to ``new_title``, adding one if missing.
+
+    Every line keeps its own line ending.
+    """
+    lines = original.splitlines(keepends=True)
+    for index, line in enumerate(lines):
+        body = line.rstrip("\r\n")
+        if body.lstrip().startswith("#"):
+            info = _parse_heading_line(body)
+            actual_prefix = prefix if prefix is not None else info.prefix
+            heading = _build_heading_line(
+                info, new_title, prefix=actual_prefix, default_sep=default_sep
+            )
+            lines[index] = heading + line[len(body) :]
+            return "".join(lines)
+
+    info = HeadingInfo("#", " ", prefix=None, separator=None, title="")
+    heading = _build_heading_line(info, new_title, prefix=prefix, default_sep=default_sep)
+    newline = "\r\n" if "\r\n" in original else "\n"
+    if original and not original.endswith("\n"):
+        original += newline
+    return f"{heading}{newline}{original}"
+
+
 def _build_heading_line(
     info: HeadingInfo,
     new_title: str,
@@ -304,7 +433,7 @@ def _rename_to_slug(
         raise TitleError(msg)
     if dry_run:
         return new_path, True
-    path.rename(new_path)
+    rename_atomic(path, new_path)
     return new_path, True
 
 
@@ -324,44 +453,73 @@ def _split_name(path: Path) -> tuple[str | None, str]:
 
 
 def _get_heading(path: Path) -> HeadingInfo | None:
-    for line in path.read_text(encoding="utf-8").splitlines():
+    with phase("read"):
+        text = path.read_text(encoding="utf-8")
+    note_read(text)
+    for line in text.splitlines():
         if line.lstrip().startswith("#"):
             return _parse_heading_line(line)
     return None
 
 
-def _rewrite_links(base: Path, old_path: Path, new_path: Path) -> list[Path]:
-    updated: list[Path] = []
-    for entry in sorted(base.rglob("*.md")):
-        original = entry.read_text(encoding="utf-8")
-        candidates = _link_candidates(entry.parent, old_path)
-        if not _needs_link_update(original, candidates):
-            continue
-        new_rel = Path(os.path.relpath(new_path, entry.parent)).as_posix()
-        new_text = _replace_links(original, candidates, new_rel)
-        if new_text != original:
-            entry.write_text(new_text, encoding="utf-8")
-            updated.append(entry)
-    return updated
-
-
-def _replace_links(text: str, candidates: set[str], new_rel: str) -> str:
-    def inline(match: re.Match[str]) -> str:
-        target = match.group("target")
-        base, suffix = _split_suffix(target)
-        if base in candidates:
-            return f"{match.group('prefix')}{new_rel}{suffix}{match.group('suffix')}"
-        return match.group(0)
-
-    def reference(match: re.Match[str]) -> str:
+def _rewrite_links(base: Path, renames: Mapping[Path, Path]) -> list[Path]:
+    with batch():
+        index = LinkIndex.load(base)
+        index.refresh()
+        referrers = sorted({entry for old_path in renames for entry in index.referrers(old_path)})
+        updated: list[Path] = []
+        by_dir: dict[Path, dict[str, str]] = {}
+        for entry in referrers:
+            replacements = by_dir.get(entry.parent)
+            if replacements is None:
+                replacements = _link_replacements(entry.parent, renames)
+                by_dir[entry.parent] = replacements
+            with phase("read"), entry.open(encoding="utf-8", newline="") as handle:
+                original = handle.read()
+            note_read(original)
+            with phase("render"):
+                new_text = _replace_link_map(original, replacements)
+            if new_text != original:
+                write_atomic(entry, new_text)
+                index.update(entry, new_text)
+                updated.append(entry)
+        index.save()
+        return updated
+
+
+def _link_targets(key: str, text: str) -> list[str]:
+    """Resolve relative link targets in ``text`` against the directory of ``key``."""
+    directory = posixpath.dirname(key)
+    targets: set[str] = set()
+    for pattern in (_INLINE_LINK_RE, _REFERENCE_LINK_RE):
+        for match in pattern.finditer(text):
+            target, _ = _split_suffix(match.group("target"))
+            if not target or target.startswith("/") or ":" in target:
+                continue
+            targets.add(posixpath.normpath(posixpath.join(directory, target)))
+    return sorted(targets)
+
+
+def _link_replacements(start: Path, renames: Mapping[Path, Path]) -> dict[str, str]:
+    replacements: dict[str, str] = {}
+    for old_path, new_path in renames.items():
+        new_rel = Path(os.path.relpath(new_path, start)).as_posix()
+        replacements.update(dict.fromkeys(_link_candidates(start, old_path), new_rel))
+    return replacements
+
+
+def _replace_link_map(text: str, replacements: Mapping[str, str]) -> str:
+    def substitute(match: re.Match[str]) -> str:
         target = match.group("target")
         base, suffix = _split_suffix(target)
-        if base in candidates:
+        new_rel = replacements.get(base)
+        if new_rel is not None:
+            note_substitutions(1)
             return f"{match.group('prefix')}{new_rel}{suffix}{match.group('suffix')}"
         return match.group(0)
 
-    text = _INLINE_LINK_RE.sub(inline, text)
-    return _REFERENCE_LINK_RE.sub(reference, text)
+    text = _INLINE_LINK_RE.sub(substitute, text)
+    return _REFERENCE_LINK_RE.sub(substitute, text)
 
 
 def _link_candidates(start: Path, old_path: Path) -> set[str]:
@@ -372,10 +530,6 @@ def _link_candidates(start: Path, old_path: Path) -> set[str]:
     return candidates
 
 
-def _needs_link_update(text: str, candidates: set[str]) -> bool:
-    return any(candidate in text for candidate in candidates)
-
-
 def _split_suffix(target: str) -> tuple[str, str]:
     for marker in ("#", "?"):
         if marker in target:
@@ -396,8 +550,12 @@ def _load_config(adr_dir: Path) -> TitleConfig:
     cfg_path = cfg_dir / "config.toml"
     if not cfg_path.exists():
         return TitleConfig()
+    import tomllib  # noqa: PLC0415 - only parsed when a config file exists
+
+    text = cfg_path.read_text(encoding="utf-8")
+    note_read(text)
     try:
-        data = tomllib.loads(cfg_path.read_text(encoding="utf-8"))
+        data = tomllib.loads(text)
     except tomllib.TOMLDecodeError as exc:  # pragma: no cover - configuration errors are rare
         msg = f"Invalid configuration in {cfg_path}: {exc}"
         raise TitleError(msg) from exc
@@ -0,0 +1,493 @@
+"""Transactional batches of ADR mutations committed through a write-ahead journal.
+
+:meth:`decree.core.AdrLog.transaction` returns a :class:`Transaction` that
+stages ``new``, ``link``/``unlink`` and ``set_title`` calls in memory. A file
+is read the first time a mutation touches it and every later mutation edits
+the staged text, so a script that creates, links and retitles ADRs sees its
+own changes without re-reading them.
+
+Leaving the ``with`` block commits. The before and after content of every
+changed file is written to ``.decree/journal.json`` and fsynced, whatever the
+:class:`~decree.atomic.Durability` mode, then each file receives
+exactly one write (a rename is a write of the new name plus removal of the
+old one) and the journal is deleted. When a write fails, the files already
+written are restored from the journal's ``before`` copies. When the process
+dies instead, the journal survives and the next transaction, or the next
+``AdrLog`` mutation, replays it before reading anything. Replay only rolls a
+file forward while it still holds the journal's ``before`` or ``after``
+content; a file edited since the crash stops the replay and keeps the journal.
+An exception raised inside the block discards the staged changes without
+touching the disk.
+
+Commits and replays hold the allocation lock used by ``AdrLog.new``, so they
+never interleave with each other or with number allocation.
+"""
+
+import contextlib
+import json
+import os
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+from .atomic import (
+    Durability,
+    _fsync_directory,
+    batch,
+    durability,
+    remove_atomic,
+    write_atomic,
+)
+from .cache import JOURNAL, STATE_DIR
+from .core import (
+    _allocation_lock,
+    _claim_numbers,
+    _read_template,
+    _replay_interrupted_commit,
+    _resolve_reverse_relation,
+    _with_link_lines,
+    _without_link_line,
+)
+from .iostats import IoStats, counted, note_glob, note_read
+from .models import AdrRecord, AdrRef, AdrStatus
+from .profiling import phase
+from .title import (
+    LinkIndex,
+    _compose_name,
+    _link_replacements,
+    _load_config,
+    _replace_link_map,
+    _retitle,
+    _split_name,
+)
+from .utils import resolve_date, slugify
+
+_JOURNAL_VERSION = 1
+# Each journal operation is [name, before, after]; ``before`` is None for files
+# the commit creates and ``after`` is None for files it removes.
+_OPERATION_FIELDS = 3
+
+Operation = list[str | None]
+
+
+class TransactionConflictError(RuntimeError):
+    """Raised when a file changed on disk after a transaction or journal recorded it."""
+
+
+@dataclass(slots=True)
+class _Staged:
+    """A touched file: its staged name and text, and what was read from ``source``."""
+
+    name: str
+    source: str | None
+    before: str | None
+    fingerprint: tuple[int, int] | None
+    text: str
+
+    @property
+    def changed(self) -> bool:
+        return self.name != self.source or self.text != self.before
+
+
+class Transaction:
+    """Mutations staged against one in-memory view of the files they touch.
+
+    Obtain one with :meth:`decree.core.AdrLog.transaction` and use it as a
+    context manager; see the module documentation for the commit protocol.
+    """
+
+    def __init__(
+        self, adr_dir: Path, names: dict[int, str], *, stats: IoStats | None = None
+    ) -> None:
+        """Stage changes for ``adr_dir`` whose records are ``names`` keyed by number."""
+        self.dir = adr_dir
+        self._stats = stats if stats is not None else IoStats()
+        self._names = names
+        self._staged: dict[str, _Staged] = {}
+        self._sources: dict[str, _Staged] = {}
+        self._templates: dict[Path | None, str] = {}
+        self._rename: bool | None = None
+        self._lock = ExitStack()
+        self._locked = False
+        self._closed = False
+
+    @classmethod
+    def begin(cls, adr_dir: Path, *, stats: IoStats | None = None) -> "Transaction":
+        """Replay any interrupted commit in ``adr_dir`` and start a transaction."""
+        _replay_interrupted_commit(adr_dir)
+        return cls(adr_dir, _scan(adr_dir), stats=stats)
+
+    def __enter__(self) -> Self:
+        """Return the transaction itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Commit when the block succeeded, otherwise discard the staged changes."""
+        try:
+            if exc_type is None and not self._closed:
+                self.commit()
+        finally:
+            self.close()
+
+    @counted
+    def new(
+        self,
+        title: str,
+        *,
+        status: AdrStatus = AdrStatus.Accepted,
+        template: Path | None = None,
+        date: str | None = None,
+    ) -> AdrRecord:
+        """Stage a new ADR, taking the allocation lock until the transaction ends.
+
+        Each template is read once per transaction.
+        """
+        self._check_open()
+        if template not in self._templates:
+            self._templates[template] = _read_template(template)
+        record_date = resolve_date(cli_date=date)
+        number = self._allocate()
+        slug = slugify(title)
+        name = f"{number:04d}-{slug}.md"
+        self._claim(name)
+        text = self._templates[template].format(
+            number=number, title=title, status=status.value, date=record_date
+        )
+        self._staged[name] = _Staged(name, None, None, None, text)
+        self._names[number] = name
+        return AdrRecord(
+            number=number,
+            slug=slug,
+            title=title,
+            status=status,
+            date=record_date,
+            path=self.dir / name,
+        )
+
+    @counted
+    def link(self, src: AdrRef, rel: str, tgt: AdrRef, *, reverse: bool = False) -> None:
+        """Stage a relation line as :meth:`decree.core.AdrLog.link` would write it."""
+        self._relate(
+            src, rel, tgt, reverse=reverse, edit=lambda text, line: _with_link_lines(text, [line])
+        )
+
+    @counted
+    def unlink(self, src: AdrRef, rel: str, tgt: AdrRef, *, reverse: bool = False) -> None:
+        """Stage the removal of a relation line as :meth:`decree.core.AdrLog.unlink` would."""
+
+        def remove(text: str, line: str) -> str:
+            updated = _without_link_line(text, line)
+            return text if updated is None else updated
+
+        self._relate(src, rel, tgt, reverse=reverse, edit=remove)
+
+    @counted
+    def set_title(self, ref: AdrRef, title: str, *, rename: bool | None = None) -> Path:
+        """Stage a new heading for ``ref`` and return the path it will have after commit.
+
+        With ``rename`` (default: ``title.rename`` in ``.decree/config.toml``)
+        the file is renamed to match the title, and markdown links to it are
+        rewritten at commit as ``decree title set`` does.
+        """
+        self._check_open()
+        entry = self._entry(ref.number)
+        entry.text = _retitle(entry.text, title)
+        if rename is None:
+            if self._rename is None:
+                self._rename = _load_config(self.dir).rename
+            rename = self._rename
+        if rename:
+            prefix, _ = _split_name(Path(entry.name))
+            name = _compose_name(prefix, slugify(title) or "adr", Path(entry.name).suffix)
+            if name != entry.name:
+                if name != entry.source:
+                    self._claim(name)
+                del self._staged[entry.name]
+                entry.name = name
+                self._staged[name] = entry
+                self._names[ref.number] = name
+        return self.dir / entry.name
+
+    @counted
+    def commit(self) -> list[Path]:
+        """Write every changed file once through the journal and return their paths.
+
+        Renamed files are reported under their new name. The transaction is
+        closed afterwards, whether or not the commit succeeded.
+        """
+        self._check_open()
+        try:
+            index = self._rewrite_renamed_links()
+            changes = [entry for entry in self._staged.values() if entry.changed]
+            if not changes:
+                return []
+            if not self._locked:
+                self._lock.enter_context(_allocation_lock(self.dir))
+                self._locked = True
+            self._verify(changes)
+            operations = _operations(changes)
+            created_state = _write_journal(self.dir, operations)
+            applied: list[Operation] = []
+            try:
+                with batch():
+                    _apply(self.dir, operations, applied)
+            except BaseException:
+                with batch():
+                    _undo(self.dir, applied)
+                _remove_journal(self.dir, remove_state=created_state)
+                raise
+            _remove_journal(self.dir, remove_state=created_state)
+            if index is not None:
+                for entry in changes:
+                    index.update(self.dir / entry.name, entry.text)
+                index.save()
+            return [self.dir / entry.name for entry in changes]
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Drop uncommitted changes and release the allocation lock."""
+        self._closed = True
+        self._staged.clear()
+        self._sources.clear()
+        self._lock.close()
+        self._locked = False
+
+    def _check_open(self) -> None:
+        if self._closed:
+            message = "transaction is closed"
+            raise RuntimeError(message)
+
+    def _allocate(self) -> int:
+        if not self._locked:
+            self._lock.enter_context(_allocation_lock(self.dir))
+            self._locked = True
+            # Pick up ADRs other processes created before the lock was taken.
+            for number, name in _scan(self.dir).items():
+                self._names.setdefault(number, name)
+        return _claim_numbers(self.dir, max(self._names, default=0))
+
+    def _claim(self, name: str) -> None:
+        if name in self._staged or (self.dir / name).exists():
+            message = f"{name} already exists"
+            raise FileExistsError(message)
+
+    def _entry(self, number: int) -> _Staged:
+        name = self._names.get(number)
+        if name is None:
+            message = f"ADR {number:04d} not found"
+            raise FileNotFoundError(message)
+        staged = self._staged.get(name)
+        return staged if staged is not None else self._load(name)
+
+    def _load(self, name: str) -> _Staged:
+        """Return the staged entry read from ``name``, reading the file on first use."""
+        entry = self._sources.get(name)
+        if entry is None:
+            with phase("read"), (self.dir / name).open(encoding="utf-8", newline="") as handle:
+                stat = os.fstat(handle.fileno())
+                text = handle.read()
+            note_read(text)
+            entry = _Staged(name, name, text, (stat.st_mtime_ns, stat.st_size), text)
+            self._staged[name] = self._sources[name] = entry
+        return entry
+
+    def _relate(
+        self,
+        src: AdrRef,
+        rel: str,
+        tgt: AdrRef,
+        *,
+        reverse: bool,
+        edit: Callable[[str, str], str],
+    ) -> None:
+        self._check_open()
+        source, target = self._entry(src.number), self._entry(tgt.number)
+        source.text = edit(source.text, f"{rel}: {tgt.number:04d}")
+        if reverse:
+            target.text = edit(target.text, f"{_resolve_reverse_relation(rel)}: {src.number:04d}")
+
+    def _rewrite_renamed_links(self) -> LinkIndex | None:
+        """Point markdown links at the staged names of renamed files."""
+        renames = {
+            self.dir / entry.source: self.dir / entry.name
+            for entry in self._staged.values()
+            if entry.source is not None and entry.source != entry.name
+        }
+        if not renames:
+            return None
+        index = LinkIndex.load(self.dir)
+        index.refresh()
+        referrers = sorted({path for old in renames for path in index.referrers(old)})
+        by_dir: dict[Path, dict[str, str]] = {}
+        for path in referrers:
+            entry = self._load(path.relative_to(self.dir).as_posix())
+            directory = (self.dir / entry.name).parent
+            if directory not in by_dir:
+                by_dir[directory] = _link_replacements(directory, renames)
+            with phase("render"):
+                entry.text = _replace_link_map(entry.text, by_dir[directory])
+        return index
+
+    def _verify(self, changes: list[_Staged]) -> None:
+        for entry in changes:
+            if entry.source is None:
+                continue
+            with phase("scan"):
+                try:
+                    stat = (self.dir / entry.source).stat()
+                except FileNotFoundError:
+                    stat = None
+            if stat is None or (stat.st_mtime_ns, stat.st_size) != entry.fingerprint:
+                message = f"{entry.source} changed since the transaction read it"
+                raise TransactionConflictError(message)
+
+
+def replay_journal(adr_dir: Path) -> list[Path]:
+    """Complete a commit interrupted after its journal was written.
+
+    Returns the files written again; an absent journal is a no-op. Every file
+    is checked before anything is written: one that already holds its
+    ``after`` content is left alone, one that still holds its ``before``
+    content is rolled forward, and one that holds neither raises
+    :class:`TransactionConflictError` and keeps the journal. Callers should
+    hold the allocation lock.
+    """
+    journal = adr_dir / STATE_DIR / JOURNAL
+    try:
+        with phase("read"):
+            text = journal.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    note_read(text)
+    operations = _parse_journal(text)
+    if operations is None:
+        message = f"{journal} is not a valid journal; check the ADRs it lists and delete it"
+        raise ValueError(message)
+    pending = [operation for operation in operations if _replay_needed(adr_dir, operation)]
+    with batch():
+        _apply(adr_dir, pending, [])
+        remove_atomic(journal)
+    return [adr_dir / str(name) for name, _, after in pending if after is not None]
+
+
+def _replay_needed(adr_dir: Path, operation: Operation) -> bool:
+    """Report whether ``operation`` is still to be applied to its file."""
+    name, before, after = operation
+    with phase("read"):
+        try:
+            current = (adr_dir / str(name)).read_bytes()
+        except FileNotFoundError:
+            current = None
+    if current is not None:
+        note_read(current)
+    if current == _encoded(after):
+        return False
+    if current == _encoded(before):
+        return True
+    message = (
+        f"{name} changed since the interrupted commit in {STATE_DIR}/{JOURNAL}; "
+        "reconcile it with the journal and delete the journal"
+    )
+    raise TransactionConflictError(message)
+
+
+def _encoded(text: str | None) -> bytes | None:
+    return None if text is None else text.encode("utf-8")
+
+
+def _scan(adr_dir: Path) -> dict[int, str]:
+    with phase("scan"):
+        names = sorted(path.name for path in adr_dir.glob("[0-9][0-9][0-9][0-9]-*.md"))
+    note_glob()
+    numbers: dict[int, str] = {}
+    for name in names:
+        numbers.setdefault(int(name[:4]), name)
+    return numbers
+
+
+def _operations(changes: list[_Staged]) -> list[Operation]:
+    """Order writes before removals so an interrupted commit never loses a file."""
+    writes: list[Operation] = [
+        [entry.name, entry.before if entry.name == entry.source else None, entry.text]
+        for entry in changes
+    ]
+    removals: list[Operation] = [
+        [entry.source, entry.before, None]
+        for entry in changes
+        if entry.source is not None and entry.source != entry.name
+    ]
+    return writes + removals
+
+
+def _apply(adr_dir: Path, operations: list[Operation], applied: list[Operation]) -> None:
+    for operation in operations:
+        name, before, after = operation
+        path = adr_dir / str(name)
+        if after is None:
+            remove_atomic(path)
+        else:
+            write_atomic(path, after, exclusive=before is None)
+        applied.append(operation)
+
+
+def _undo(adr_dir: Path, applied: list[Operation]) -> None:
+    for name, before, _ in reversed(applied):
+        path = adr_dir / str(name)
+        if before is None:
+            remove_atomic(path)
+        else:
+            write_atomic(path, before)
+
+
+def _write_journal(adr_dir: Path, operations: list[Operation]) -> bool:
+    """Durably record ``operations``; return whether ``.decree`` had to be created."""
+    state = adr_dir / STATE_DIR
+    created = not state.is_dir()
+    state.mkdir(exist_ok=True)
+    payload = json.dumps({"version": _JOURNAL_VERSION, "files": operations})
+    # The journal must reach the disk before any file it describes is touched,
+    # whatever the durability mode: recovery depends on it.
+    with durability(Durability.file):
+        write_atomic(state / JOURNAL, payload, exclusive=True)
+    if created:
+        _fsync_directory(adr_dir)
+    return created
+
+
+def _remove_journal(adr_dir: Path, *, remove_state: bool) -> None:
+    state = adr_dir / STATE_DIR
+    remove_atomic(state / JOURNAL)
+    if remove_state:
+        # Leave no ``.decree`` behind: its presence opts the repository into caches.
+        with contextlib.suppress(OSError):
+            state.rmdir()
+
+
+def _parse_journal(text: str) -> list[Operation] | None:
+    try:
+        data: Any = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get("version") != _JOURNAL_VERSION:
+        return None
+    operations = data.get("files")
+    if not isinstance(operations, list):
+        return None
+    for operation in operations:
+        if (
+            not isinstance(operation, list)
+            or len(operation) != _OPERATION_FIELDS
+            or not isinstance(operation[0], str)
+            or not all(value is None or isinstance(value, str) for value in operation[1:])
+        ):
+            return None
+    return operations
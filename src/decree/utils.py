@@ -1,11 +1,18 @@
-"""Utility helpers for string normalization and configuration resolution."""
+"""Utility helpers for string normalization, configuration and runtime checks."""
 
+import functools
 import os
 import re
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import date
+from typing import ParamSpec, TypeVar
 
-from boltons.strutils import slugify as _boltons_slugify
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+_checks_enabled: ContextVar[bool] = ContextVar("decree_beartype_checks", default=True)
 
 _NON_SLUG_CHARS = re.compile(r"[^a-z0-9-]+")
 _HYPHEN_NORMALIZER = re.compile(r"-+")
@@ -13,6 +20,10 @@ _HYPHEN_NORMALIZER = re.compile(r"-+")
 
 def slugify(title: str) -> str:
     """Return a filesystem-friendly slug for ``title``."""
+    # boltons is only needed when writing or renaming records; keep it off the
+    # import path of read-only commands.
+    from boltons.strutils import slugify as _boltons_slugify  # noqa: PLC0415
+
     slug_text: str = _boltons_slugify(title, delim="-", lower=True, ascii=True).decode("ascii")
     slug_text = _NON_SLUG_CHARS.sub("-", slug_text)
     return _HYPHEN_NORMALIZER.sub("-", slug_text).strip("-")
@@ -40,3 +51,41 @@ def resolve_date(
     if value is None:
         value = today().isoformat()
     return _validate_date(value)
+
+
+def beartype_checked(func: Callable[_P, _R]) -> Callable[_P, _R]:
+    """Type-check every call of ``func`` with :func:`beartype.beartype`.
+
+    The first call is checked like any other; only importing beartype and
+    decorating ``func`` wait until then, because that import dominates the
+    CLI's cold start. Calls made inside :func:`unchecked_calls` skip the check.
+    """
+    checked: Callable[_P, _R] | None = None
+
+    @functools.wraps(func)
+    def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        nonlocal checked
+        if not _checks_enabled.get():
+            return func(*args, **kwargs)
+        if checked is None:
+            from beartype import beartype  # noqa: PLC0415 - deferred for startup time
+
+            checked = beartype(func)
+        return checked(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def unchecked_calls() -> Iterator[None]:
+    """Skip :func:`beartype_checked` checks for calls made inside the block.
+
+    The CLI wraps each invocation in this: Typer has already converted and
+    validated every argument it passes, so checking again would only add
+    beartype's import to every command's start-up.
+    """
+    token = _checks_enabled.set(False)
+    try:
+        yield
+    finally:
+        _checks_enabled.reset(token)
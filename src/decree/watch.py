@@ -0,0 +1,270 @@
+"""Keep the table of contents and record cache current while ADRs are edited.
+
+Changes are picked up from inotify on Linux and by comparing ``mtime_ns`` and
+size elsewhere. Only the ``NNNN-*.md`` files that changed are re-parsed, and a
+burst of events (an editor's write, rename and chmod) is debounced into one
+regeneration that rewrites the output only when its content differs. A file
+that fails to parse mid-edit is reported and keeps its last good entry until a
+later save parses.
+"""
+
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+from .cache import RecordCache
+from .core import _RECORD_NAME_RE, AdrLog, _parse_record, _toc_lines
+
+if TYPE_CHECKING:
+    from .models import AdrRecord
+
+# inotify(7) event masks.
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_IN_EVENT = struct.Struct("iIII")
+_IN_READ_SIZE = 64 * 1024
+
+
+class ChangeSource(Protocol):
+    """Report the record file names that changed in a directory."""
+
+    def wait(self, timeout: float) -> set[str]:
+        """Block up to ``timeout`` seconds and return changed record names."""
+        ...
+
+    def close(self) -> None:
+        """Release any operating system resources."""
+        ...
+
+
+class PollingSource:
+    """Detect changes by comparing ``mtime_ns`` and size between directory scans."""
+
+    def __init__(self, directory: Path, *, interval: float = 0.5) -> None:
+        """Snapshot ``directory`` and rescan it at most every ``interval`` seconds."""
+        self.directory = directory
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def wait(self, timeout: float) -> set[str]:
+        """Sleep for ``timeout`` (capped at the interval) and diff a fresh scan."""
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        names = {
+            name
+            for name in current.keys() | self._snapshot.keys()
+            if current.get(name) != self._snapshot.get(name)
+        }
+        self._snapshot = current
+        return names
+
+    def close(self) -> None:
+        """Nothing to release for polling."""
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot: dict[str, tuple[int, int]] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if _RECORD_NAME_RE.match(entry.name):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+
+class InotifySource:
+    """Linux inotify watch on the ADR directory, driven through ``ctypes``."""
+
+    def __init__(self, directory: Path) -> None:
+        """Start watching ``directory``; raises ``OSError`` when inotify is unusable."""
+        import ctypes  # noqa: PLC0415 - only needed when inotify is used
+        import ctypes.util  # noqa: PLC0415 - only needed when inotify is used
+
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _IN_WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._fd = fd
+        # Every record name seen since the last overflow, so one can report deletions.
+        self._known = self._existing()
+
+    def wait(self, timeout: float) -> set[str]:
+        """Return the record names named by events that arrive within ``timeout``."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        names: set[str] = set()
+        # Drain every queued event so callers never act on half a burst.
+        while True:
+            try:
+                data = os.read(self._fd, _IN_READ_SIZE)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset + _IN_EVENT.size <= len(data):
+                _, mask, _, length = _IN_EVENT.unpack_from(data, offset)
+                offset += _IN_EVENT.size
+                raw = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    # Events were dropped: report every record that exists or
+                    # existed, so deletions among the lost events are seen too.
+                    existing = self._existing()
+                    names = existing | self._known
+                    self._known = existing
+                    return names
+                name = os.fsdecode(raw)
+                if _RECORD_NAME_RE.match(name):
+                    names.add(name)
+                    self._known.add(name)
+
+    def close(self) -> None:
+        """Close the inotify descriptor."""
+        os.close(self._fd)
+
+    def _existing(self) -> set[str]:
+        with os.scandir(self.directory) as entries:
+            return {entry.name for entry in entries if _RECORD_NAME_RE.match(entry.name)}
+
+
+def open_source(
+    directory: Path, *, poll_interval: float = 0.5, polling: bool = False
+) -> ChangeSource:
+    """Return an inotify source on Linux, falling back to polling."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifySource(directory)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingSource(directory, interval=poll_interval)
+
+
+class TocWatcher:
+    """Incrementally maintain ``output`` from the records in ``log``."""
+
+    def __init__(
+        self,
+        log: AdrLog,
+        output: Path,
+        source: ChangeSource,
+        *,
+        debounce: float = 0.2,
+        on_error: Callable[[str], None] | None = None,
+    ) -> None:
+        """Load every record once and write ``output`` if it is out of date.
+
+        ``on_error`` receives a message for each changed file that cannot be
+        parsed; it defaults to writing to stderr.
+        """
+        self.log = log
+        self.output = output
+        self.source = source
+        self.debounce = debounce
+        self.on_error = on_error if on_error is not None else _print_error
+        self._records: dict[str, AdrRecord] = {}
+        self._stats: dict[str, os.stat_result] = {}
+        for record in log.list():
+            self._records[record.path.name] = record
+            self._stats[record.path.name] = record.path.stat()
+        self.written = log._write_toc_content(output, self._render())  # noqa: SLF001 - shares the toc stamp
+
+    def poll(self, timeout: float) -> bool:
+        """Wait for changes, debounce them, and regenerate once.
+
+        Returns ``True`` when ``output`` was rewritten.
+        """
+        changed = self.source.wait(timeout)
+        if not changed:
+            return False
+        while more := self.source.wait(self.debounce):
+            changed |= more
+        if not self._apply(changed):
+            return False
+        return self.log._write_toc_content(self.output, self._render())  # noqa: SLF001 - shares the toc stamp
+
+    def run(self, on_update: Callable[[Path], None], *, interval: float = 1.0) -> None:
+        """Poll until interrupted, calling ``on_update`` after every rewrite."""
+        try:
+            while True:
+                if self.poll(interval):
+                    on_update(self.output)
+        finally:
+            self.source.close()
+
+    def _apply(self, names: set[str]) -> bool:
+        """Re-parse the changed files; return whether any record differs.
+
+        The record cache is loaded and saved only when a file was re-parsed or
+        removed, and only those entries are touched.
+        """
+        parsed: list[tuple[AdrRecord, os.stat_result]] = []
+        removed = False
+        failed: set[str] = set()
+        dirty = False
+        for name in names:
+            path = self.log.dir / name
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                dirty |= self._records.pop(name, None) is not None
+                removed |= self._stats.pop(name, None) is not None
+                continue
+            previous = self._stats.get(name)
+            if previous is not None and (previous.st_mtime_ns, previous.st_size) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                continue
+            try:
+                record = _parse_record(path)
+            except (OSError, ValueError) as exc:
+                # Typically a save in the middle of an edit: keep the last good entry.
+                self.on_error(f"{name}: {exc}")
+                failed.add(name)
+                continue
+            parsed.append((record, stat))
+            dirty |= self._records.get(name) != record
+            self._records[name] = record
+            self._stats[name] = stat
+        if parsed or removed:
+            cache = RecordCache.load(self.log.dir)
+            for record, stat in parsed:
+                cache.put(record, stat)
+            cache.save(listed=self._stats.keys() | failed)
+        return dirty
+
+    def _render(self) -> str:
+        records = (self._records[name] for name in sorted(self._records))
+        return "".join(f"{line}\n" for line in _toc_lines(self.log.dir, records))
+
+
+def _print_error(message: str) -> None:
+    sys.stderr.write(f"{message}\n")
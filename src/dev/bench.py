@@ -0,0 +1,172 @@
+"""Benchmarks for Decree's hot paths over synthetic ADR repositories.
+
+Repositories are generated with a fixed seed so runs are comparable: every ADR
+carries two relation lines and two inline markdown links to earlier records,
+which is about the link density of long-lived real logs. Each operation is
+timed ``repeat`` times after one warm-up run, and results can be compared with
+a stored baseline to flag regressions. Sizes stop at :data:`MAX_RECORDS`, the
+most ADRs a repository can hold with four-digit numbers.
+"""
+
+import json
+import platform
+import random
+import statistics
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from decree.core import AdrLog, link_adr, unlink_adr
+from decree.title import ExecutionContext, _rewrite_links, sync_titles
+from decree.utils import slugify
+
+RESULTS_VERSION = 1
+MAX_RECORDS = 9_999
+DEFAULT_SIZES = (100, 1_000, MAX_RECORDS)
+LINKS_PER_ADR = 2
+
+_RELATIONS = ("Supersedes", "Amends", "Relates to", "References")
+_TOPICS = ("storage", "caching", "logging", "auth", "deployment", "api", "testing", "metrics")
+_BODY = """
+## Context
+
+The {topic} subsystem needs a decision. See {links} for background.
+
+## Decision
+
+We adopt option {number} for {topic}.
+
+## Consequences
+
+Teams working on {topic} follow this record until it is superseded.
+"""
+
+
+def build_repo(directory: Path, count: int, *, seed: int = 0) -> AdrLog:
+    """Write ``count`` synthetic ADRs with relation lines and cross links.
+
+    Raises :class:`ValueError` when ``count`` exceeds :data:`MAX_RECORDS`, and
+    :class:`RuntimeError` when Decree does not load every record written.
+    """
+    if count > MAX_RECORDS:
+        message = f"Cannot build {count} ADRs; four-digit numbers stop at {MAX_RECORDS}"
+        raise ValueError(message)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)  # noqa: S311 - reproducible data, not security
+    names: list[str] = []
+    for number in range(1, count + 1):
+        topic = _TOPICS[number % len(_TOPICS)]
+        title = f"Decision {number} on {topic}"
+        name = f"{number:04d}-{slugify(title)}.md"
+        targets = (
+            sorted({rng.randrange(1, number) for _ in range(LINKS_PER_ADR)}) if number > 1 else []
+        )
+        relations = "".join(f"{rng.choice(_RELATIONS)}: {target:04d}\n" for target in targets)
+        links = ", ".join(f"[ADR {t:04d}]({names[t - 1]})" for t in targets) or "the overview"
+        body = _BODY.format(topic=topic, links=links, number=number)
+        text = f"# {number:04d}: {title}\n\nDate: 2024-01-01\nStatus: Accepted\n{relations}{body}"
+        (directory / name).write_text(text, encoding="utf-8")
+        names.append(name)
+    log = AdrLog(directory)
+    loaded = sum(1 for _ in log.list())
+    if loaded != count:
+        message = f"Decree loaded {loaded} of the {count} ADRs written to {directory}"
+        raise RuntimeError(message)
+    return log
+
+
+def run(sizes: Iterable[int], workdir: Path, *, repeat: int = 5) -> dict[str, Any]:
+    """Build one repository per size under ``workdir`` and time every operation."""
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for size in sizes:
+        log = build_repo(workdir / f"adr-{size}", size)
+        results[str(size)] = {
+            name: _measure(operation, repeat) for name, operation in _operations(log)
+        }
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    tolerance: float = 0.25,
+) -> list[str]:
+    """Describe every operation whose median is more than ``tolerance`` slower."""
+    regressions: list[str] = []
+    for size, operations in current["results"].items():
+        previous = baseline.get("results", {}).get(size, {})
+        for name, timing in operations.items():
+            reference = previous.get(name)
+            if reference is None:
+                continue
+            limit = reference["median"] * (1 + tolerance)
+            if timing["median"] > limit:
+                ratio = timing["median"] / reference["median"]
+                regressions.append(
+                    f"{name} @ {size}: {timing['median']:.4f}s vs {reference['median']:.4f}s "
+                    f"({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """Read results written by :func:`save_results`."""
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != RESULTS_VERSION:
+        message = f"{path} has unsupported benchmark results version {data.get('version')!r}"
+        raise ValueError(message)
+    return data
+
+
+def save_results(path: Path, results: dict[str, Any]) -> None:
+    """Write ``results`` as indented JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _operations(log: AdrLog) -> Iterator[tuple[str, Callable[[], object]]]:
+    """Yield named callables; mutating ones alternate so every run does equal work."""
+    paths = sorted(log.dir.glob("[0-9][0-9][0-9][0-9]-*.md"))
+    first, last = paths[0], paths[-1]
+    renamed = first.with_name(f"{first.stem}-renamed.md")
+    ctx = ExecutionContext(dry_run=False, emit=lambda _message: None)
+    toggles = {"link": True, "rename": True}
+
+    def toggle_link() -> None:
+        if toggles["link"]:
+            link_adr(last, "References", first, reverse=True)
+        else:
+            unlink_adr(last, "References", first, reverse=True)
+        toggles["link"] = not toggles["link"]
+
+    def toggle_rename() -> None:
+        old, new = (first, renamed) if toggles["rename"] else (renamed, first)
+        _rewrite_links(log.dir, {old: new})
+        toggles["rename"] = not toggles["rename"]
+
+    yield "list", lambda: sum(1 for _ in log.list())
+    yield "generate_toc", log.generate_toc
+    yield "link_adr", toggle_link
+    yield "sync_titles", lambda: sync_titles(log.dir, rename=False, ctx=ctx)
+    yield "rewrite_links", toggle_rename
+    log.upgrade()
+    yield "list_cached", lambda: sum(1 for _ in log.list())
+    yield "table_cached", lambda: len(log.table())
+
+
+def _measure(operation: Callable[[], object], repeat: int) -> dict[str, float]:
+    operation()
+    samples: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - started)
+    return {"min": min(samples), "median": statistics.median(samples)}
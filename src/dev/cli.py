@@ -68,6 +68,63 @@ def validate_version(
     typer.echo(f"✓ Version {version} matches project version {project_version}")
 
 
+@app.command()
+def bench(
+    sizes: Annotated[
+        str,
+        typer.Option("--sizes", help="Comma-separated ADR counts for the synthetic repositories."),
+    ] = "100,1000,9999",
+    repeat: Annotated[int, typer.Option("--repeat", min=1, help="Timed runs per operation.")] = 5,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Write results as JSON to this file."),
+    ] = None,
+    baseline: Annotated[
+        Path | None,
+        typer.Option("--baseline", "-b", help="Fail if slower than these stored results."),
+    ] = None,
+    tolerance: Annotated[
+        float,
+        typer.Option("--tolerance", min=0.0, help="Allowed slowdown over the baseline median."),
+    ] = 0.25,
+) -> None:
+    """Time Decree's hot paths over synthetic ADR repositories."""
+    import tempfile  # noqa: PLC0415 - only needed by this command
+
+    from .bench import compare, load_results, run, save_results  # noqa: PLC0415 - imports decree
+
+    try:
+        counts = [int(part) for part in sizes.split(",") if part.strip()]
+    except ValueError as exc:
+        typer.echo(f"Error: Invalid --sizes value: {sizes}", err=True)
+        raise typer.Exit(code=1) from exc
+
+    with tempfile.TemporaryDirectory(prefix="decree-bench-") as workdir:
+        try:
+            results = run(counts, Path(workdir), repeat=repeat)
+        except ValueError as exc:
+            typer.echo(f"Error: {exc}", err=True)
+            raise typer.Exit(code=1) from exc
+
+    for size, operations in results["results"].items():
+        for name, timing in operations.items():
+            typer.echo(
+                f"{size:>7} {name:<14} median {timing['median']:.4f}s  min {timing['min']:.4f}s"
+            )
+    if output is not None:
+        save_results(output, results)
+
+    if baseline is None:
+        return
+    regressions = compare(results, load_results(baseline), tolerance=tolerance)
+    if regressions:
+        typer.echo("Error: Slower than baseline", err=True)
+        for line in regressions:
+            typer.echo(f"  {line}", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"✓ Within {tolerance:.0%} of {baseline}")
+
+
 def main() -> None:
     """Entrypoint for :mod:`dev.cli`."""
     app()
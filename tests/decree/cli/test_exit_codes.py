@@ -126,8 +126,17 @@ def test_keyboard_interrupt_maps_to_abort(tmp_path: Path) -> None:
     assert "Traceback" not in result.stderr
 
 
-def test_generate_graph_reports_unavailable(tmp_path: Path) -> None:
+def test_generate_graph_streams_dot(tmp_path: Path) -> None:
+    assert run_cli(tmp_path, "init").returncode == int(ExitCode.SUCCESS)
     result = run_cli(tmp_path, "generate", "graph")
-    assert result.returncode == int(ExitCode.UNAVAILABLE)
-    assert "not implemented" in result.stderr
+    assert result.returncode == int(ExitCode.SUCCESS)
+    assert result.stdout.startswith("digraph adr {")
+    assert "Traceback" not in result.stderr
+
+
+def test_generate_graph_unknown_root_reports_missing_input(tmp_path: Path) -> None:
+    assert run_cli(tmp_path, "init").returncode == int(ExitCode.SUCCESS)
+    result = run_cli(tmp_path, "generate", "graph", "--root", "42")
+    assert result.returncode == int(ExitCode.INPUT_MISSING)
+    assert "ADR 0042 not found" in result.stderr
     assert "Traceback" not in result.stderr
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from decree.cli import app
+from decree.core import AdrLog
+from decree.models import AdrStatus, NewSpec
+
+
+def _adr_dir(tmp_path: Path) -> Path:
+    log = AdrLog.init(tmp_path / "adr")
+    log.new_many(
+        [
+            NewSpec("Adopt Kafka", status=AdrStatus.Proposed, date="2024-01-15"),
+            NewSpec("Use Postgres", status=AdrStatus.Accepted, date="2024-03-01"),
+        ]
+    )
+    return log.dir
+
+
+def test_list_filters_by_status_and_date(tmp_path: Path) -> None:
+    adr_dir = _adr_dir(tmp_path)
+    runner = CliRunner()
+
+    proposed = runner.invoke(app, ["list", "--dir", str(adr_dir), "--status", "proposed"])
+    quarter = runner.invoke(
+        app, ["list", "--dir", str(adr_dir), "--since", "2024-01-01", "--until", "2024-03-31"]
+    )
+
+    assert proposed.exit_code == 0, proposed.output
+    assert proposed.stdout == "0002 2024-01-15 Proposed Adopt Kafka\n"
+    assert quarter.exit_code == 0, quarter.output
+    assert [line.split()[0] for line in quarter.stdout.splitlines()] == ["0002", "0003"]
+
+
+def test_list_rejects_invalid_since(tmp_path: Path) -> None:
+    result = CliRunner().invoke(app, ["list", "--dir", str(_adr_dir(tmp_path)), "--since", "Q1"])
+
+    assert result.exit_code != 0
+    assert "--since" in result.output
+
+
+def test_list_rejects_impossible_dates(tmp_path: Path) -> None:
+    result = CliRunner().invoke(
+        app, ["list", "--dir", str(_adr_dir(tmp_path)), "--since", "2024-13-45"]
+    )
+
+    assert result.exit_code == 2  # noqa: PLR2004 - click usage error
+    assert "--since" in result.output
+    assert "month must be in 1..12" in result.output
+
+
+def test_list_filters_with_jobs(tmp_path: Path) -> None:
+    adr_dir = _adr_dir(tmp_path)
+    result = CliRunner().invoke(
+        app, ["list", "--dir", str(adr_dir), "--jobs", "4", "--status", "accepted"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert [line.split()[0] for line in result.stdout.splitlines()] == ["0001", "0003"]
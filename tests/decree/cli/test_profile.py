@@ -0,0 +1,37 @@
+import pstats
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from decree.cli import app
+from decree.core import AdrLog
+
+
+def test_profile_flag_writes_stats_and_summary(tmp_path: Path) -> None:
+    adr_dir = tmp_path / "adr"
+    AdrLog.init(adr_dir)
+    output = tmp_path / "run.pstats"
+
+    result = CliRunner().invoke(
+        app, ["--profile", "--profile-output", str(output), "list", "--dir", str(adr_dir)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.stdout.strip().endswith("Record architecture decisions")
+    assert f"Profile written to {output}" in result.stderr
+    assert "parse" in result.stderr
+    assert pstats.Stats(str(output)).get_stats_profile().func_profiles
+
+
+def test_profile_env_var(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    adr_dir = tmp_path / "adr"
+    AdrLog.init(adr_dir)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DECREE_PROFILE", "1")
+
+    result = CliRunner().invoke(app, ["generate", "toc", "--dir", str(adr_dir)])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "decree.pstats").exists()
+    assert "render" in result.stderr
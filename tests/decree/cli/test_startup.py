@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+SRC_DIR = PROJECT_ROOT / "src"
+
+# Generous wall-clock ceiling per invocation; a cold start is ~0.1s locally.
+STARTUP_BUDGET_SECONDS = 1.0
+ATTEMPTS = 3
+
+HEAVY = {"beartype", "boltons", "tomllib", "rich", "decree.search", "decree.table", "decree.title"}
+# Everything of decree's own that a plain ``decree list`` needs.
+LIST_MODULES = {
+    "decree",
+    "decree.atomic",
+    "decree.cache",
+    "decree.cli",
+    "decree.core",
+    "decree.exitcodes",
+    "decree.iostats",
+    "decree.models",
+    "decree.profiling",
+    "decree.templates",
+    "decree.utils",
+}
+
+
+def _run(cwd: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    return subprocess.run(  # noqa: S603 - command is built from trusted arguments
+        [sys.executable, *args],
+        check=False,
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+
+def _imported_modules(cwd: Path, *args: str) -> set[str]:
+    result = _run(cwd, "-X", "importtime", "-m", "decree", *args)
+    assert result.returncode == 0, result.stderr
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    assert _run(tmp_path, "-m", "decree", "init").returncode == 0
+    return tmp_path
+
+
+@pytest.mark.parametrize("args", [("--help",), ("list",)])
+def test_commands_skip_heavy_imports(repo: Path, args: tuple[str, ...]) -> None:
+    modules = _imported_modules(repo, *args)
+    assert not modules & HEAVY
+
+
+def test_list_imports_only_what_it_uses(repo: Path) -> None:
+    modules = _imported_modules(repo, "list")
+    assert {name for name in modules if name.split(".")[0] == "decree"} == LIST_MODULES
+
+
+@pytest.mark.parametrize("args", [("--help",), ("list",)])
+def test_cold_start_within_budget(repo: Path, args: tuple[str, ...]) -> None:
+    best = float("inf")
+    for _ in range(ATTEMPTS):
+        started = time.perf_counter()
+        result = _run(repo, "-m", "decree", *args)
+        best = min(best, time.perf_counter() - started)
+        assert result.returncode == 0, result.stderr
+    assert best < STARTUP_BUDGET_SECONDS
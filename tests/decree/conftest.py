@@ -1,7 +1,31 @@
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
 import pytest
 
+from decree.core import AdrLog
+from decree.models import LinkSpec, NewSpec
+
 
 @pytest.fixture(autouse=True)
 def _clean_env(monkeypatch: pytest.MonkeyPatch) -> None:
     for k in ("ADR_DATE", "ADR_TEMPLATE"):
         monkeypatch.delenv(k, raising=False)
+
+
+@pytest.fixture
+def make_log(tmp_path: Path) -> Callable[..., AdrLog]:
+    """Build ADR logs under ``tmp_path``.
+
+    ``make_log(*specs, links=(), under=tmp_path)`` initialises ``under/adr``,
+    adds ``specs`` after the seeded 0001 record, applies ``links`` and returns
+    a fresh :class:`AdrLog` whose I/O counters start at zero.
+    """
+
+    def _make(*specs: NewSpec, links: Iterable[LinkSpec] = (), under: Path = tmp_path) -> AdrLog:
+        log = AdrLog.init(under / "adr")
+        log.new_many(specs)
+        log.link_many(links)
+        return AdrLog(log.dir)
+
+    return _make
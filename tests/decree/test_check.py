@@ -0,0 +1,98 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from decree.check import (
+    BROKEN_LINK,
+    DUPLICATE_NUMBER,
+    HEADING_MISMATCH,
+    INVALID_STATUS,
+    MISSING_REVERSE,
+    MISSING_TARGET,
+)
+from decree.cli import app
+from decree.core import AdrLog
+from decree.models import AdrRef, LinkSpec, NewSpec
+
+RECORDS = (NewSpec("Second", date="2024-01-01"), NewSpec("Third", date="2024-01-02"))
+LINKS = (LinkSpec(AdrRef(3), "Supersedes", AdrRef(2), reverse=True),)
+
+
+def _append(path: Path, text: str) -> None:
+    path.write_text(path.read_text(encoding="utf-8") + text, encoding="utf-8")
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_clean_log_has_no_problems(
+    tmp_path: Path, make_log: Callable[..., AdrLog], jobs: int
+) -> None:
+    log = make_log(*RECORDS, links=LINKS)
+    third = next(log.dir.glob("0003-*.md"))
+    _append(third, "\nSee [the second ADR](0002-second.md#context) and [docs](../README.md).\n")
+    (tmp_path / "README.md").write_text("docs\n", encoding="utf-8")
+    assert log.check(jobs=jobs) == []
+
+
+def test_check_reports_each_kind_of_problem(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS, links=LINKS)
+    second = next(log.dir.glob("0002-*.md"))
+    third = next(log.dir.glob("0003-*.md"))
+    _append(third, "\nAmends: 0002\nRelates to: 0009\n\nSee [gone](0007-gone.md).\n")
+    second.write_text(
+        second.read_text(encoding="utf-8").replace("Status: Accepted", "Status: Done"),
+        encoding="utf-8",
+    )
+    (log.dir / "0003-clash.md").write_text("# 4: Clash\n\nStatus: Proposed\n", encoding="utf-8")
+
+    found = {(p.path.name, p.code) for p in log.check()}
+
+    assert found == {
+        ("0002-second.md", INVALID_STATUS),
+        ("0003-clash.md", DUPLICATE_NUMBER),
+        ("0003-clash.md", HEADING_MISMATCH),
+        ("0003-third.md", DUPLICATE_NUMBER),
+        ("0003-third.md", MISSING_REVERSE),
+        ("0003-third.md", MISSING_TARGET),
+        ("0003-third.md", BROKEN_LINK),
+    }
+
+
+def test_rerun_reads_only_changed_files(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS, links=LINKS)
+    log.upgrade()
+    log.check()
+    assert (log.dir / ".decree" / "cache" / "check.json").exists()
+
+    warm = AdrLog(log.dir)
+    assert warm.check() == []
+    assert warm.stats().files_opened == 1
+
+    second = next(log.dir.glob("0002-*.md"))
+    second.write_text(
+        second.read_text(encoding="utf-8").replace("Is superseded by: 0003", ""), "utf-8"
+    )
+    edited = AdrLog(log.dir)
+    problems = edited.check()
+    # The unchanged 0003 is re-evaluated against the edited 0002 without being read.
+    assert [(p.path.name, p.line, p.code) for p in problems] == [
+        ("0003-third.md", 22, MISSING_REVERSE)
+    ]
+    assert edited.stats().files_opened == 3  # noqa: PLR2004 - cache, 0002, cache rewrite
+
+
+def test_check_command(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS, links=LINKS)
+    runner = CliRunner()
+
+    clean = runner.invoke(app, ["check", "--dir", str(log.dir)])
+    _append(next(log.dir.glob("0003-*.md")), "\nAmends: 0008\n")
+    broken = runner.invoke(app, ["check", "--dir", str(log.dir), "--jobs", "2"])
+
+    assert clean.exit_code == 0, clean.output
+    assert clean.stdout == ""
+    assert broken.exit_code == 1
+    assert "0003-third.md:" in broken.stdout
+    assert "missing-target Amends: 0008 does not exist" in broken.stdout
+    assert "1 problem found" in broken.stderr
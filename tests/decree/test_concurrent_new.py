@@ -0,0 +1,126 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from decree.core import _LOCK_NAME, AdrLog, _allocation_lock
+
+WRITERS = 8
+RECORDS_PER_WRITER = 10
+# Generous ceiling for 80 serialized allocations across 8 processes.
+TIME_BUDGET_SECONDS = 30.0
+
+
+def _writer(directory: str, writer: int) -> list[int]:
+    log = AdrLog(Path(directory))
+    return [
+        log.new(f"Writer {writer} record {idx}", date="2024-03-04").number
+        for idx in range(RECORDS_PER_WRITER)
+    ]
+
+
+def test_concurrent_writers_get_distinct_numbers(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    started = time.perf_counter()
+    with multiprocessing.get_context().Pool(WRITERS) as pool:
+        results = pool.starmap(_writer, [(str(log.dir), idx) for idx in range(WRITERS)])
+    elapsed = time.perf_counter() - started
+
+    numbers = [number for chunk in results for number in chunk]
+    total = WRITERS * RECORDS_PER_WRITER
+    assert sorted(numbers) == list(range(2, total + 2))
+
+    on_disk = Counter(int(p.name[:4]) for p in log.dir.glob("[0-9][0-9][0-9][0-9]-*.md"))
+    assert len(on_disk) == total + 1
+    assert max(on_disk.values()) == 1
+    assert not (log.dir / _LOCK_NAME).exists()
+    assert elapsed < TIME_BUDGET_SECONDS
+
+
+def test_stale_lock_is_broken(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    lock = log.dir / _LOCK_NAME
+    lock.write_text("12345", encoding="utf-8")
+    old = time.time() - 3600
+    os.utime(lock, (old, old))
+
+    record = log.new("After a crashed writer")
+    assert record.number == 2  # noqa: PLR2004 - seed record is 0001
+    assert not lock.exists()
+
+
+def _race_for_lock(directory: Path, waiters: int) -> list[int]:
+    """Return how many holders were inside the lock as each waiter entered."""
+    barrier = threading.Barrier(waiters)
+    guard = threading.Lock()
+    inside: list[int] = []
+    overlaps: list[int] = []
+
+    def wait_for_lock() -> None:
+        barrier.wait()
+        with _allocation_lock(directory):
+            with guard:
+                inside.append(1)
+                overlaps.append(len(inside))
+            time.sleep(0.001)
+            with guard:
+                inside.pop()
+
+    threads = [threading.Thread(target=wait_for_lock) for _ in range(waiters)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return overlaps
+
+
+def test_waiters_on_a_stale_lock_take_turns(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    lock = tmp_path / _LOCK_NAME
+    waiters = 8
+    real_time = time.time
+
+    def slow_time() -> float:
+        # Widen the gap between judging the lock stale and breaking it.
+        time.sleep(0.002)
+        return real_time()
+
+    monkeypatch.setattr("decree.core.time.time", slow_time)
+    for _ in range(20):
+        lock.write_text("12345", encoding="utf-8")
+        old = real_time() - 3600
+        os.utime(lock, (old, old))
+        assert _race_for_lock(tmp_path, waiters) == [1] * waiters
+        assert sorted(path.name for path in tmp_path.iterdir()) == []
+
+
+def test_lock_times_out_when_held(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("decree.core._LOCK_TIMEOUT", 0.05)
+    errors: list[BaseException] = []
+
+    def wait_for_lock() -> None:
+        try:
+            with _allocation_lock(tmp_path):
+                pass  # pragma: no cover - the lock is held by the main thread
+        except TimeoutError as exc:
+            errors.append(exc)
+
+    with _allocation_lock(tmp_path):
+        waiter = threading.Thread(target=wait_for_lock)
+        waiter.start()
+        waiter.join()
+    assert len(errors) == 1
+
+
+def test_lock_is_reentrant_in_the_holding_thread(tmp_path: Path) -> None:
+    lock = tmp_path / _LOCK_NAME
+    with _allocation_lock(tmp_path):
+        with _allocation_lock(tmp_path):
+            assert lock.exists()
+        assert lock.exists()
+    assert not lock.exists()
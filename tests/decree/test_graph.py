@@ -0,0 +1,178 @@
+from collections.abc import Callable
+
+import pytest
+from typer.testing import CliRunner
+
+from decree.cli import app
+from decree.core import AdrLog, read_relations
+from decree.graph import SupersessionCycleError, normalize_edge
+from decree.models import AdrRef, GraphFormat, LinkSpec, NewSpec
+
+# 0001 <- 0002 <- 0003 supersession plus an unrelated 0004.
+CHAIN = (
+    NewSpec("Second", date="2024-01-01"),
+    NewSpec("Third", date="2024-01-02"),
+    NewSpec('Unrelated "quoted"', date="2024-01-03"),
+)
+CHAIN_LINKS = (
+    LinkSpec(AdrRef(2), "Supersedes", AdrRef(1), reverse=True),
+    LinkSpec(AdrRef(3), "Supersedes", AdrRef(2), reverse=True),
+)
+
+
+def test_read_relations_ignores_metadata(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    second = next(log.dir.glob("0002-*.md"))
+    assert read_relations(second) == [("Supersedes", 1), ("Is superseded by", 3)]
+
+
+@pytest.mark.parametrize(
+    ("rel", "src", "tgt", "expected"),
+    [
+        ("Supersedes", 2, 1, ("Supersedes", 2, 1)),
+        ("Is superseded by", 1, 2, ("Supersedes", 2, 1)),
+        ("Relates to", 5, 3, ("Relates to", 3, 5)),
+        ("Is blocks by", 4, 7, ("Blocks", 7, 4)),
+        ("Custom", 1, 2, ("Custom", 1, 2)),
+    ],
+)
+def test_normalize_edge(rel: str, src: int, tgt: int, expected: tuple[str, int, int]) -> None:
+    assert normalize_edge(rel, src, tgt) == expected
+
+
+def test_dot_graph_folds_reverse_links(make_log: Callable[..., AdrLog]) -> None:
+    lines = list(make_log(*CHAIN, links=CHAIN_LINKS).iter_graph())
+    assert lines == [
+        "digraph adr {",
+        "  node [shape=box];",
+        '  adr1 [label="0001. Record architecture decisions"];',
+        '  adr2 -> adr1 [label="Supersedes"];',
+        '  adr2 [label="0002. Second"];',
+        '  adr3 -> adr2 [label="Supersedes"];',
+        '  adr3 [label="0003. Third"];',
+        '  adr4 [label="0004. Unrelated \\"quoted\\""];',
+        "}",
+    ]
+
+
+def test_mermaid_subgraph_from_root_with_depth(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    lines = list(log.iter_graph(GraphFormat.mermaid, root=3, depth=1))
+    assert lines == [
+        "graph LR",
+        '  adr3["0003. Third"]',
+        '  adr3 -->|"Supersedes"| adr2',
+        '  adr2["0002. Second"]',
+    ]
+    assert len(list(log.iter_graph(GraphFormat.mermaid, root=3))) == 6  # noqa: PLR2004
+
+
+def test_graph_root_must_exist(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    with pytest.raises(FileNotFoundError, match="ADR 0009 not found"):
+        log.iter_graph(root=9)
+
+
+def test_cli_generate_graph_mermaid(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    result = CliRunner().invoke(
+        app,
+        ["generate", "graph", "--format", "mermaid", "--root", "2", "--dir", str(log.dir)],
+    )
+    assert result.exit_code == 0, result.output
+    assert result.stdout.splitlines()[0] == "graph LR"
+    assert "adr4" not in result.stdout
+
+
+def test_link_graph_adjacency(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    log.link(AdrRef(4), "Relates to", AdrRef(3), reverse=True)
+    log.link(AdrRef(4), "References", AdrRef(1), reverse=False)
+    graph = log.link_graph()
+
+    assert graph.numbers() == [1, 2, 3, 4]
+    assert graph.edges() == [
+        ("References", 4, 1),
+        ("Relates to", 3, 4),
+        ("Supersedes", 2, 1),
+        ("Supersedes", 3, 2),
+    ]
+    assert graph.incoming(1, "Supersedes") == [("Supersedes", 2)]
+    assert graph.outgoing(4) == [("References", 1), ("Relates to", 3)]
+    assert graph.outgoing(3, "Relates to") == [("Relates to", 4)]
+    assert graph.reachable(3, "Supersedes") == [2, 1]
+    assert graph.reachable(1, reverse=True) == [4, 2, 3]
+
+
+def test_link_graph_rereads_only_changed_files(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    log.upgrade()
+    log.link_graph()
+    assert (log.dir / ".decree" / "cache" / "graph.json").exists()
+
+    warm = AdrLog(log.dir)
+    assert warm.link_graph().incoming(2) == [("Supersedes", 3)]
+    assert warm.stats().files_opened == 1
+
+    next(log.dir.glob("0004-*.md")).unlink()
+    log.link(AdrRef(3), "Amends", AdrRef(1), reverse=False)
+    edited = AdrLog(log.dir)
+    graph = edited.link_graph()
+    assert graph.incoming(1) == [("Amends", 3), ("Supersedes", 2)]
+    assert graph.numbers() == [1, 2, 3]
+    # The cache, 0003, and the rewrite of the cache.
+    assert edited.stats().files_opened == 3  # noqa: PLR2004 - counted above
+
+
+def test_effective_follows_supersession_chains(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    log.new("Split A", date="2024-01-04")
+    log.new("Split B", date="2024-01-05")
+    log.link(AdrRef(5), "Supersedes", AdrRef(4), reverse=True)
+    log.link(AdrRef(6), "Supersedes", AdrRef(4), reverse=False)
+    graph = log.link_graph()
+
+    assert graph.effective(1) == [3]
+    assert graph.effective(3) == [3]
+    assert graph.effective(4) == [5, 6]
+    assert graph.superseded() == {1, 2, 4}
+    assert [r.title for r in log.effective(1)] == ["Third"]
+    with pytest.raises(FileNotFoundError, match="ADR 0009 not found"):
+        log.effective(9)
+
+
+def test_effective_detects_cycles(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    log.link(AdrRef(1), "Supersedes", AdrRef(3), reverse=False)
+
+    with pytest.raises(SupersessionCycleError) as excinfo:
+        log.link_graph().effective(2)
+
+    assert excinfo.value.cycle == [2, 3, 1, 2]
+    assert str(excinfo.value) == "supersession cycle: 0002 -> 0003 -> 0001 -> 0002"
+
+
+def test_cli_resolve_and_list_effective(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    runner = CliRunner()
+
+    resolved = runner.invoke(app, ["resolve", "0001", "--dir", str(log.dir)])
+    listed = runner.invoke(app, ["list", "--effective", "--dir", str(log.dir)])
+
+    assert resolved.exit_code == 0, resolved.output
+    assert resolved.stdout == "0003 2024-01-02 Accepted Third\n"
+    assert listed.exit_code == 0, listed.output
+    assert [line.split()[0] for line in listed.stdout.splitlines()] == ["0003", "0004"]
+
+
+def test_graph_reads_each_file_once(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*CHAIN, links=CHAIN_LINKS)
+    full = AdrLog(log.dir)
+    list(full.iter_graph())
+    assert full.stats().files_opened == 4  # noqa: PLR2004 - one per ADR
+
+    rooted = AdrLog(log.dir)
+    list(rooted.iter_graph(root=3, depth=1))
+    # Only 0003 and 0002 are looked up and read; 0001 is beyond the depth.
+    assert rooted.stats().files_opened == 2  # noqa: PLR2004 - counted above
+    assert rooted.stats().globs == 2  # noqa: PLR2004 - counted above
@@ -0,0 +1,89 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from decree.cli import app
+from decree.core import AdrLog
+from decree.iostats import IoStats, collecting, note_read
+from decree.models import AdrRef, NewSpec
+from decree.title import ExecutionContext, update_title
+
+
+def _decisions(count: int) -> list[NewSpec]:
+    return [NewSpec(f"Decision {idx}", date="2024-01-01") for idx in range(count)]
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_list_opens_each_record_once(make_log: Callable[..., AdrLog], jobs: int) -> None:
+    log = make_log(*_decisions(9))
+    records = list(log.list(jobs=jobs))
+    stats = log.stats()
+    assert (stats.globs, stats.files_opened) == (1, len(records))
+    assert stats.bytes_read > 0
+    assert stats.bytes_written == 0
+
+
+def test_cached_list_reads_only_the_cache(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*_decisions(9))
+    log.upgrade()
+    list(log.list())
+    warm = AdrLog(log.dir)
+    list(warm.list())
+    assert warm.stats().files_opened == 1
+
+
+def test_stats_are_counted_lazily_and_per_log(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*_decisions(2))
+    other = AdrLog(log.dir)
+    lines = log.iter_toc_lines()
+    assert log.stats().files_opened == 0
+    list(lines)
+    other.link(AdrRef(3), "Amends", AdrRef(2), reverse=True)
+    assert log.stats().files_opened == 3  # noqa: PLR2004 - one per record
+    assert other.stats().bytes_written > 0
+    assert other.stats().files_opened == 4  # noqa: PLR2004 - read and append, twice
+
+
+def _title_set_stats(log: AdrLog) -> tuple[int, int]:
+    log.upgrade()
+    second = next(log.dir.glob("0002-*.md"))
+    (log.dir / "0003-decision-1.md").write_text(
+        f"# 3: Decision 1\n\nSee [previous]({second.name}).\n", encoding="utf-8"
+    )
+    warmup = ExecutionContext(dry_run=False, emit=lambda _: None)
+    update_title(log.dir, "2", "Warm up", rename=True, ctx=warmup)
+    ctx = ExecutionContext(dry_run=False, emit=lambda _: None)
+    update_title(log.dir, "2", "Measured title", rename=True, ctx=ctx)
+    assert (ctx.stats.renames, ctx.stats.link_substitutions) == (1, 1)
+    return ctx.stats.files_opened, ctx.stats.globs
+
+
+def test_title_set_touches_constant_files(tmp_path: Path, make_log: Callable[..., AdrLog]) -> None:
+    small = _title_set_stats(make_log(*_decisions(5), under=tmp_path / "small"))
+    large = _title_set_stats(make_log(*_decisions(60), under=tmp_path / "large"))
+    assert small == large
+
+
+def test_cli_list_stats(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*_decisions(1))
+    result = CliRunner().invoke(app, ["list", "--stats", "--dir", str(log.dir)])
+    assert result.exit_code == 0, result.output
+    assert "files opened: 2" in result.stderr
+    assert "files opened" not in result.stdout
+
+
+def test_counts_from_many_threads_are_not_lost() -> None:
+    stats = IoStats()
+    reads = 20_000
+
+    def work(_: int) -> None:
+        with collecting(stats):
+            for _ in range(reads):
+                note_read(b"ab")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+    assert (stats.files_opened, stats.bytes_read) == (8 * reads, 16 * reads)
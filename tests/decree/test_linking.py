@@ -1,7 +1,11 @@
 from pathlib import Path
 
+import pytest
+from typer.testing import CliRunner
+
+from decree.cli import app
 from decree.core import AdrLog
-from decree.models import AdrRef
+from decree.models import AdrRef, LinkSpec
 
 
 def _read_lines(path: Path) -> list[str]:
@@ -87,6 +91,23 @@ def test_link_then_unlink_restores_original_content(tmp_path: Path) -> None:
     assert tgt_record.path.read_text(encoding="utf-8") == original_tgt
 
 
+def test_link_and_unlink_keep_crlf_line_endings(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    src = log.new("Windows checkout").path
+    tgt = log.new("Another").path
+    for path in (src, tgt):
+        path.write_bytes(path.read_bytes().replace(b"\n", b"\r\n"))
+    original = src.read_bytes()
+
+    log.link(AdrRef(2), "Amends", AdrRef(3), reverse=True)
+    linked = src.read_bytes()
+    assert linked.endswith(b"\r\n\r\nAmends: 0003\r\n")
+    assert linked.count(b"\n") == linked.count(b"\r\n")
+
+    log.unlink(AdrRef(2), "Amends", AdrRef(3), reverse=True)
+    assert src.read_bytes() == original
+
+
 def test_link_with_unknown_relation_generates_reverse_label(tmp_path: Path) -> None:
     log = AdrLog.init(tmp_path / "doc" / "adr")
     src_record = log.new("Block downstream work")
@@ -156,3 +177,84 @@ def test_link_idempotency_forward_only(tmp_path: Path) -> None:
     # Should only appear once in source, not at all in target
     assert src_lines.count(forward_line) == 1
     assert reverse_line not in tgt_lines
+
+
+def test_link_many_groups_writes_and_matches_single_links(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    hub = log.new("Hub decision")
+    spokes = [log.new(f"Spoke {idx}") for idx in range(3)]
+    single = AdrLog.init(tmp_path / "single" / "adr")
+    single_hub = single.new("Hub decision")
+    single_spokes = [single.new(f"Spoke {idx}") for idx in range(3)]
+
+    specs = [
+        LinkSpec(AdrRef(hub.number), "Supersedes", AdrRef(spoke.number), reverse=True)
+        for spoke in spokes
+    ]
+    written = log.link_many([*specs, specs[0]])
+    for spec in specs:
+        single.link(spec.src, spec.rel, spec.tgt, reverse=True)
+
+    assert sorted(written) == sorted([hub.path, *(spoke.path for spoke in spokes)])
+    assert hub.path.read_text(encoding="utf-8") == single_hub.path.read_text(encoding="utf-8")
+    for spoke, single_spoke in zip(spokes, single_spokes, strict=True):
+        assert spoke.path.read_text(encoding="utf-8") == single_spoke.path.read_text(
+            encoding="utf-8"
+        )
+
+    assert log.link_many(specs) == []
+
+
+def test_unlink_many_restores_original_content(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    src_record = log.new("Bulk unlink source")
+    targets = [log.new(f"Bulk unlink target {idx}") for idx in range(2)]
+    originals = {rec.path: rec.path.read_text(encoding="utf-8") for rec in [src_record, *targets]}
+    specs = [
+        LinkSpec(AdrRef(src_record.number), "References", AdrRef(tgt.number), reverse=True)
+        for tgt in targets
+    ]
+
+    log.link_many(specs)
+    log.unlink_many(specs)
+
+    for path, original in originals.items():
+        assert path.read_text(encoding="utf-8") == original
+
+
+def test_link_many_rejects_unknown_numbers_before_writing(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    record = log.new("Only record")
+    original = record.path.read_text(encoding="utf-8")
+    specs = [
+        LinkSpec(AdrRef(record.number), "References", AdrRef(1)),
+        LinkSpec(AdrRef(record.number), "References", AdrRef(99)),
+    ]
+
+    with pytest.raises(FileNotFoundError, match="ADR 0099 not found"):
+        log.link_many(specs)
+    assert record.path.read_text(encoding="utf-8") == original
+
+
+def test_cli_link_from_file(tmp_path: Path) -> None:
+    adr_dir = tmp_path / "adr"
+    log = AdrLog.init(adr_dir)
+    second = log.new("Second record")
+    third = log.new("Third record")
+    source = tmp_path / "links.csv"
+    source.write_text(
+        "src,rel,tgt,reverse\n3,Supersedes,2,true\n3,References,1,\n",
+        encoding="utf-8",
+    )
+
+    result = CliRunner().invoke(app, ["link", "--from-file", str(source), "--dir", str(adr_dir)])
+
+    assert result.exit_code == 0, result.output
+    assert "Linked 2" in result.stdout
+    third_lines = _read_lines(third.path)
+    assert "Supersedes: 0002" in third_lines
+    assert "References: 0001" in third_lines
+    assert "Is superseded by: 0003" in _read_lines(second.path)
+    assert "Is referenced by: 0003" not in _read_lines(
+        log.dir / "0001-record-architecture-decisions.md"
+    )
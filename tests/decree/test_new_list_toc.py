@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from decree.core import AdrLog
 from decree.models import AdrStatus
 
@@ -13,3 +15,32 @@ def test_new_list_and_toc(tmp_path: Path) -> None:
     assert rows[1].number == expected_records
     toc = log.generate_toc()
     assert "Use beartype on public API" in toc
+
+
+def test_iter_toc_lines_streams_lazily(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ADR_DATE", "2024-04-04")
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    log.new("Streamed record", date="2024-04-05")
+    # A record that cannot be parsed proves later files are not read up front.
+    (log.dir / "0003-broken.md").write_text("# 3: Broken\n\nStatus: Bogus\n", encoding="utf-8")
+
+    lines = log.iter_toc_lines()
+    head = [next(lines) for _ in range(4)]
+
+    assert head == [
+        "# Architecture decision records",
+        "",
+        (
+            "- 0001. [Record architecture decisions](0001-record-architecture-decisions.md)"
+            " — Accepted (2024-04-04)"
+        ),
+        "- 0002. [Streamed record](0002-streamed-record.md) — Accepted (2024-04-05)",
+    ]
+    with pytest.raises(ValueError, match="Bogus"):
+        next(lines)
+
+
+def test_generate_toc_joins_streamed_lines(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    log.new("Joined record")
+    assert log.generate_toc() == "".join(f"{line}\n" for line in log.iter_toc_lines())
@@ -0,0 +1,116 @@
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from decree.cli import app
+from decree.core import AdrLog
+from decree.exitcodes import ExitCode
+from decree.models import AdrStatus, NewSpec
+
+runner = CliRunner()
+
+
+def test_new_many_allocates_contiguous_numbers(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    template = tmp_path / "template.md"
+    template.write_text("# {number}: {title}\n\nDate: {date}\nStatus: {status}\n", encoding="utf-8")
+
+    records = log.new_many(
+        [
+            NewSpec("Import first decision", date="2023-01-01"),
+            NewSpec("Import second decision", status=AdrStatus.Proposed, date="2023-01-02"),
+        ],
+        template=template,
+    )
+
+    assert [rec.number for rec in records] == [2, 3]
+    assert records[1].path.read_text(encoding="utf-8") == (
+        "# 3: Import second decision\n\nDate: 2023-01-02\nStatus: Proposed\n"
+    )
+    assert [rec.title for rec in log.list()][1:] == [
+        "Import first decision",
+        "Import second decision",
+    ]
+
+
+def test_new_many_validates_dates_before_writing(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    with pytest.raises(ValueError, match="Invalid date format"):
+        log.new_many([NewSpec("Fine", date="2023-01-01"), NewSpec("Broken", date="01/02/2023")])
+    assert [rec.number for rec in log.list()] == [1]
+
+
+def test_cli_new_from_jsonl_file(tmp_path: Path) -> None:
+    adr_dir = tmp_path / "adr"
+    AdrLog.init(adr_dir)
+    source = tmp_path / "import.jsonl"
+    rows = [
+        {"title": "From JSON", "status": "proposed", "date": "2022-05-06"},
+        {"title": "Uses defaults"},
+    ]
+    source.write_text("\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8")
+
+    result = runner.invoke(
+        app,
+        ["new", "--from-file", str(source), "--dir", str(adr_dir), "--date", "2022-07-08"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.stdout.splitlines() == [
+        str(adr_dir / "0002-from-json.md"),
+        str(adr_dir / "0003-uses-defaults.md"),
+    ]
+    listed = list(AdrLog(adr_dir).list())
+    assert (listed[1].status, listed[1].date) == (AdrStatus.Proposed, "2022-05-06")
+    assert (listed[2].status, listed[2].date) == (AdrStatus.Accepted, "2022-07-08")
+
+
+def test_cli_new_from_csv_stdin(tmp_path: Path) -> None:
+    adr_dir = tmp_path / "adr"
+    AdrLog.init(adr_dir)
+    csv_text = "title,status,date\nCSV decision,Rejected,2021-01-01\n"
+
+    result = runner.invoke(
+        app,
+        ["new", "--from-file", "-", "--dir", str(adr_dir)],
+        input=csv_text,
+    )
+
+    assert result.exit_code == 0, result.output
+    record = list(AdrLog(adr_dir).list())[1]
+    assert (record.title, record.status, record.date) == (
+        "CSV decision",
+        AdrStatus.Rejected,
+        "2021-01-01",
+    )
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"title": "Valid"}\n{"status": "Accepted"}\n',
+        '{"title": "X", "status": "Unknown"}\n',
+        '{"title": "Valid"}\n{"title": "Leap", "date": "2024-02-30"}\n',
+    ],
+)
+def test_cli_new_from_file_rejects_bad_rows(tmp_path: Path, content: str) -> None:
+    adr_dir = tmp_path / "adr"
+    AdrLog.init(adr_dir)
+    source = tmp_path / "bad.jsonl"
+    source.write_text(content, encoding="utf-8")
+
+    result = runner.invoke(app, ["new", "--from-file", str(source), "--dir", str(adr_dir)])
+
+    assert result.exit_code == int(ExitCode.CONFIG_ERROR)
+    assert [rec.number for rec in AdrLog(adr_dir).list()] == [1]
+
+
+def test_cli_new_requires_exactly_one_title_source(tmp_path: Path) -> None:
+    source = tmp_path / "rows.csv"
+    source.write_text("title\nOne\n", encoding="utf-8")
+    both = runner.invoke(app, ["new", "Title", "--from-file", str(source)])
+    neither = runner.invoke(app, ["new"])
+    assert both.exit_code != 0
+    assert neither.exit_code != 0
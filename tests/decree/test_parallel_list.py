@@ -0,0 +1,51 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from decree.cli import app
+from decree.core import AdrLog
+from decree.models import AdrStatus, NewSpec
+
+RECORDS = tuple(
+    NewSpec(
+        f"Parallel record {idx}",
+        status=AdrStatus.Proposed if idx % 3 else AdrStatus.Accepted,
+        date="2024-02-03",
+    )
+    for idx in range(40)
+)
+
+
+def test_parallel_list_matches_sequential(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    sequential = list(log.list())
+    parallel = list(log.list(jobs=8))
+    assert parallel == sequential
+    assert [rec.number for rec in parallel] == list(range(1, 42))
+
+
+def test_parallel_list_uses_cache(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    log.upgrade()
+    first = list(log.list(jobs=4))
+    assert (log.dir / ".decree" / "cache" / "records.json").exists()
+    assert list(log.list(jobs=4)) == first
+
+
+def test_list_rejects_non_positive_jobs(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    with pytest.raises(ValueError, match="jobs must be at least 1"):
+        list(log.list(jobs=0))
+
+
+def test_cli_jobs_option_matches_default_output(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    runner = CliRunner()
+    for command in (["list"], ["generate", "toc"]):
+        baseline = runner.invoke(app, [*command, "--dir", str(log.dir)])
+        threaded = runner.invoke(app, [*command, "--dir", str(log.dir), "--jobs", "4"])
+        assert baseline.exit_code == 0
+        assert threaded.exit_code == 0
+        assert threaded.stdout == baseline.stdout
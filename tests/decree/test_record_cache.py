@@ -0,0 +1,90 @@
+import json
+import os
+from pathlib import Path
+
+from decree.core import AdrLog
+from decree.models import AdrStatus
+
+
+def _cache_file(log: AdrLog) -> Path:
+    return log.dir / ".decree" / "cache" / "records.json"
+
+
+def _upgraded_log(tmp_path: Path) -> AdrLog:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    log.new("Cache record metadata", date="2024-01-02")
+    log.upgrade()
+    return log
+
+
+def test_list_without_state_dir_writes_no_cache(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "doc" / "adr")
+    assert [rec.number for rec in log.list()] == [1]
+    assert not (log.dir / ".decree").exists()
+
+
+def test_list_populates_cache_and_serves_unchanged_files(tmp_path: Path) -> None:
+    log = _upgraded_log(tmp_path)
+    first = list(log.list())
+
+    cache_path = _cache_file(log)
+    data = json.loads(cache_path.read_text(encoding="utf-8"))
+    entry = data["records"]["0002-cache-record-metadata.md"]
+    assert entry[2:] == [
+        2,
+        "cache-record-metadata",
+        "Cache record metadata",
+        "Accepted",
+        "2024-01-02",
+    ]
+
+    # Prove cached rows are used by tampering with the stored title only.
+    entry[4] = "From cache"
+    cache_path.write_text(json.dumps(data), encoding="utf-8")
+    second = list(log.list())
+    assert second[1].title == "From cache"
+    assert second[1].path == first[1].path
+
+
+def test_list_reparses_modified_files(tmp_path: Path) -> None:
+    log = _upgraded_log(tmp_path)
+    list(log.list())
+
+    record = log.dir / "0002-cache-record-metadata.md"
+    text = record.read_text(encoding="utf-8").replace("Status: Accepted", "Status: Proposed")
+    record.write_text(text, encoding="utf-8")
+    stat = record.stat()
+    os.utime(record, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    rows = list(log.list())
+    assert rows[1].status is AdrStatus.Proposed
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path: Path) -> None:
+    log = _upgraded_log(tmp_path)
+    cache_path = _cache_file(log)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text("{not json", encoding="utf-8")
+
+    rows = list(log.list())
+    assert [rec.title for rec in rows] == ["Record architecture decisions", "Cache record metadata"]
+    data = json.loads(cache_path.read_text(encoding="utf-8"))
+    assert sorted(data["records"]) == [
+        "0001-record-architecture-decisions.md",
+        "0002-cache-record-metadata.md",
+    ]
+
+
+def test_cache_drops_deleted_records(tmp_path: Path) -> None:
+    log = _upgraded_log(tmp_path)
+    list(log.list())
+    (log.dir / "0002-cache-record-metadata.md").unlink()
+
+    assert [rec.number for rec in log.list()] == [1]
+    data = json.loads(_cache_file(log).read_text(encoding="utf-8"))
+    assert list(data["records"]) == ["0001-record-architecture-decisions.md"]
+
+
+def test_upgrade_ignores_cache_directory(tmp_path: Path) -> None:
+    log = _upgraded_log(tmp_path)
+    assert (log.dir / ".decree" / ".gitignore").read_text(encoding="utf-8") == "cache/\n"
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import pytest
+from beartype.roar import BeartypeCallHintParamViolation
+
+from decree.core import AdrLog
+from decree.utils import unchecked_calls
+
+
+def test_public_api_checks_every_call(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    with pytest.raises(BeartypeCallHintParamViolation):
+        log.list(jobs="2")  # type: ignore[arg-type]
+    with pytest.raises(BeartypeCallHintParamViolation):
+        log.list(jobs="2")  # type: ignore[arg-type]
+
+
+def test_unchecked_calls_skip_the_check(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    with unchecked_calls():
+        records = list(log.list(jobs=1.0))  # type: ignore[arg-type]
+    assert [record.number for record in records] == [1]
+    with pytest.raises(BeartypeCallHintParamViolation):
+        list(log.list(jobs=1.0))  # type: ignore[arg-type]
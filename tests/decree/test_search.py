@@ -0,0 +1,81 @@
+import json
+from collections.abc import Callable
+
+from typer.testing import CliRunner
+
+from decree.cli import app
+from decree.core import AdrLog
+from decree.models import AdrStatus, NewSpec
+from decree.search import tokenize
+
+RECORDS = (
+    NewSpec("Use Postgres for storage", date="2024-01-01"),
+    NewSpec("Adopt Kafka", status=AdrStatus.Proposed, date="2024-01-02"),
+    NewSpec("Cache sessions in Redis", date="2024-01-03"),
+)
+
+
+def _with_kafka_notes(log: AdrLog) -> AdrLog:
+    kafka = next(log.dir.glob("0003-*.md"))
+    kafka.write_text(
+        kafka.read_text(encoding="utf-8") + "\nKafka replaces the Postgres outbox. Kafka!\n",
+        encoding="utf-8",
+    )
+    return log
+
+
+def test_tokenize_lowercases_and_splits_on_punctuation() -> None:
+    assert tokenize("Use_Postgres, v2!") == ["use", "postgres", "v2"]
+
+
+def test_search_ranks_by_bm25(make_log: Callable[..., AdrLog]) -> None:
+    log = _with_kafka_notes(make_log(*RECORDS))
+    hits = log.search("kafka postgres")
+    assert [hit.record.number for hit in hits] == [3, 2]
+    assert hits[0].record.status is AdrStatus.Proposed
+    assert hits[0].score > hits[1].score > 0
+    assert log.search("postgres", limit=1)[0].record.title == "Use Postgres for storage"
+    assert log.search("nonexistent") == []
+
+
+def test_index_is_updated_incrementally(make_log: Callable[..., AdrLog]) -> None:
+    log = _with_kafka_notes(make_log(*RECORDS))
+    log.upgrade()
+    log.search("warm")
+    assert (log.dir / ".decree" / "cache" / "search.json").exists()
+
+    warm = AdrLog(log.dir)
+    assert [hit.record.number for hit in warm.search("redis")] == [4]
+    assert warm.stats().files_opened == 2  # noqa: PLR2004 - search and record caches
+
+    redis = next(log.dir.glob("0004-*.md"))
+    redis.write_text("# 4. Cache sessions in Memcached\n\nStatus: Accepted\n", encoding="utf-8")
+    next(log.dir.glob("0002-*.md")).unlink()
+    edited = AdrLog(log.dir)
+    assert [hit.record.number for hit in edited.search("memcached postgres")] == [4, 3]
+    # Index read and rewrite, the edited file, the record cache and one header.
+    assert edited.stats().files_opened == 5  # noqa: PLR2004 - counted above
+    assert AdrLog(log.dir).search("redis") == []
+
+
+def test_inconsistent_index_is_rebuilt(make_log: Callable[..., AdrLog]) -> None:
+    log = _with_kafka_notes(make_log(*RECORDS))
+    log.upgrade()
+    log.search("warm")
+    cache = log.dir / ".decree" / "cache" / "search.json"
+    data = json.loads(cache.read_text(encoding="utf-8"))
+    data["postings"]["kafka"]["999"] = 1
+    cache.write_text(json.dumps(data), encoding="utf-8")
+
+    assert [hit.record.number for hit in AdrLog(log.dir).search("kafka")] == [3]
+
+
+def test_search_command(make_log: Callable[..., AdrLog]) -> None:
+    log = _with_kafka_notes(make_log(*RECORDS))
+
+    result = CliRunner().invoke(app, ["search", "--dir", str(log.dir), "redis", "sessions"])
+
+    assert result.exit_code == 0, result.output
+    number, score, status, title = result.stdout.strip().split(" ", 3)
+    assert (number, status, title) == ("0004", "Accepted", "Cache sessions in Redis")
+    assert float(score) > 0
@@ -0,0 +1,190 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from decree.cli import app
+from decree.core import AdrLog
+from decree.iostats import IoStats, collecting
+from decree.models import AdrRef
+from decree.server import INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, JsonRpcServer, LogModel
+from decree.watch import open_source
+
+
+class _ScriptedSource:
+    """Change source reporting only the names a test queues."""
+
+    def __init__(self) -> None:
+        self.pending: list[set[str]] = []
+
+    def wait(self, timeout: float) -> set[str]:
+        del timeout
+        return self.pending.pop(0) if self.pending else set()
+
+    def close(self) -> None:
+        pass
+
+
+def _server(log: AdrLog) -> JsonRpcServer:
+    return JsonRpcServer(log, _ScriptedSource())
+
+
+def _call(server: JsonRpcServer, method: str, **params: Any) -> Any:  # noqa: ANN401 - JSON result
+    raw = server.handle(json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}))
+    assert raw is not None
+    response = json.loads(raw)
+    assert "error" not in response, response
+    return response["result"]
+
+
+def test_server_mutations_update_model(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    # The source reports nothing, so only the server's own updates reach the model.
+    server = _server(log)
+
+    created = _call(server, "new", title="Served decision", status="proposed", date="2024-02-03")
+    assert (created["number"], created["status"]) == (2, "Proposed")
+
+    assert _call(server, "link", src=2, rel="Supersedes", tgt=1, reverse=True) is None
+    listed = _call(server, "list")
+    assert [rec["title"] for rec in listed] == ["Record architecture decisions", "Served decision"]
+    assert listed[0]["relations"] == [{"rel": "Is superseded by", "number": 2}]
+
+    _call(server, "unlink", src=2, rel="Supersedes", tgt=1, reverse=True)
+    result = _call(server, "title.set", target="2", title="Renamed by RPC")
+    assert any("Renamed" in message for message in result["messages"])
+    listed = _call(server, "list")
+    assert listed[1]["slug"] == "renamed-by-rpc"
+    assert all(not rec["relations"] for rec in listed)
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_server_picks_up_outside_edits(tmp_path: Path, polling: bool) -> None:  # noqa: FBT001 - parametrized
+    log = AdrLog.init(tmp_path / "adr")
+    server = JsonRpcServer(log, open_source(log.dir, poll_interval=0, polling=polling))
+    try:
+        assert len(_call(server, "list")) == 1
+
+        outside = AdrLog(log.dir).new("Written by another process")
+        assert _call(server, "list")[-1]["title"] == "Written by another process"
+        outside.path.unlink()
+        assert len(_call(server, "list")) == 1
+    finally:
+        server.close()
+
+
+def test_model_rereads_only_reported_files(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    second = log.new("Second", date="2024-01-01")
+    source = _ScriptedSource()
+    model = LogModel(AdrLog(log.dir), source)
+    second.path.write_text(
+        second.path.read_text(encoding="utf-8").replace("# 2: Second", "# 2: Edited elsewhere"),
+        encoding="utf-8",
+    )
+
+    stats = IoStats()
+    with collecting(stats):
+        model.refresh()
+    assert stats.files_opened == 0
+    source.pending.append({second.path.name})
+    with collecting(stats):
+        model.refresh()
+    assert stats.files_opened == 1
+    assert [record.title for record, _ in model.records()][-1] == "Edited elsewhere"
+
+
+def test_model_skips_and_reports_unparsable_files(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    broken = log.new("Broken", date="2024-01-01").path
+    good = broken.read_text(encoding="utf-8")
+    broken.write_text(good.replace("Status: Accepted", "Status: Bogus"), encoding="utf-8")
+    errors: list[str] = []
+    source = _ScriptedSource()
+    server = JsonRpcServer(AdrLog(log.dir), source, on_error=errors.append)
+
+    assert [record["number"] for record in _call(server, "list")] == [1]
+    assert len(errors) == 1
+    assert errors[0].startswith(f"{broken.name}: ")
+
+    broken.write_text(good, encoding="utf-8")
+    source.pending.append({broken.name})
+    assert [record["number"] for record in _call(server, "list")] == [1, 2]
+
+
+def test_server_keeps_the_link_graph_current(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    server = _server(log)
+    _call(server, "new", title="Replacement", date="2024-01-01")
+    _call(server, "link", src=2, rel="Supersedes", tgt=1, reverse=True)
+
+    assert [record["number"] for record in _call(server, "list", effective=True)] == [2]
+    assert _call(server, "links", number=1) == {
+        "outgoing": [],
+        "incoming": [{"rel": "Supersedes", "number": 2}],
+    }
+    _call(server, "unlink", src=2, rel="Supersedes", tgt=1, reverse=True)
+    assert _call(server, "links", number=1) == {"outgoing": [], "incoming": []}
+
+
+def test_model_reads_each_record_once(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    log.new("Second", date="2024-01-01")
+    log.link(AdrRef(2), "Supersedes", AdrRef(1), reverse=True)
+
+    stats = IoStats()
+    with collecting(stats):
+        model = LogModel(AdrLog(log.dir), _ScriptedSource())
+    assert stats.files_opened == 2  # noqa: PLR2004 - one per record
+    assert [relations for _, relations in model.records()] == [
+        [("Is superseded by", 2)],
+        [("Supersedes", 1)],
+    ]
+
+
+@pytest.mark.parametrize(
+    ("line", "code"),
+    [
+        ("{not json", PARSE_ERROR),
+        ('{"jsonrpc": "2.0", "id": 7, "method": "nope"}', METHOD_NOT_FOUND),
+        ('{"jsonrpc": "2.0", "id": 7, "method": "new", "params": {}}', INVALID_PARAMS),
+        ('{"jsonrpc": "2.0", "id": 7, "method": "link", "params": {"src": true}}', INVALID_PARAMS),
+    ],
+)
+def test_server_reports_errors(tmp_path: Path, line: str, code: int) -> None:
+    server = _server(AdrLog.init(tmp_path / "adr"))
+    raw = server.handle(line)
+    assert raw is not None
+    assert json.loads(raw)["error"]["code"] == code
+
+
+def test_server_application_errors_and_notifications(tmp_path: Path) -> None:
+    server = _server(AdrLog.init(tmp_path / "adr"))
+    raw = server.handle(
+        '{"jsonrpc": "2.0", "id": 3, "method": "link", '
+        '"params": {"src": 1, "rel": "Amends", "tgt": 9}}'
+    )
+    assert raw is not None
+    assert "ADR 0009 not found" in json.loads(raw)["error"]["message"]
+    assert server.handle('{"jsonrpc": "2.0", "method": "list"}') is None
+
+
+def test_cli_serve_stdio(tmp_path: Path) -> None:
+    adr_dir = tmp_path / "adr"
+    AdrLog.init(adr_dir)
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "new", "params": {"title": "Over stdio"}},
+        {"jsonrpc": "2.0", "id": 2, "method": "list"},
+    ]
+    result = CliRunner().invoke(
+        app,
+        ["serve", "--stdio", "--dir", str(adr_dir)],
+        input="".join(f"{json.dumps(request)}\n" for request in requests),
+    )
+    assert result.exit_code == 0, result.output
+    responses = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [response["id"] for response in responses] == [1, 2]
+    assert len(responses[1]["result"]) == 2  # noqa: PLR2004 - seed plus the new ADR
+    assert CliRunner().invoke(app, ["serve", "--dir", str(adr_dir)]).exit_code != 0
@@ -0,0 +1,106 @@
+from collections.abc import Callable
+
+import pytest
+
+from decree.core import AdrLog
+from decree.models import AdrStatus, NewSpec
+from decree.table import AdrTable
+
+RECORDS = (
+    NewSpec("Use Postgres", status=AdrStatus.Accepted, date="2024-03-01"),
+    NewSpec("Adopt Kafka", status=AdrStatus.Proposed, date="2024-01-15"),
+    NewSpec("Drop Kafka", status=AdrStatus.Rejected, date="2024-02-20"),
+)
+
+
+def test_table_matches_list(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    table = log.table()
+    assert list(table) == list(log.list())
+    assert list(table.numbers()) == [1, 2, 3, 4]
+    assert table[-1].title == "Drop Kafka"
+
+
+def test_from_records_keeps_non_iso_dates(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    records = list(log.list())
+    odd = records[1].path
+    odd.write_text(odd.read_text(encoding="utf-8").replace("2024-03-01", "March 2024"), "utf-8")
+    table = AdrTable.from_records(log.dir, log.list())
+    assert table[1].date == "March 2024"
+    assert [r.number for r in table.where(since="2024-01-01", until="2024-12-31")] == [3, 4]
+
+
+def test_where_filters_by_status_date_and_number(make_log: Callable[..., AdrLog]) -> None:
+    table = make_log(*RECORDS).table()
+    assert [r.number for r in table.where(status=AdrStatus.Accepted)] == [1, 2]
+    kafka = table.where(status=[AdrStatus.Proposed, AdrStatus.Rejected])
+    assert [r.title for r in kafka] == ["Adopt Kafka", "Drop Kafka"]
+    assert [r.number for r in table.where(since="2024-01-31", until="2024-02-29")] == [4]
+    assert [r.number for r in table.where(first=2, last=3)] == [2, 3]
+    assert len(table.where(status=AdrStatus.Accepted, first=2).where(last=1)) == 0
+    with pytest.raises(ValueError, match="since must be an ISO date"):
+        table.where(since="yesterday")
+
+
+def test_sort_by(make_log: Callable[..., AdrLog]) -> None:
+    table = make_log(*RECORDS).table().where(first=2)
+    assert list(table.sort_by("date").numbers()) == [3, 4, 2]
+    assert list(table.sort_by("title").numbers()) == [3, 4, 2]
+    assert list(table.sort_by("number", reverse=True).numbers()) == [4, 3, 2]
+    assert table.sort_by("status", reverse=True)[0].status is AdrStatus.Rejected
+    with pytest.raises(ValueError, match="unknown sort key"):
+        table.sort_by("slug")
+
+
+def test_cached_table_reads_only_the_cache(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    log.upgrade()
+    expected = list(log.list())
+    warm = AdrLog(log.dir)
+    assert list(warm.table()) == expected
+    assert warm.stats().files_opened == 1
+
+
+def test_query_combines_filters(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    kafka = log.query(status=[AdrStatus.Proposed, AdrStatus.Rejected], date_to="2024-02-01")
+    assert [r.title for r in kafka] == ["Adopt Kafka"]
+    assert [r.number for r in log.query(number_range=(2, 3))] == [2, 3]
+    assert len(log.query(status=AdrStatus.Superseded)) == 0
+
+
+def test_query_skips_files_outside_number_range(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    cold = AdrLog(log.dir)
+    assert [r.number for r in cold.query(number_range=(4, 9))] == [4]
+    assert cold.stats().files_opened == 1
+
+
+def test_ranged_query_keeps_other_cache_entries(make_log: Callable[..., AdrLog]) -> None:
+    log = make_log(*RECORDS)
+    log.upgrade()
+    expected = list(log.list())
+
+    assert [r.number for r in AdrLog(log.dir).query(number_range=(2, 3))] == [2, 3]
+
+    warm = AdrLog(log.dir)
+    assert list(warm.table()) == expected
+    assert warm.stats().files_opened == 1
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_query_parses_on_jobs_threads(make_log: Callable[..., AdrLog], jobs: int) -> None:
+    log = make_log(*RECORDS)
+    proposed = AdrLog(log.dir).query(status=AdrStatus.Proposed, jobs=jobs)
+    assert [r.title for r in proposed] == ["Adopt Kafka"]
+    with pytest.raises(ValueError, match="jobs must be at least 1"):
+        log.query(jobs=0)
+
+
+def test_index_is_shared_by_derived_tables(make_log: Callable[..., AdrLog]) -> None:
+    table = make_log(*RECORDS).table()
+    accepted = table.where(status=AdrStatus.Accepted)
+    by_date = table.sort_by("date", reverse=True).where(until="2024-12-31")
+    assert [r.number for r in accepted.where(first=2)] == [2]
+    assert list(by_date.numbers()) == [2, 4, 3]
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+import decree.core
+from decree.cli import app
+from decree.core import AdrLog
+from decree.exitcodes import ExitCode
+from decree.models import AdrRecord, NewSpec
+
+runner = CliRunner()
+
+
+def test_write_toc_skips_identical_content(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    output = tmp_path / "README.md"
+
+    assert log.write_toc(output) is True
+    assert output.read_text(encoding="utf-8") == log.generate_toc()
+    mtime = output.stat().st_mtime_ns
+
+    assert log.write_toc(output) is False
+    assert output.stat().st_mtime_ns == mtime
+
+    log.new("Another decision")
+    assert log.check_toc(output) is False
+    assert log.write_toc(output) is True
+    assert log.check_toc(output) is True
+
+
+def test_check_toc_uses_stamp_without_parsing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    log.upgrade()
+    output = tmp_path / "README.md"
+    log.write_toc(output)
+
+    def _fail(*_args: object, **_kwargs: object) -> str:
+        message = "records were parsed"
+        raise AssertionError(message)
+
+    monkeypatch.setattr(AdrLog, "generate_toc", _fail)
+    assert log.check_toc(output) is True
+
+    output.write_text("edited by hand\n", encoding="utf-8")
+    monkeypatch.undo()
+    assert log.check_toc(output) is False
+
+
+def test_cli_generate_toc_output_and_check(tmp_path: Path) -> None:
+    adr_dir = tmp_path / "adr"
+    log = AdrLog.init(adr_dir)
+    output = tmp_path / "README.md"
+    args = ["generate", "toc", "--dir", str(adr_dir), "--output", str(output)]
+
+    missing = runner.invoke(app, [*args, "--check"])
+    assert missing.exit_code == int(ExitCode.GENERAL_ERROR)
+
+    assert runner.invoke(app, args).stdout == f"Wrote {output}\n"
+    assert runner.invoke(app, args).stdout == f"{output} is up to date\n"
+    assert runner.invoke(app, [*args, "--check"]).exit_code == 0
+
+    log.new("Stale now")
+    stale = runner.invoke(app, [*args, "--check"])
+    assert stale.exit_code == int(ExitCode.GENERAL_ERROR)
+    assert "out of date" in stale.output
+
+
+def test_cli_check_requires_output(tmp_path: Path) -> None:
+    result = runner.invoke(app, ["generate", "toc", "--check", "--dir", str(tmp_path)])
+    assert result.exit_code != 0
+    graph = runner.invoke(app, ["generate", "graph", "--output", str(tmp_path / "g.dot")])
+    assert graph.exit_code != 0
+
+
+def test_cli_generate_toc_streams_before_parsing_every_record(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    log.new_many(NewSpec(f"Decision {idx}", date="2024-01-01") for idx in range(3))
+    parse = decree.core._parse_record  # noqa: SLF001 - wrapped to fail on the last record
+
+    def fail_on_last(path: Path) -> AdrRecord:
+        if path.name.startswith("0004-"):
+            message = "last record"
+            raise RuntimeError(message)
+        return parse(path)
+
+    monkeypatch.setattr(decree.core, "_parse_record", fail_on_last)
+    result = runner.invoke(app, ["generate", "toc", "--dir", str(log.dir)])
+
+    assert isinstance(result.exception, RuntimeError)
+    assert result.stdout.startswith("# Architecture decision records\n\n- 0001. ")
+    assert "- 0003. [Decision 1]" in result.stdout
@@ -0,0 +1,260 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from decree.atomic import write_atomic
+from decree.core import AdrLog
+from decree.models import AdrRef
+from decree.transaction import TransactionConflictError
+
+
+def _log(tmp_path: Path) -> AdrLog:
+    log = AdrLog.init(tmp_path / "adr")
+    log.new("Second", date="2024-01-01")
+    return AdrLog(log.dir)
+
+
+def _snapshot(directory: Path) -> dict[str, str]:
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(directory.iterdir())
+        if path.is_file()
+    }
+
+
+def test_mutations_commit_together(tmp_path: Path) -> None:
+    log = _log(tmp_path)
+    second = log.dir / "0002-second.md"
+    second.write_text(
+        second.read_text(encoding="utf-8")
+        + "\nSee [0001](0001-record-architecture-decisions.md).\n",
+        encoding="utf-8",
+    )
+
+    with log.transaction() as txn:
+        record = txn.new("Third", date="2024-01-02")
+        txn.link(AdrRef(3), "Supersedes", AdrRef(2), reverse=True)
+        renamed = txn.set_title(AdrRef(1), "Record decisions", rename=True)
+        txn.link(AdrRef(3), "References", AdrRef(1))
+        assert not record.path.exists()
+
+    assert renamed == log.dir / "0001-record-decisions.md"
+    assert sorted(path.name for path in log.dir.iterdir()) == [
+        "0001-record-decisions.md",
+        "0002-second.md",
+        "0003-third.md",
+    ]
+    assert renamed.read_text(encoding="utf-8").startswith("# 1: Record decisions\n")
+    assert record.path.read_text(encoding="utf-8").endswith(
+        "\nSupersedes: 0002\n\nReferences: 0001\n"
+    )
+    text = second.read_text(encoding="utf-8")
+    assert "Is superseded by: 0003" in text
+    assert "[0001](0001-record-decisions.md)" in text
+
+
+def test_touched_files_are_read_and_written_once(tmp_path: Path) -> None:
+    log = _log(tmp_path)
+    before = log.stats()
+
+    with log.transaction() as txn:
+        txn.new("Third", date="2024-01-02")
+        txn.link(AdrRef(3), "Amends", AdrRef(1), reverse=True)
+        txn.link(AdrRef(3), "References", AdrRef(1), reverse=True)
+        txn.set_title(AdrRef(1), "Record decisions", rename=False)
+
+    after = log.stats()
+    # Reads: 0001. Writes: the journal, 0001 and 0003.
+    assert after.files_opened - before.files_opened == 4  # noqa: PLR2004 - counted above
+    assert not (log.dir / ".decree").exists()
+
+
+def test_exception_in_block_discards_changes(tmp_path: Path) -> None:
+    log = _log(tmp_path)
+    original = _snapshot(log.dir)
+
+    def abandon() -> None:
+        with log.transaction() as txn:
+            txn.new("Third")
+            txn.link(AdrRef(3), "Amends", AdrRef(2), reverse=True)
+            raise KeyError
+
+    with pytest.raises(KeyError):
+        abandon()
+
+    assert _snapshot(log.dir) == original
+
+
+def test_failed_write_rolls_back(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log = _log(tmp_path)
+    original = _snapshot(log.dir)
+
+    def failing(path: Path, data: str | bytes, *, exclusive: bool = False) -> None:
+        if path.name == "0002-second.md" and "Amends" in str(data):
+            message = "disk full"
+            raise OSError(message)
+        write_atomic(path, data, exclusive=exclusive)
+
+    monkeypatch.setattr("decree.transaction.write_atomic", failing)
+    txn = log.transaction()
+    txn.set_title(AdrRef(1), "Record decisions", rename=False)
+    txn.new("Third")
+    txn.link(AdrRef(2), "Amends", AdrRef(1), reverse=True)
+    with pytest.raises(OSError, match="disk full"):
+        txn.commit()
+
+    assert _snapshot(log.dir) == original
+
+
+def test_conflicting_edit_aborts_commit(tmp_path: Path) -> None:
+    log = _log(tmp_path)
+    second = log.dir / "0002-second.md"
+
+    txn = log.transaction()
+    txn.link(AdrRef(2), "Amends", AdrRef(1))
+    second.write_text("edited elsewhere\n", encoding="utf-8")
+    with pytest.raises(TransactionConflictError):
+        txn.commit()
+
+    assert second.read_text(encoding="utf-8") == "edited elsewhere\n"
+
+
+def test_interrupted_commit_is_replayed(tmp_path: Path) -> None:
+    log = _log(tmp_path)
+    state = log.dir / ".decree"
+    state.mkdir()
+    first = log.dir / "0001-record-architecture-decisions.md"
+    journal = {
+        "version": 1,
+        "files": [
+            ["0001-record-decisions.md", None, "# 1. Record decisions\n"],
+            ["0003-third.md", None, "# 3. Third\n"],
+            [first.name, first.read_text(encoding="utf-8"), None],
+        ],
+    }
+    (state / "journal.json").write_text(json.dumps(journal), encoding="utf-8")
+
+    with log.transaction() as txn:
+        txn.link(AdrRef(3), "Amends", AdrRef(1), reverse=True)
+
+    assert not (state / "journal.json").exists()
+    assert (log.dir / "0001-record-decisions.md").read_text(encoding="utf-8") == (
+        "# 1. Record decisions\n\nIs amended by: 0003\n"
+    )
+    assert not first.exists()
+
+
+def _crash_journal(log: AdrLog, operations: list[list[str | None]]) -> Path:
+    state = log.dir / ".decree"
+    state.mkdir(exist_ok=True)
+    journal = state / "journal.json"
+    journal.write_text(json.dumps({"version": 1, "files": operations}), encoding="utf-8")
+    return journal
+
+
+def test_replay_keeps_journal_when_a_file_was_edited_after_the_crash(tmp_path: Path) -> None:
+    log = _log(tmp_path)
+    second = log.dir / "0002-second.md"
+    before = second.read_text(encoding="utf-8")
+    journal = _crash_journal(
+        log,
+        [
+            ["0003-third.md", None, "# 3. Third\n"],
+            [second.name, before, before + "\nAmends: 0001\n"],
+        ],
+    )
+    second.write_text(before + "\nEdited by hand.\n", encoding="utf-8")
+    original = _snapshot(log.dir)
+
+    with pytest.raises(TransactionConflictError, match=r"0002-second\.md changed"):
+        log.transaction()
+    with pytest.raises(TransactionConflictError):
+        log.link(AdrRef(2), "References", AdrRef(1))
+
+    assert journal.exists()
+    assert _snapshot(log.dir) == original
+
+
+def test_mutations_outside_transactions_replay_first(tmp_path: Path) -> None:
+    log = _log(tmp_path)
+    second = log.dir / "0002-second.md"
+    before = second.read_text(encoding="utf-8")
+    after = before + "\nAmends: 0001\n"
+    # The crash happened after 0002 was written but before 0003 was.
+    second.write_text(after, encoding="utf-8")
+    journal = _crash_journal(
+        log, [[second.name, before, after], ["0003-third.md", None, "# 3. Third\n"]]
+    )
+
+    record = log.new("Fourth", date="2024-01-03")
+
+    assert record.number == 4  # noqa: PLR2004 - 0003 came from the journal
+    assert not journal.exists()
+    assert second.read_text(encoding="utf-8") == after
+    assert (log.dir / "0003-third.md").read_text(encoding="utf-8") == "# 3. Third\n"
+
+
+def test_long_transaction_keeps_the_lock_fresh(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("decree.core._LOCK_STALE_AFTER", 0.3)
+    log = _log(tmp_path)
+    numbers: list[int] = []
+
+    def other_writer() -> None:
+        numbers.append(AdrLog(log.dir).new("Other", date="2024-01-03").number)
+
+    with log.transaction() as txn:
+        staged = txn.new("Third", date="2024-01-02")
+        time.sleep(0.6)  # Twice the staleness limit.
+        waiter = threading.Thread(target=other_writer)
+        waiter.start()
+        time.sleep(0.3)
+        assert waiter.is_alive()
+
+    waiter.join()
+    assert (staged.number, numbers) == (3, [4])
+    assert sorted(path.name for path in log.dir.glob("000[34]-*.md")) == [
+        "0003-third.md",
+        "0004-other.md",
+    ]
+
+
+def test_new_inside_a_transaction_gets_its_own_number(tmp_path: Path) -> None:
+    log = _log(tmp_path)
+
+    with log.transaction() as txn:
+        staged = txn.new("Third", date="2024-01-02")
+        direct = log.new("Fourth", date="2024-01-02")
+        later = txn.new("Fifth", date="2024-01-02")
+
+    assert [staged.number, direct.number, later.number] == [3, 4, 5]
+    assert sorted(path.name for path in log.dir.glob("000[345]-*.md")) == [
+        "0003-third.md",
+        "0004-fourth.md",
+        "0005-fifth.md",
+    ]
+
+
+def test_journal_is_synced_without_durability(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("DECREE_DURABILITY", raising=False)
+    log = _log(tmp_path)
+    synced: list[int] = []
+    real = os.fsync
+
+    def counting(fd: int) -> None:
+        synced.append(fd)
+        real(fd)
+
+    monkeypatch.setattr(os, "fsync", counting)
+    with log.transaction() as txn:
+        txn.link(AdrRef(2), "Amends", AdrRef(1))
+
+    # The journal, then .decree and the ADR directory that gained it; no record.
+    assert len(synced) == 3  # noqa: PLR2004 - counted above
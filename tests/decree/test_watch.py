@@ -0,0 +1,164 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from decree import watch
+from decree.core import AdrLog, _parse_record
+from decree.iostats import IoStats, collecting
+from decree.models import AdrRecord
+from decree.watch import InotifySource, PollingSource, TocWatcher
+
+
+class _ScriptedSource:
+    """Replay batches of change events, then report silence."""
+
+    def __init__(self, *batches: set[str]) -> None:
+        self.batches = list(batches)
+
+    def wait(self, timeout: float) -> set[str]:  # noqa: ARG002 - protocol signature
+        return self.batches.pop(0) if self.batches else set()
+
+    def close(self) -> None:
+        self.batches.clear()
+
+
+def _retitle(path: Path, title: str) -> None:
+    text = path.read_text(encoding="utf-8")
+    first, rest = text.split("\n", 1)
+    path.write_text(f"{first.split('.', 1)[0]}. {title}\n{rest}", encoding="utf-8")
+
+
+def test_watcher_debounces_and_reparses_only_changed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    second = log.new("Second", date="2024-01-01").path
+    output = tmp_path / "README.md"
+    source = _ScriptedSource({second.name}, {second.name}, set())
+    watcher = TocWatcher(log, output, source, debounce=0)
+    assert watcher.written is True
+
+    parsed: list[str] = []
+
+    def _counting(path: Path) -> AdrRecord:
+        parsed.append(path.name)
+        return _parse_record(path)
+
+    monkeypatch.setattr(watch, "_parse_record", _counting)
+    _retitle(second, "Renamed in editor")
+    os.utime(second, ns=(second.stat().st_atime_ns, second.stat().st_mtime_ns + 1_000_000))
+
+    assert watcher.poll(0) is True
+    assert parsed == [second.name]
+    assert source.batches == []
+    assert output.read_text(encoding="utf-8") == log.generate_toc()
+    assert "Renamed in editor" in output.read_text(encoding="utf-8")
+    assert log.check_toc(output) is True
+
+
+def test_watcher_handles_new_and_deleted_records(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    output = tmp_path / "README.md"
+    source = _ScriptedSource()
+    watcher = TocWatcher(log, output, source, debounce=0)
+
+    added = log.new("Added", date="2024-01-01").path
+    source.batches.append({added.name})
+    assert watcher.poll(0) is True
+    assert "Added" in output.read_text(encoding="utf-8")
+
+    added.unlink()
+    source.batches.append({added.name})
+    assert watcher.poll(0) is True
+    assert output.read_text(encoding="utf-8") == log.generate_toc()
+
+    source.batches.append({"0001-record-architecture-decisions.md"})
+    assert watcher.poll(0) is False
+
+
+def test_watcher_survives_a_record_that_does_not_parse(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    second = log.new("Second", date="2024-01-01").path
+    output = tmp_path / "README.md"
+    source = _ScriptedSource()
+    errors: list[str] = []
+    watcher = TocWatcher(log, output, source, debounce=0, on_error=errors.append)
+    written = output.read_text(encoding="utf-8")
+
+    text = second.read_text(encoding="utf-8")
+    second.write_text(text.replace("Status: Accepted", "Status: Acc"), encoding="utf-8")
+    source.batches.append({second.name})
+    assert watcher.poll(0) is False
+    assert errors == [f"{second.name}: 'Acc' is not a valid AdrStatus"]
+    assert output.read_text(encoding="utf-8") == written
+
+    _retitle(second, "Finished typing")
+    second.write_text(
+        second.read_text(encoding="utf-8").replace("Status: Acc", "Status: Accepted"),
+        encoding="utf-8",
+    )
+    source.batches.append({second.name})
+    assert watcher.poll(0) is True
+    assert "Finished typing" in output.read_text(encoding="utf-8")
+
+
+def test_watcher_leaves_the_cache_alone_for_unchanged_files(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    log.upgrade()
+    second = log.new("Second", date="2024-01-01").path
+    source = _ScriptedSource({second.name})
+    watcher = TocWatcher(log, tmp_path / "README.md", source, debounce=0)
+
+    stats = IoStats()
+    with collecting(stats):
+        assert watcher.poll(0) is False
+    assert stats == IoStats()
+
+
+def test_polling_source_reports_changed_records(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    source = PollingSource(log.dir, interval=0)
+    assert source.wait(0) == set()
+
+    record = log.new("Polled").path
+    (log.dir / "notes.txt").write_text("ignored", encoding="utf-8")
+    assert source.wait(0) == {record.name}
+    assert source.wait(0) == set()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_source_reports_changed_records(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    source = InotifySource(log.dir)
+    try:
+        record = log.new("Notified").path
+        (log.dir / "notes.txt").write_text("ignored", encoding="utf-8")
+        assert source.wait(1.0) == {record.name}
+        assert source.wait(0) == set()
+    finally:
+        source.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_overflow_reports_deleted_records(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    deleted = log.new("Deleted while events were lost").path
+    source = InotifySource(log.dir)
+    try:
+        deleted.unlink()
+        overflow = [watch._IN_EVENT.pack(-1, watch._IN_Q_OVERFLOW, 0, 0)]  # noqa: SLF001 - simulated kernel event
+
+        def _read(fd: int, size: int) -> bytes:
+            del fd, size
+            if overflow:
+                return overflow.pop()
+            raise BlockingIOError
+
+        monkeypatch.setattr(os, "read", _read)
+        assert source.wait(1.0) == {"0001-record-architecture-decisions.md", deleted.name}
+    finally:
+        source.close()
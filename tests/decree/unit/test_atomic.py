@@ -0,0 +1,86 @@
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from decree.atomic import (
+    DURABILITY_ENV,
+    Durability,
+    batch,
+    current_durability,
+    durability,
+    write_atomic,
+)
+from decree.core import AdrLog
+from decree.models import AdrRef, LinkSpec, NewSpec
+
+MODE = 0o640
+
+
+@pytest.fixture
+def fsyncs(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+    real = os.fsync
+
+    def counting(fd: int) -> None:
+        calls.append(fd)
+        real(fd)
+
+    monkeypatch.setattr(os, "fsync", counting)
+    return calls
+
+
+def test_write_replaces_content_and_keeps_permissions(tmp_path: Path) -> None:
+    target = tmp_path / "0001-a.md"
+    target.write_text("old\n", encoding="utf-8")
+    target.chmod(MODE)
+
+    write_atomic(target, "new\r\nline\n")
+
+    assert target.read_bytes() == b"new\r\nline\n"
+    assert stat.S_IMODE(target.stat().st_mode) == MODE
+    assert [p.name for p in tmp_path.iterdir()] == ["0001-a.md"]
+
+
+def test_exclusive_write_never_clobbers(tmp_path: Path) -> None:
+    target = tmp_path / "0001-a.md"
+    write_atomic(target, "first", exclusive=True)
+
+    with pytest.raises(FileExistsError):
+        write_atomic(target, "second", exclusive=True)
+
+    assert target.read_text(encoding="utf-8") == "first"
+    assert [p.name for p in tmp_path.iterdir()] == ["0001-a.md"]
+
+
+def test_durability_comes_from_context_then_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(DURABILITY_ENV, "File")
+    assert current_durability() is Durability.file
+    with durability("batch"):
+        assert current_durability() is Durability.batch
+    monkeypatch.setenv(DURABILITY_ENV, "always")
+    with pytest.raises(ValueError, match="DECREE_DURABILITY must be one of"):
+        current_durability()
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [(Durability.none, 0), (Durability.file, 6), (Durability.batch, 1)],
+)
+def test_fsync_count_per_mode(
+    tmp_path: Path, fsyncs: list[int], mode: Durability, expected: int
+) -> None:
+    with durability(mode), batch():
+        for number in range(3):
+            write_atomic(tmp_path / f"{number:04d}-a.md", "text")
+    assert len(fsyncs) == expected
+
+
+def test_bulk_operations_sync_the_directory_once(tmp_path: Path, fsyncs: list[int]) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    with durability(Durability.batch):
+        log.new_many(NewSpec(f"Decision {n}", date="2024-01-01") for n in range(5))
+        created = len(fsyncs)
+        log.link_many(LinkSpec(AdrRef(n), "Amends", AdrRef(1)) for n in range(2, 7))
+    assert (created, len(fsyncs)) == (1, 2)
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from decree.core import _HEADER_READ_LIMIT, _parse_record, _read_header
+from decree.iostats import IoStats, collecting
+
+
+def test_read_header_returns_title_and_meta(tmp_path: Path) -> None:
+    path = tmp_path / "0003-sample.md"
+    path.write_text(
+        "# 3: Sample decision\n\nDate: 2024-05-06\nStatus: Proposed\n\n## Context\n",
+        encoding="utf-8",
+    )
+    assert _read_header(path) == ("Sample decision", {"Date": "2024-05-06", "Status": "Proposed"})
+
+
+def test_read_header_stops_after_metadata_block(tmp_path: Path) -> None:
+    path = tmp_path / "0004-long.md"
+    header = b"# 4: Long body\r\n\r\nDate: 2024-05-06\r\nStatus: Accepted\r\n\r\n"
+    # The body is not valid UTF-8, so decoding it would raise.
+    path.write_bytes(header + b"\xff" * (4 * _HEADER_READ_LIMIT))
+    assert _read_header(path) == ("Long body", {"Date": "2024-05-06", "Status": "Accepted"})
+
+
+def test_read_header_is_bounded_without_metadata(tmp_path: Path) -> None:
+    path = tmp_path / "0005-no-meta.md"
+    filler = "é" * _HEADER_READ_LIMIT
+    path.write_text(f"{filler}\n# Too late\n", encoding="utf-8")
+    assert _read_header(path) == (None, {})
+
+
+def test_parse_record_defaults(tmp_path: Path) -> None:
+    path = tmp_path / "0006-bare-record.md"
+    path.write_text("Body without heading\n", encoding="utf-8")
+    record = _parse_record(path)
+    assert record.title == "0006-bare-record"
+    assert record.status == "Accepted"
+    assert record.date == ""
+
+
+def test_read_header_counts_only_the_header_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "0007-long-body.md"
+    header = b"# 7: Long body\n\nDate: 2024-05-06\nStatus: Accepted\n\n"
+    path.write_bytes(header + b"Body text.\n" * 2000)
+    stats = IoStats()
+    with collecting(stats):
+        _read_header(path)
+    assert (stats.files_opened, stats.bytes_read) == (1, len(header))
@@ -0,0 +1,47 @@
+import doctest
+import time
+from pathlib import Path
+
+from decree import profiling
+from decree.core import AdrLog
+from decree.profiling import PhaseTimer, phase, record_phases
+
+
+def test_phase_is_noop_without_timer() -> None:
+    assert profiling._active is None  # noqa: SLF001 - verifying the default state
+    with phase("scan"):
+        pass
+
+
+def test_nested_phases_are_charged_exclusively() -> None:
+    timer = PhaseTimer()
+    with timer.phase("render"):
+        time.sleep(0.02)
+        with timer.phase("parse"):
+            time.sleep(0.02)
+    assert timer.counts["render"] == timer.counts["parse"] == 1
+    assert 0.015 < timer.totals["parse"] < timer.totals["render"] + timer.totals["parse"]  # noqa: PLR2004
+    assert timer.totals["render"] < 0.035  # noqa: PLR2004 - parse time is not double counted
+
+
+def test_record_phases_covers_core_operations(tmp_path: Path) -> None:
+    log = AdrLog.init(tmp_path / "adr")
+    log.new("Timed decision")
+    with record_phases() as timer:
+        log.generate_toc()
+        log.write_toc(tmp_path / "README.md")
+    assert profiling._active is None  # noqa: SLF001 - timer is uninstalled on exit
+    assert {name for name, count in timer.counts.items() if count} == {
+        "scan",
+        "read",
+        "parse",
+        "render",
+        "write",
+    }
+    assert timer.summary()[-1].startswith("total")
+
+
+def test_module_example_runs() -> None:
+    result = doctest.testmod(profiling)
+    assert result.attempted
+    assert not result.failed
@@ -1,22 +1,26 @@
+import json
+import os
 from pathlib import Path
 
 import pytest
 
 from decree.title import (
+    ExecutionContext,
     HeadingInfo,
+    LinkIndex,
     TitleError,
     _build_heading_line,
-    _link_candidates,
     _load_config,
     _mutate_heading,
-    _needs_link_update,
     _rename_to_slug,
-    _replace_links,
     _resolve_adr_dir,
     _resolve_target,
+    _rewrite_links,
     _split_name,
     _split_suffix,
     _title_from_slug,
+    sync_titles,
+    update_title,
 )
 
 
@@ -114,21 +118,23 @@ def test_link_rewrite_helpers(tmp_path: Path) -> None:
     base = tmp_path
     old_path = base / "old.md"
     new_path = base / "new.md"
-    old_path.write_text("", encoding="utf-8")
     new_path.write_text("", encoding="utf-8")
-
-    text = (
+    referrer = base / "referrer.md"
+    referrer.write_text(
         "See [inline](old.md) and reference [ref][ref].\n\n"
         "[ref]: ./old.md#anchor\n"
-        "Keep other links untouched.\n"
+        "Keep other links untouched.\n",
+        encoding="utf-8",
     )
-    candidates = _link_candidates(base, old_path)
-    assert _needs_link_update(text, candidates)
-    rewritten = _replace_links(text, candidates, "new.md")
+    untouched = base / "untouched.md"
+    untouched.write_text("No match\n", encoding="utf-8")
+
+    assert _rewrite_links(base, {old_path: new_path}) == [referrer]
+    rewritten = referrer.read_text(encoding="utf-8")
     assert "(new.md)" in rewritten
     assert "[ref]: new.md#anchor" in rewritten
+    assert untouched.read_text(encoding="utf-8") == "No match\n"
 
-    assert not _needs_link_update("No match", candidates)
     suffixed, suffix = _split_suffix("target.md?query")
     assert suffixed == "target.md"
     assert suffix == "?query"
@@ -147,3 +153,109 @@ def test_title_from_slug_and_config(tmp_path: Path) -> None:
     (cfg_dir / "config.toml").write_text("[title]\nrename = 0\n", encoding="utf-8")
     config_false = _load_config(tmp_path)
     assert config_false.rename is False
+
+
+def test_sync_titles_rewrites_all_renames_in_one_pass(tmp_path: Path) -> None:
+    (tmp_path / "0001-old-one.md").write_text("# 0001: First Choice\n", encoding="utf-8")
+    (tmp_path / "0002-old-two.md").write_text("# 0002: Second Choice\n", encoding="utf-8")
+    index = tmp_path / "index.md"
+    index.write_text(
+        "# Index\n\n[one](0001-old-one.md) [two](./0002-old-two.md#why)\n\n"
+        "[ref]: 0001-old-one.md\n",
+        encoding="utf-8",
+    )
+    messages: list[str] = []
+
+    sync_titles(tmp_path, rename=True, ctx=ExecutionContext(dry_run=False, emit=messages.append))
+
+    assert index.read_text(encoding="utf-8") == (
+        "# Index\n\n[one](0001-first-choice.md) [two](0002-second-choice.md#why)\n\n"
+        "[ref]: 0001-first-choice.md\n"
+    )
+    assert messages.count("Updated links in index.md") == 1
+    assert messages.index("Renamed 0002-old-two.md -> 0002-second-choice.md") < messages.index(
+        "Updated links in index.md"
+    )
+
+
+def test_link_index_resolves_referrers(tmp_path: Path) -> None:
+    target = tmp_path / "0001-target.md"
+    target.write_text("# Target\n", encoding="utf-8")
+    (tmp_path / "0002-inline.md").write_text("[t](./0001-target.md#ctx)\n", encoding="utf-8")
+    nested = tmp_path / "notes"
+    nested.mkdir()
+    (nested / "ref.md").write_text("[t]: ../0001-target.md\n", encoding="utf-8")
+    (tmp_path / "0003-external.md").write_text(
+        "[x](https://example.com/0001-target.md)\n", encoding="utf-8"
+    )
+
+    index = LinkIndex.load(tmp_path)
+    index.refresh()
+
+    assert index.referrers(target) == [tmp_path / "0002-inline.md", nested / "ref.md"]
+    assert index.referrers(tmp_path / "0002-inline.md") == []
+
+
+def test_link_index_persists_and_refreshes_by_mtime(tmp_path: Path) -> None:
+    (tmp_path / ".decree").mkdir()
+    target = tmp_path / "0001-target.md"
+    target.write_text("# Target\n", encoding="utf-8")
+    source = tmp_path / "0002-source.md"
+    source.write_text("[t](0001-target.md)\n", encoding="utf-8")
+    index = LinkIndex.load(tmp_path)
+    index.refresh()
+    index.save()
+
+    cache_path = tmp_path / ".decree" / "cache" / "links.json"
+    data = json.loads(cache_path.read_text(encoding="utf-8"))
+    assert data["files"]["0002-source.md"][2] == ["0001-target.md"]
+
+    # Unchanged files are served from the cache without being re-read.
+    data["files"]["0001-target.md"][2] = ["0001-target.md"]
+    cache_path.write_text(json.dumps(data), encoding="utf-8")
+    cached = LinkIndex.load(tmp_path)
+    cached.refresh()
+    assert cached.referrers(target) == [target, source]
+
+    source.write_text("No links any more\n", encoding="utf-8")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    cached.refresh()
+    assert cached.referrers(target) == [target]
+
+
+def test_update_title_only_rewrites_referrers(tmp_path: Path) -> None:
+    (tmp_path / "0001-old.md").write_text("# 0001: Old\n", encoding="utf-8")
+    linking = tmp_path / "0002-linking.md"
+    linking.write_text("See [old](0001-old.md).\n", encoding="utf-8")
+    messages: list[str] = []
+
+    update_title(
+        tmp_path,
+        "1",
+        "Brand New",
+        rename=True,
+        ctx=ExecutionContext(dry_run=False, emit=messages.append),
+    )
+
+    assert linking.read_text(encoding="utf-8") == "See [old](0001-brand-new.md).\n"
+    assert messages[-1] == "Updated links in 0002-linking.md"
+
+
+def test_update_title_keeps_crlf_line_endings(tmp_path: Path) -> None:
+    target = tmp_path / "0001-old.md"
+    target.write_bytes(b"# 0001: Old\r\n\r\nStatus: Accepted\r\n")
+    linking = tmp_path / "0002-linking.md"
+    linking.write_bytes(b"# 0002: Linking\r\n\r\nSee [old](0001-old.md).\r\n")
+
+    update_title(
+        tmp_path,
+        "1",
+        "Brand New",
+        rename=True,
+        ctx=ExecutionContext(dry_run=False, emit=lambda _: None),
+    )
+
+    renamed = tmp_path / "0001-brand-new.md"
+    assert renamed.read_bytes() == b"# 0001: Brand New\r\n\r\nStatus: Accepted\r\n"
+    assert linking.read_bytes() == b"# 0002: Linking\r\n\r\nSee [old](0001-brand-new.md).\r\n"
@@ -0,0 +1,85 @@
+"""Tests for the benchmark runner."""
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from decree.core import read_relations
+from dev.bench import MAX_RECORDS, build_repo, compare, run
+from dev.cli import app
+
+OPERATIONS = {
+    "list",
+    "generate_toc",
+    "link_adr",
+    "sync_titles",
+    "rewrite_links",
+    "list_cached",
+    "table_cached",
+}
+
+
+def test_build_repo_is_reproducible(tmp_path: Path) -> None:
+    """Synthetic repositories are identical for the same seed."""
+    first = build_repo(tmp_path / "a", 20)
+    second = build_repo(tmp_path / "b", 20)
+    names = [path.name for path in sorted(first.dir.iterdir())]
+    assert names == [path.name for path in sorted(second.dir.iterdir())]
+    assert len(list(first.list())) == 20  # noqa: PLR2004
+    last = first.dir / names[-1]
+    assert last.read_text(encoding="utf-8") == (second.dir / names[-1]).read_text(encoding="utf-8")
+    assert read_relations(last)
+
+
+def test_build_repo_stops_at_four_digit_numbers(tmp_path: Path) -> None:
+    """Sizes Decree cannot number are rejected before anything is written."""
+    with pytest.raises(ValueError, match="four-digit numbers stop at 9999"):
+        build_repo(tmp_path / "adr", MAX_RECORDS + 1)
+    assert not (tmp_path / "adr").exists()
+    result = CliRunner().invoke(app, ["bench", "--sizes", "10000", "--repeat", "1"])
+    assert result.exit_code == 1
+    assert "four-digit numbers stop at 9999" in result.output
+
+
+def test_run_times_every_operation(tmp_path: Path) -> None:
+    """Each size reports min and median for every operation."""
+    results = run([5], tmp_path, repeat=2)
+    assert set(results["results"]["5"]) == OPERATIONS
+    assert all(timing["min"] <= timing["median"] for timing in results["results"]["5"].values())
+
+
+def test_compare_flags_slowdowns() -> None:
+    """Only operations beyond the tolerance are reported."""
+    baseline = {"results": {"100": {"list": {"median": 1.0}, "link_adr": {"median": 1.0}}}}
+    current = {
+        "results": {
+            "100": {
+                "list": {"median": 1.2},
+                "link_adr": {"median": 1.5},
+                "new_op": {"median": 9.0},
+            }
+        }
+    }
+    assert compare(current, baseline, tolerance=0.25) == [
+        "link_adr @ 100: 1.5000s vs 1.0000s (1.50x)"
+    ]
+
+
+def test_bench_command_writes_and_compares(tmp_path: Path) -> None:
+    """The dev CLI saves results and fails against a much faster baseline."""
+    output = tmp_path / "results.json"
+    runner = CliRunner()
+    result = runner.invoke(app, ["bench", "--sizes", "5", "--repeat", "1", "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    saved = json.loads(output.read_text(encoding="utf-8"))
+    assert set(saved["results"]["5"]) == OPERATIONS
+
+    for timing in saved["results"]["5"].values():
+        timing["median"] = 1e-9
+    fast = tmp_path / "fast.json"
+    fast.write_text(json.dumps(saved), encoding="utf-8")
+    result = runner.invoke(app, ["bench", "--sizes", "5", "--repeat", "1", "--baseline", str(fast)])
+    assert result.exit_code == 1
+    assert "Slower than baseline" in result.output